@@ -1,30 +1,75 @@
 # app/api/dependencies.py
 
-from fastapi import Depends
-from app.infrastructure.github_client import GitHubClient
+from typing import Annotated
+
+from fastapi import Depends, Query, Request
+from app.infrastructure.github_client import GitHubClient, qualified_repo
 from app.domain.services.github_service import GitHubService
+from app.infrastructure.metrics import Metrics
+
+# Допустимое имя владельца в параметре owner (логин GitHub)
+OWNER_PATTERN = r"^[A-Za-z0-9](?:[A-Za-z0-9-]{0,38})$"
 
-def get_github_client() -> GitHubClient:
+def get_github_client(request: Request) -> GitHubClient:
     """
     Функция для инъекции зависимости GitHub клиента.
     
-    Возвращает экземпляр GitHubClient, который используется для взаимодействия
-    с API GitHub.
+    Возвращает общий для воркера экземпляр GitHubClient, созданный в lifespan
+    приложения, чтобы все запросы переиспользовали один пул соединений.
+
+    Args:
+        request (Request): Текущий HTTP-запрос.
 
     Returns:
         GitHubClient: Экземпляр клиента для работы с GitHub API.
     """
-    return GitHubClient()
+    return request.app.state.github_client
 
-def get_github_service(
-    client: GitHubClient = Depends(get_github_client),
-) -> GitHubService:
+def get_github_service(request: Request) -> GitHubService:
     """
     Функция для инъекции зависимости GitHub сервиса.
     
-    Оборачивает GitHubClient в GitHubService, инкапсулирующий бизнес-логику.
+    Возвращает общий для воркера GitHubService, созданный в lifespan
+    приложения: сервис хранит кэши (например, индексы деревьев), которые
+    должны переживать отдельный запрос.
+
+    Args:
+        request (Request): Текущий HTTP-запрос.
 
     Returns:
         GitHubService: Экземпляр сервиса для работы с GitHub API.
     """
-    return GitHubService(client)
+    return request.app.state.github_service
+
+def get_metrics(request: Request) -> Metrics:
+    """
+    Функция для инъекции зависимости метрик приложения.
+
+    Args:
+        request (Request): Текущий HTTP-запрос.
+
+    Returns:
+        Metrics: Метрики, общие для middleware и клиента GitHub.
+    """
+    return request.app.state.metrics
+
+async def get_repo_name(
+    repo: str,
+    owner: str | None = Query(default=None, pattern=OWNER_PATTERN)
+) -> str:
+    """
+    Функция для инъекции имени репозитория с учётом владельца.
+
+    Асинхронная, чтобы FastAPI вызывал её в цикле событий, а не в пуле потоков.
+
+    Args:
+        repo (str): Имя репозитория из пути.
+        owner (str | None): Владелец репозитория; по умолчанию MY_GITHUB_USERNAME.
+
+    Returns:
+        str: Имя для клиента и сервиса ("repo" или "owner/repo").
+    """
+    return qualified_repo(owner, repo)
+
+# Имя репозитория эндпоинтов /repos/{repo}/...: путь и параметр owner
+RepoName = Annotated[str, Depends(get_repo_name)]
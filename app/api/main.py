@@ -4,13 +4,46 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
-from app.api.routers import repo_router
+from app.api.middleware import MetricsMiddleware, TracingMiddleware, configure_access_log
+from app.api.routers import metrics_router, repo_router, status_router, webhook_router
+from app.core.config import ACCESS_LOG, TRACE_DEBUG, TRACE_SAMPLE_RATE
 from app.core.exceptions import GitHubAPIError
+from app.domain.services.github_service import GitHubService
+from app.infrastructure.github_client import GitHubClient
+from app.infrastructure.http_client import create_http_client
+from app.infrastructure.metrics import Metrics
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Жизненный цикл приложения: один HTTP-клиент к GitHub на воркер.
+    """
+    http_client = create_http_client()
+    app.state.github_client = GitHubClient(http_client, metrics=app.state.metrics)
+    app.state.github_service = GitHubService(app.state.github_client)
+    try:
+        yield
+    finally:
+        app.state.github_service.close()
+        await app.state.github_client.aclose()
+        await http_client.aclose()
 
-app = FastAPI(title="GitHub Repo Assistant API")
+app = FastAPI(title="GitHub Repo Assistant API", lifespan=lifespan)
+routers = (repo_router.router, status_router.router, metrics_router.router, webhook_router.router)
+app.state.metrics = Metrics()
+app.add_middleware(
+    MetricsMiddleware,
+    metrics=app.state.metrics,
+    routes=[route for router in routers for route in router.routes],
+)
+app.add_middleware(TracingMiddleware, sample_rate=TRACE_SAMPLE_RATE, debug=TRACE_DEBUG, access_log=ACCESS_LOG)
+if ACCESS_LOG:
+    configure_access_log()
 
 @app.exception_handler(GitHubAPIError)
 async def handle_github_api_error(request: Request, exc: GitHubAPIError):
@@ -20,4 +53,5 @@ async def handle_github_api_error(request: Request, exc: GitHubAPIError):
     )
 
 # Подключаем роутеры
-app.include_router(repo_router.router)
+for router in routers:
+    app.include_router(router)
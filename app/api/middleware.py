@@ -0,0 +1,168 @@
+# app/api/middleware.py
+
+import json
+import logging
+import random
+import re
+import time
+import uuid
+from typing import Iterable
+
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure.metrics import Metrics
+from app.infrastructure.tracing import end_trace, start_trace
+
+access_logger = logging.getLogger("app.access")
+
+# Идентификатор запроса от клиента принимается, только если он похож на идентификатор
+_REQUEST_ID = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+
+
+def configure_access_log() -> None:
+    """
+    Вывод журнала доступа в stderr по одной JSON-строке на запрос.
+    """
+    if access_logger.handlers:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    access_logger.addHandler(handler)
+    access_logger.setLevel(logging.INFO)
+    access_logger.propagate = False
+
+
+class MetricsMiddleware:
+    """
+    ASGI-middleware метрик API: длительность и число запросов в обработке
+    по шаблону маршрута, байты тел запросов и ответов.
+
+    Маршрут определяется по шаблону (/repos/{repo}/file), а не по пути,
+    чтобы число рядов не зависело от имён репозиториев.
+    """
+    def __init__(self, app: ASGIApp, metrics: Metrics, routes: Iterable[BaseRoute]):
+        """
+        Args:
+            app (ASGIApp): Оборачиваемое приложение.
+            metrics (Metrics): Метрики приложения.
+            routes (Iterable[BaseRoute]): Маршруты API, по которым определяется шаблон пути.
+        """
+        self.app = app
+        self.metrics = metrics
+        self.routes = list(routes)
+
+    def _route(self, scope: Scope) -> str:
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", "unmatched")
+        return "unmatched"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        method = scope["method"]
+        route = self._route(scope)
+        status = 500
+        received = sent = 0
+
+        async def counting_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message: Message) -> None:
+            nonlocal status, sent
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                sent += len(message.get("body", b""))
+            await send(message)
+
+        metrics.http_in_flight.inc((method, route))
+        started = time.perf_counter()
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            metrics.http_in_flight.dec((method, route))
+            metrics.http_duration.observe((method, route, str(status)), time.perf_counter() - started)
+            if received:
+                metrics.http_bytes.inc(("received",), received)
+            if sent:
+                metrics.http_bytes.inc(("sent",), sent)
+
+
+class TracingMiddleware:
+    """
+    ASGI-middleware трассировки и журнала доступа.
+
+    Каждому запросу назначается идентификатор (X-Request-ID клиента или
+    новый), который возвращается в ответе. Запросы из выборки (доля
+    sample_rate, все в режиме debug или по заголовку X-Debug-Timing: 1)
+    трассируются: фазы, отмеченные span(), попадают в заголовок
+    Server-Timing и в журнал. Журнал доступа — одна JSON-строка на запрос.
+    """
+    def __init__(self, app: ASGIApp, sample_rate: float = 0.0, debug: bool = False, access_log: bool = True):
+        """
+        Args:
+            app (ASGIApp): Оборачиваемое приложение.
+            sample_rate (float): Доля трассируемых запросов (0..1).
+            debug (bool): Трассировать все запросы.
+            access_log (bool): Писать журнал доступа (логгер "app.access").
+        """
+        self.app = app
+        self.sample_rate = sample_rate
+        self.debug = debug
+        self.access_log = access_log
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        request_id = headers.get(b"x-request-id", b"").decode("latin-1")
+        if not _REQUEST_ID.fullmatch(request_id):
+            request_id = uuid.uuid4().hex
+        sampled = self.debug or headers.get(b"x-debug-timing") == b"1" or (
+            self.sample_rate > 0 and random.random() < self.sample_rate
+        )
+
+        trace, token = start_trace(request_id) if sampled else (None, None)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                extra = [(b"x-request-id", request_id.encode("latin-1"))]
+                if trace is not None:
+                    timing = trace.server_timing(time.perf_counter() - started)
+                    extra.append((b"server-timing", timing.encode("latin-1")))
+                message = {**message, "headers": [*message.get("headers", []), *extra]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            if token is not None:
+                end_trace(token)
+            if self.access_log and access_logger.isEnabledFor(logging.INFO):
+                record = {
+                    "request_id": request_id,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": getattr(scope.get("route"), "path", None),
+                    "status": status,
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                }
+                if trace is not None:
+                    record["spans"] = trace.as_dict()
+                access_logger.info(json.dumps(record, ensure_ascii=False))
@@ -0,0 +1,38 @@
+# app/api/responses.py
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from app.infrastructure.tracing import span
+
+try:
+    import orjson
+except ImportError:  # orjson не обязателен: без него используется стандартный json
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Сериализация в компактный JSON (UTF-8).
+
+    Args:
+        content (Any): Словари, списки и скаляры.
+
+    Returns:
+        bytes: Тело ответа.
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON-ответ, сериализуемый напрямую (orjson, если установлен),
+    без повторной валидации и сериализации через pydantic.
+    """
+    def render(self, content: Any) -> bytes:
+        with span("serialize"):
+            return dumps(content)
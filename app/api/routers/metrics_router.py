@@ -0,0 +1,22 @@
+# app/api/routers/metrics_router.py
+
+from fastapi import APIRouter, Depends, Response
+from app.infrastructure.metrics import Metrics
+from app.api.dependencies import get_metrics
+
+router = APIRouter(tags=["status"])
+
+@router.get("/metrics", response_class=Response)
+async def get_metrics_text(
+    metrics: Metrics = Depends(get_metrics)
+) -> Response:
+    """
+    Эндпоинт с метриками сервиса в текстовом формате Prometheus.
+
+    Args:
+        metrics (Metrics): Метрики приложения.
+
+    Returns:
+        Response: Метрики API, запросов к GitHub, кэша и лимитов.
+    """
+    return Response(content=metrics.registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,40 +1,152 @@
 # app/api/routers/repo_router.py
 
-from fastapi import APIRouter, Depends
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from app.api.responses import FastJSONResponse
 from app.domain.services.github_service import GitHubService
 from app.domain.models import (
     RepoStructureResponse,
+    RepoChangesResponse,
+    SearchResponse,
     FileContentResponse,
     CreateFileRequest,
     UpdateFileRequest,
     DeleteFileRequest,
+    CommitFilesRequest,
+    CommitFilesResponse,
+    BatchGetFilesRequest,
 )
-from app.api.dependencies import get_github_service
+from app.api.dependencies import RepoName, get_github_service
 
 router = APIRouter()
 
-@router.get("/repos/{repo}/structure", response_model=RepoStructureResponse)
+@router.get("/repos/{repo}/structure", response_model=RepoStructureResponse, response_class=FastJSONResponse)
 async def get_repo_structure(
-    repo: str, 
+    repo: RepoName,
+    ref: str | None = None,
+    prefix: str = "",
+    glob: str | None = None,
+    node_type: Literal["blob", "tree"] | None = Query(default=None, alias="type"),
+    max_depth: int | None = Query(default=None, ge=1),
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=10000),
+    fields: str | None = None,
     github_service: GitHubService = Depends(get_github_service)
-) -> RepoStructureResponse:
+) -> FastJSONResponse:
     """
     Эндпоинт для получения структуры репозитория на GitHub.
 
     Args:
         repo (str): Имя репозитория на GitHub.
+        ref (str | None): Ветка, тег или SHA; без него используется ветка по умолчанию.
+        prefix (str): Папка, в пределах которой выбираются узлы.
+        glob (str | None): Шаблон fnmatch по полному пути, например "src/*.py".
+        node_type (str | None): Тип узлов: "blob" (файлы) или "tree" (папки).
+        max_depth (int | None): Глубина относительно prefix (1 — только прямые потомки).
+        cursor (str | None): Курсор следующей страницы из предыдущего ответа.
+        limit (int | None): Размер страницы; без него возвращаются все узлы.
+        fields (str | None): Поля узлов через запятую, например "path,type".
+        github_service (GitHubService): Сервис для взаимодействия с GitHub API.
+
+    Returns:
+        FastJSONResponse: Ответ с информацией о структуре репозитория
+            (схема RepoStructureResponse, сериализуется без повторной валидации).
+    """
+    result = await github_service.get_repo_structure(
+        repo,
+        ref=ref,
+        prefix=prefix,
+        glob=glob,
+        node_type=node_type,
+        max_depth=max_depth,
+        cursor=cursor,
+        limit=limit,
+        fields=[field.strip() for field in fields.split(",") if field.strip()] if fields else None,
+    )
+    return FastJSONResponse(dict(result))
+
+@router.get("/repos/{repo}/structure/changes", response_model=RepoChangesResponse)
+async def get_structure_changes(
+    repo: RepoName,
+    since: str,
+    ref: str | None = None,
+    prefix: str = "",
+    github_service: GitHubService = Depends(get_github_service)
+) -> RepoChangesResponse:
+    """
+    Эндпоинт для получения изменений структуры репозитория с указанной ревизии.
+
+    Args:
+        repo (str): Имя репозитория на GitHub.
+        since (str): SHA коммита или дерева, полученный ранее (например, поле sha из /structure).
+        ref (str | None): Ветка, тег или SHA текущей ревизии; без него используется ветка по умолчанию.
+        prefix (str): Папка, в пределах которой ищутся изменения.
+        github_service (GitHubService): Сервис для взаимодействия с GitHub API.
+
+    Returns:
+        RepoChangesResponse: Добавленные, изменённые и удалённые узлы.
+    """
+    return await github_service.get_structure_changes(repo, since, ref=ref, prefix=prefix)
+
+@router.get("/repos/{repo}/search", response_model=SearchResponse, response_class=FastJSONResponse)
+async def search_code(
+    repo: RepoName,
+    q: str = Query(min_length=1),
+    regex: bool = False,
+    ignore_case: bool = False,
+    prefix: str = "",
+    limit: int = Query(default=100, ge=1, le=1000),
+    github_service: GitHubService = Depends(get_github_service)
+) -> FastJSONResponse:
+    """
+    Эндпоинт для поиска по коду репозитория (ветка по умолчанию).
+
+    Args:
+        repo (str): Имя репозитория на GitHub.
+        q (str): Искомая строка или регулярное выражение.
+        regex (bool): Интерпретировать q как регулярное выражение.
+        ignore_case (bool): Поиск без учёта регистра.
+        prefix (str): Папка, в пределах которой ищутся файлы.
+        limit (int): Максимальное число совпадений.
         github_service (GitHubService): Сервис для взаимодействия с GitHub API.
 
     Returns:
-        RepoStructureResponse: Ответ с информацией о структуре репозитория.
+        FastJSONResponse: Совпадения с путём, номером строки и текстом строки.
+    """
+    result = await github_service.search_code(
+        repo, q, regex=regex, ignore_case=ignore_case, prefix=prefix, limit=limit
+    )
+    return FastJSONResponse(dict(result))
+
+def _parse_range(header: str | None) -> tuple[int | None, int | None] | None:
     """
-    structure = await github_service.get_repo_structure(repo)
-    return RepoStructureResponse(repo=repo, tree=structure)
+    Разбор заголовка Range с одним диапазоном байтов.
+
+    Несколько диапазонов и нераспознанные единицы игнорируются (RFC 9110):
+    в этом случае выдаётся файл целиком.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, sep, last = header[len("bytes="):].strip().partition("-")
+    if not sep or not (first or last) or not (first or "0").isdigit() or not (last or "0").isdigit():
+        return None
+    if not first:
+        return None, int(last)
+    if last and int(last) < int(first):
+        return None
+    return int(first), int(last) if last else None
 
 @router.get("/repos/{repo}/file", response_model=FileContentResponse)
 async def get_file_content(
-    repo: str, 
+    repo: RepoName,
     path: str, 
+    response: Response,
+    start_line: int | None = Query(default=None, ge=1),
+    end_line: int | None = Query(default=None, ge=1),
+    range_header: str | None = Header(default=None, alias="Range"),
     github_service: GitHubService = Depends(get_github_service)
 ) -> FileContentResponse:
     """
@@ -43,16 +155,87 @@ async def get_file_content(
     Args:
         repo (str): Имя репозитория.
         path (str): Путь к файлу в репозитории.
+        response (Response): Ответ (статус 206 и Content-Range для заголовка Range).
+        start_line (int | None): Первая строка диапазона (с 1).
+        end_line (int | None): Последняя строка диапазона включительно.
+        range_header (str | None): Заголовок Range вида "bytes=0-1023".
+        github_service (GitHubService): Сервис для взаимодействия с GitHub API.
+
+    Returns:
+        FileContentResponse: Ответ с содержимым файла или диапазона, SHA блоба и числом строк.
+    """
+    byte_range = _parse_range(range_header)
+    result = await github_service.get_file_content(
+        repo, path, start_line=start_line, end_line=end_line, byte_range=byte_range
+    )
+    response.headers["Accept-Ranges"] = "bytes"
+    if byte_range is not None:
+        response.status_code = 206
+        response.headers["Content-Range"] = result.content_range
+    return result
+
+@router.get("/repos/{repo}/raw")
+async def get_raw_file(
+    repo: RepoName,
+    path: str,
+    ref: str | None = None,
+    if_none_match: str | None = Header(default=None),
+    github_service: GitHubService = Depends(get_github_service)
+) -> Response:
+    """
+    Эндпоинт для потоковой загрузки файла любого типа и размера.
+
+    Args:
+        repo (str): Имя репозитория.
+        path (str): Путь к файлу в репозитории.
+        ref (str | None): Ветка, тег или SHA.
+        if_none_match (str | None): Заголовок If-None-Match клиента.
         github_service (GitHubService): Сервис для взаимодействия с GitHub API.
 
     Returns:
-        FileContentResponse: Ответ с содержимым файла.
+        Response: Поток содержимого файла или 304, если он не изменился.
+    """
+    raw = await github_service.open_raw_file(repo, path, ref=ref, if_none_match=if_none_match)
+    if raw.status_code == 304:
+        await raw.close()
+        return Response(status_code=304, headers=raw.headers)
+    return StreamingResponse(
+        raw.chunks,
+        media_type=raw.media_type,
+        headers=raw.headers,
+        background=BackgroundTask(raw.close),
+    )
+
+@router.get("/repos/{repo}/archive")
+async def get_archive(
+    repo: RepoName,
+    ref: str | None = None,
+    prefix: str | None = None,
+    github_service: GitHubService = Depends(get_github_service)
+) -> StreamingResponse:
     """
-    return await github_service.get_file_content(repo, path)
+    Эндпоинт для потоковой загрузки архива репозитория (tar.gz).
+
+    Args:
+        repo (str): Имя репозитория.
+        ref (str | None): Ветка, тег или SHA.
+        prefix (str | None): Папка или файл; в архив попадают только они.
+        github_service (GitHubService): Сервис для взаимодействия с GitHub API.
+
+    Returns:
+        StreamingResponse: Поток архива.
+    """
+    archive = await github_service.open_archive(repo, ref=ref, prefix=prefix)
+    return StreamingResponse(
+        archive.chunks,
+        media_type=archive.media_type,
+        headers=archive.headers,
+        background=BackgroundTask(archive.close),
+    )
 
 @router.post("/repos/{repo}/file", response_model=FileContentResponse)
 async def create_new_file(
-    repo: str, 
+    repo: RepoName,
     file_data: CreateFileRequest, 
     github_service: GitHubService = Depends(get_github_service)
 ) -> FileContentResponse:
@@ -77,7 +260,7 @@ async def create_new_file(
 
 @router.put("/repos/{repo}/file", response_model=FileContentResponse)
 async def update_file(
-    repo: str,
+    repo: RepoName,
     file_data: UpdateFileRequest,
     github_service: GitHubService = Depends(get_github_service)
 ) -> FileContentResponse:
@@ -102,7 +285,7 @@ async def update_file(
 
 @router.delete("/repos/{repo}/file", response_model=FileContentResponse)
 async def delete_file(
-    repo: str,
+    repo: RepoName,
     file_data: DeleteFileRequest,
     github_service: GitHubService = Depends(get_github_service)
 ) -> FileContentResponse:
@@ -123,3 +306,53 @@ async def delete_file(
         file_data.filename,
         file_data.message,
     )
+
+@router.post("/repos/{repo}/commits", response_model=CommitFilesResponse)
+async def commit_files(
+    repo: RepoName,
+    commit_data: CommitFilesRequest,
+    github_service: GitHubService = Depends(get_github_service)
+) -> CommitFilesResponse:
+    """
+    Эндпоинт для атомарного коммита нескольких файлов одним коммитом.
+
+    Args:
+        repo (str): Имя репозитория.
+        commit_data (CommitFilesRequest): Сообщение коммита и список операций.
+        github_service (GitHubService): Сервис для взаимодействия с GitHub API.
+
+    Returns:
+        CommitFilesResponse: SHA коммита и результаты по каждому файлу.
+    """
+    return await github_service.commit_files(
+        repo,
+        commit_data.operations,
+        commit_data.message,
+        branch=commit_data.branch,
+    )
+
+@router.post("/repos/{repo}/files:batchGet")
+async def batch_get_files(
+    repo: RepoName,
+    batch: BatchGetFilesRequest,
+    github_service: GitHubService = Depends(get_github_service)
+) -> StreamingResponse:
+    """
+    Эндпоинт для пакетного чтения файлов.
+
+    Файлы читаются параллельно; каждый результат отправляется отдельной
+    строкой NDJSON сразу по готовности, не дожидаясь самых медленных.
+
+    Args:
+        repo (str): Имя репозитория.
+        batch (BatchGetFilesRequest): Список путей к файлам.
+        github_service (GitHubService): Сервис для взаимодействия с GitHub API.
+
+    Returns:
+        StreamingResponse: Поток NDJSON из объектов BatchFileResult.
+    """
+    async def ndjson():
+        async for result in github_service.iter_file_contents(repo, batch.paths):
+            yield result.model_dump_json() + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
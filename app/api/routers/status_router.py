@@ -0,0 +1,40 @@
+# app/api/routers/status_router.py
+
+from fastapi import APIRouter, Depends
+from app.infrastructure.github_client import GitHubClient
+from app.api.dependencies import get_github_client
+
+router = APIRouter(prefix="/status", tags=["status"])
+
+@router.get("/rate-limit")
+async def get_rate_limit_status(
+    github_client: GitHubClient = Depends(get_github_client)
+) -> dict:
+    """
+    Эндпоинт для просмотра состояния планировщика запросов к GitHub.
+
+    Args:
+        github_client (GitHubClient): Общий клиент GitHub API.
+
+    Returns:
+        dict: Остаток и сброс лимитов по ресурсам, длина очереди, счётчики.
+    """
+    return github_client.scheduler.snapshot()
+
+@router.get("/upstream")
+async def get_upstream_status(
+    github_client: GitHubClient = Depends(get_github_client)
+) -> dict:
+    """
+    Эндпоинт для просмотра счётчиков повторов и состояния предохранителей.
+
+    Args:
+        github_client (GitHubClient): Общий клиент GitHub API.
+
+    Returns:
+        dict: Попытки, повторы и состояние предохранителя по каждому хосту.
+    """
+    return {
+        "retries": github_client.retry_policy.snapshot(),
+        "breakers": {host: breaker.snapshot() for host, breaker in github_client.breakers.items()},
+    }
@@ -0,0 +1,51 @@
+# app/api/routers/webhook_router.py
+
+import json
+
+from fastapi import APIRouter, Depends, Header, Request
+from app.api.dependencies import get_github_service
+from app.core.config import GITHUB_WEBHOOK_SECRET
+from app.core.exceptions import InvalidRequestError, InvalidSignatureError
+from app.domain.models import WebhookResult
+from app.domain.services.github_service import GitHubService
+from app.domain.webhooks import PushEvent, verify_signature
+
+router = APIRouter(prefix="/webhooks", tags=["webhooks"])
+
+@router.post("/github", response_model=WebhookResult)
+async def receive_github_webhook(
+    request: Request,
+    x_github_event: str = Header(default=""),
+    x_hub_signature_256: str | None = Header(default=None),
+    github_service: GitHubService = Depends(get_github_service),
+) -> WebhookResult:
+    """
+    Эндпоинт для вебхуков GitHub: точечная инвалидация кэшей по push-событиям.
+
+    Подпись X-Hub-Signature-256 проверяется по GITHUB_WEBHOOK_SECRET; без
+    настроенного секрета вебхуки не принимаются. События, кроме push,
+    подтверждаются без действий.
+
+    Args:
+        request (Request): Запрос (подпись считается по телу как есть).
+        x_github_event (str): Тип события.
+        x_hub_signature_256 (str | None): Подпись тела.
+        github_service (GitHubService): Сервис для работы с GitHub.
+
+    Returns:
+        WebhookResult: Что было сброшено.
+    """
+    body = await request.body()
+    if not verify_signature(GITHUB_WEBHOOK_SECRET, body, x_hub_signature_256):
+        raise InvalidSignatureError("Подпись вебхука отсутствует или неверна")
+    if x_github_event != "push":
+        return WebhookResult(event=x_github_event, applied=False)
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise InvalidRequestError("Тело вебхука не является JSON")
+    event = PushEvent.from_payload(payload) if isinstance(payload, dict) else None
+    if event is None:
+        return WebhookResult(event=x_github_event, applied=False)
+    return github_service.apply_push_event(event)
@@ -6,6 +6,33 @@ from dotenv import load_dotenv
 # Загружаем переменные из .env
 load_dotenv()
 
+
+def _get_int(name: str, default: int) -> int:
+    """
+    Чтение целочисленной переменной окружения со значением по умолчанию.
+    """
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _get_float(name: str, default: float) -> float:
+    """
+    Чтение вещественной переменной окружения со значением по умолчанию.
+    """
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _get_bool(name: str, default: bool) -> bool:
+    """
+    Чтение булевой переменной окружения ("1", "true", "yes", "on" — истина).
+    """
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 # Получаем необходимые переменные окружения
 MY_GITHUB_TOKEN = os.getenv('MY_GITHUB_TOKEN')
 MY_GITHUB_USERNAME = os.getenv('MY_GITHUB_USERNAME')
@@ -15,3 +42,118 @@ if MY_GITHUB_TOKEN is None:
 
 if MY_GITHUB_USERNAME is None:
     raise ValueError("Не удалось найти MY_GITHUB_USERNAME в переменных окружения")
+
+# Базовый URL GitHub API
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+GITHUB_GRAPHQL_URL = os.getenv("GITHUB_GRAPHQL_URL", f"{GITHUB_API_URL}/graphql")
+
+# Пул соединений общего HTTP-клиента (один на воркер)
+GITHUB_HTTP_MAX_CONNECTIONS = _get_int("GITHUB_HTTP_MAX_CONNECTIONS", 100)
+GITHUB_HTTP_MAX_KEEPALIVE = _get_int("GITHUB_HTTP_MAX_KEEPALIVE", 20)
+GITHUB_HTTP_KEEPALIVE_EXPIRY = _get_float("GITHUB_HTTP_KEEPALIVE_EXPIRY", 30.0)
+GITHUB_HTTP2 = _get_bool("GITHUB_HTTP2", True)
+
+# Таймауты по фазам запроса, в секундах
+GITHUB_TIMEOUT_CONNECT = _get_float("GITHUB_TIMEOUT_CONNECT", 5.0)
+GITHUB_TIMEOUT_READ = _get_float("GITHUB_TIMEOUT_READ", 30.0)
+GITHUB_TIMEOUT_WRITE = _get_float("GITHUB_TIMEOUT_WRITE", 30.0)
+GITHUB_TIMEOUT_POOL = _get_float("GITHUB_TIMEOUT_POOL", 5.0)
+
+# Кэш условных запросов (ETag / Last-Modified)
+GITHUB_CACHE_MAX_ENTRIES = _get_int("GITHUB_CACHE_MAX_ENTRIES", 2048)
+GITHUB_CACHE_MAX_BYTES = _get_int("GITHUB_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+
+# Время жизни мета-информации о репозитории (default_branch, head SHA), в секундах
+GITHUB_REPO_METADATA_TTL = _get_float("GITHUB_REPO_METADATA_TTL", 300.0)
+
+# Максимальное число путей в индексе path → blob SHA
+GITHUB_BLOB_INDEX_MAX_ENTRIES = _get_int("GITHUB_BLOB_INDEX_MAX_ENTRIES", 200_000)
+
+# Пакетный коммит через Git Data API
+GITHUB_BLOB_UPLOAD_CONCURRENCY = _get_int("GITHUB_BLOB_UPLOAD_CONCURRENCY", 8)
+GITHUB_COMMIT_MAX_ATTEMPTS = _get_int("GITHUB_COMMIT_MAX_ATTEMPTS", 3)
+
+# Максимум одновременных запросов к GitHub при пакетном чтении файлов
+GITHUB_BATCH_READ_CONCURRENCY = _get_int("GITHUB_BATCH_READ_CONCURRENCY", 8)
+
+# Пакетное чтение небольших файлов через GraphQL: файлов и байт на один запрос
+# (ограничение стоимости и времени выполнения запроса); 0 или 1 отключает
+GITHUB_GRAPHQL_BATCH_SIZE = _get_int("GITHUB_GRAPHQL_BATCH_SIZE", 50)
+GITHUB_GRAPHQL_BATCH_MAX_BYTES = _get_int("GITHUB_GRAPHQL_BATCH_MAX_BYTES", 1024 * 1024)
+GITHUB_GRAPHQL_MAX_FILE_SIZE = _get_int("GITHUB_GRAPHQL_MAX_FILE_SIZE", 100 * 1024)
+
+# Размер порции при потоковой передаче файлов, в байтах
+GITHUB_RAW_CHUNK_SIZE = _get_int("GITHUB_RAW_CHUNK_SIZE", 64 * 1024)
+
+# Число индексов деревьев (по SHA дерева), хранимых в памяти
+GITHUB_TREE_INDEX_CACHE_SIZE = _get_int("GITHUB_TREE_INDEX_CACHE_SIZE", 16)
+
+# Планировщик запросов с учётом лимитов GitHub
+GITHUB_RATE_LIMIT_BURST = _get_int("GITHUB_RATE_LIMIT_BURST", 20)
+GITHUB_RATE_LIMIT_PACING_THRESHOLD = _get_int("GITHUB_RATE_LIMIT_PACING_THRESHOLD", 1000)
+GITHUB_RATE_LIMIT_BULK_RESERVE = _get_int("GITHUB_RATE_LIMIT_BULK_RESERVE", 200)
+GITHUB_SECONDARY_LIMIT_PAUSE = _get_float("GITHUB_SECONDARY_LIMIT_PAUSE", 60.0)
+GITHUB_MUTATION_INTERVAL = _get_float("GITHUB_MUTATION_INTERVAL", 0.0)
+
+# Повторы запросов к GitHub и предохранитель
+GITHUB_RETRY_MAX_ATTEMPTS = _get_int("GITHUB_RETRY_MAX_ATTEMPTS", 3)
+GITHUB_RETRY_BASE_DELAY = _get_float("GITHUB_RETRY_BASE_DELAY", 0.2)
+GITHUB_RETRY_MAX_DELAY = _get_float("GITHUB_RETRY_MAX_DELAY", 5.0)
+GITHUB_RETRY_DEADLINE = _get_float("GITHUB_RETRY_DEADLINE", 10.0)
+GITHUB_BREAKER_FAILURE_THRESHOLD = _get_int("GITHUB_BREAKER_FAILURE_THRESHOLD", 5)
+GITHUB_BREAKER_RESET_TIMEOUT = _get_float("GITHUB_BREAKER_RESET_TIMEOUT", 30.0)
+GITHUB_BREAKER_PROBE_TIMEOUT = _get_float("GITHUB_BREAKER_PROBE_TIMEOUT", 10.0)
+
+# Проверка содержимого файлов вне цикла событий: разбор синтаксиса держит GIL,
+# поэтому цикл событий освобождает только пул процессов
+VALIDATION_EXECUTOR = os.getenv("VALIDATION_EXECUTOR", "process")
+VALIDATION_MAX_WORKERS = _get_int("VALIDATION_MAX_WORKERS", 4)
+VALIDATION_TIMEOUT = _get_float("VALIDATION_TIMEOUT", 10.0)
+VALIDATION_INLINE_MAX_CHARS = _get_int("VALIDATION_INLINE_MAX_CHARS", 64 * 1024)
+
+# Трассировка запросов (Server-Timing) и журнал доступа
+TRACE_SAMPLE_RATE = _get_float("TRACE_SAMPLE_RATE", 0.01)
+TRACE_DEBUG = _get_bool("TRACE_DEBUG", False)
+ACCESS_LOG = _get_bool("ACCESS_LOG", True)
+
+# Вебхуки GitHub: секрет подписи и время, в течение которого записи кэша
+# веток и содержимого отдаются без ревалидации (о push сообщит вебхук)
+GITHUB_WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET") or None
+GITHUB_WEBHOOK_TRUST_TTL = _get_float("GITHUB_WEBHOOK_TRUST_TTL", 300.0)
+
+# Поиск по коду: триграммный индекс текстовых блобов ветки по умолчанию
+SEARCH_INDEX_DIR = os.getenv("SEARCH_INDEX_DIR", ".search_index")
+SEARCH_INDEX_MAX_REPOS = _get_int("SEARCH_INDEX_MAX_REPOS", 8)
+SEARCH_INDEX_MAX_BYTES = _get_int("SEARCH_INDEX_MAX_BYTES", 1024 * 1024 * 1024)
+SEARCH_MAX_FILE_SIZE = _get_int("SEARCH_MAX_FILE_SIZE", 1024 * 1024)
+
+# Кэш декодированных блобов с индексом строк (чтение диапазонов строк и байтов)
+DECODED_BLOB_CACHE_MAX_BYTES = _get_int("DECODED_BLOB_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+
+# Хранилище блобов на диске, общее для воркеров: папка, принадлежащая
+# пользователю сервиса (создаётся с правами 0700); по умолчанию выключено
+BLOB_STORE_DIR = os.getenv("BLOB_STORE_DIR", "")
+BLOB_STORE_MAX_BYTES = _get_int("BLOB_STORE_MAX_BYTES", 1024 * 1024 * 1024)
+
+# Архив репозитория: файлы не больше этого размера попутно сохраняются в
+# хранилище блобов (0 отключает прогрев); сколько байт блобов копить перед записью
+ARCHIVE_WARM_MAX_FILE_SIZE = _get_int("ARCHIVE_WARM_MAX_FILE_SIZE", 1024 * 1024)
+ARCHIVE_WARM_BATCH_BYTES = _get_int("ARCHIVE_WARM_BATCH_BYTES", 8 * 1024 * 1024)
+
+# Общий для воркеров кэш метаданных (ETag, деревья, головы веток) в SQLite;
+# пустой путь отключает его
+SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH", "")
+SHARED_CACHE_TTL = _get_float("SHARED_CACHE_TTL", 86400.0)
+SHARED_CACHE_BATCH_SIZE = _get_int("SHARED_CACHE_BATCH_SIZE", 64)
+SHARED_CACHE_FLUSH_INTERVAL = _get_float("SHARED_CACHE_FLUSH_INTERVAL", 1.0)
+SHARED_CACHE_POLL_INTERVAL = _get_float("SHARED_CACHE_POLL_INTERVAL", 0.5)
+
+# Пул учётных данных: дополнительные токены через запятую и установки GitHub App
+# (GITHUB_APP_INSTALLATIONS="owner=installation_id,..."; нужен пакет PyJWT[crypto])
+GITHUB_TOKENS = os.getenv("GITHUB_TOKENS", "")
+GITHUB_APP_ID = os.getenv("GITHUB_APP_ID") or None
+GITHUB_APP_PRIVATE_KEY = os.getenv("GITHUB_APP_PRIVATE_KEY") or None
+GITHUB_APP_PRIVATE_KEY_PATH = os.getenv("GITHUB_APP_PRIVATE_KEY_PATH") or None
+GITHUB_APP_INSTALLATIONS = os.getenv("GITHUB_APP_INSTALLATIONS", "")
+# Как часто запрос, ждущий бюджет токена, перепроверяет выбор токена, с
+GITHUB_TOKEN_RESELECT_INTERVAL = _get_float("GITHUB_TOKEN_RESELECT_INTERVAL", 1.0)
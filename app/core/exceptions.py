@@ -23,3 +23,43 @@ class InvalidRepositoryError(GitHubAPIError):
     """
     def __init__(self, message: str):
         super().__init__(message, status_code=404)
+
+
+class InvalidRequestError(GitHubAPIError):
+    """
+    Некорректные параметры запроса (например, повреждённый курсор пагинации).
+    """
+    def __init__(self, message: str):
+        super().__init__(message, status_code=400)
+
+
+class UpstreamUnavailableError(GitHubAPIError):
+    """
+    GitHub недоступен: сетевые ошибки после всех повторов или разомкнутый предохранитель.
+    """
+    def __init__(self, message: str):
+        super().__init__(message, status_code=503)
+
+
+class InvalidSignatureError(GitHubAPIError):
+    """
+    Подпись вебхука отсутствует или не совпадает с секретом.
+    """
+    def __init__(self, message: str):
+        super().__init__(message, status_code=401)
+
+
+class RangeNotSatisfiableError(GitHubAPIError):
+    """
+    Запрошенный диапазон строк или байтов лежит за пределами файла.
+    """
+    def __init__(self, message: str):
+        super().__init__(message, status_code=416)
+
+
+class GraphQLError(GitHubAPIError):
+    """
+    GitHub GraphQL API вернул ошибки вместо данных.
+    """
+    def __init__(self, message: str):
+        super().__init__(message, status_code=502)
@@ -0,0 +1,176 @@
+# app/domain/archive.py
+
+import tarfile
+
+BLOCK_SIZE = tarfile.BLOCKSIZE
+_ZERO_BLOCK = bytes(BLOCK_SIZE)
+# Записи, которые описывают следующую запись (или весь архив), а не файл
+_META_TYPES = (tarfile.XHDTYPE, tarfile.XGLTYPE, tarfile.GNUTYPE_LONGNAME, tarfile.GNUTYPE_LONGLINK)
+
+
+def _padded(size: int) -> int:
+    return -(-size // BLOCK_SIZE) * BLOCK_SIZE
+
+
+def _parse_pax(data: bytes) -> dict[str, str]:
+    """
+    Записи расширенного заголовка pax: "<длина> <ключ>=<значение>\\n".
+    """
+    records = {}
+    pos = 0
+    while pos < len(data) and data[pos] != 0:
+        space = data.index(b" ", pos)
+        length = int(data[pos:space])
+        key, _, value = data[space + 1:pos + length - 1].partition(b"=")
+        records[key.decode("utf-8", "surrogateescape")] = value.decode("utf-8", "surrogateescape")
+        pos += length
+    return records
+
+
+class TarFilter:
+    """
+    Инкрементальный разбор потока tar (уже распакованного из gzip).
+
+    Записи, путь которых попадает под префикс, выдаются как есть —
+    заголовки и данные без перепаковки, поэтому отфильтрованный архив
+    строится по мере поступления данных. Попутно собирается содержимое
+    небольших файлов (для прогрева хранилища блобов). В памяти держится
+    не больше одного заголовка и содержимого одного собираемого файла.
+
+    Пути считаются относительно корневой папки архива GitHub
+    ("owner-repo-sha/"), сама папка в путь не входит.
+    """
+    def __init__(self, prefix: str | None = None, collect_max_size: int = 0):
+        """
+        Args:
+            prefix (str | None): Папка или файл, записи которых попадают в вывод;
+                None — выводятся все записи.
+            collect_max_size (int): Файлы не больше этого размера собираются в blobs;
+                0 — не собирать.
+        """
+        prefix = prefix.strip("/") if prefix else ""
+        self.prefix = prefix or None
+        self.collect_max_size = collect_max_size
+        self.blobs: list[bytes] = []
+        self.matched = 0
+        self.ended = False
+        self._buffer = bytearray()
+        self._remaining = 0   # байтов данных текущей записи с выравниванием
+        self._data_left = 0   # байтов данных без выравнивания
+        self._emit = False
+        self._collect: bytearray | None = None
+        self._meta_type: bytes | None = None
+        self._meta = bytearray()  # заголовки pax/GNU перед следующей записью, как есть
+        self._pax: dict[str, str] = {}
+        self._long_name: str | None = None
+
+    def _matches(self, path: str) -> bool:
+        if self.prefix is None:
+            return True
+        _, _, relative = path.rstrip("/").partition("/")
+        return relative == self.prefix or relative.startswith(self.prefix + "/")
+
+    def feed(self, data: bytes) -> bytes:
+        """
+        Обработка очередной порции распакованного tar.
+
+        Args:
+            data (bytes): Порция данных.
+
+        Returns:
+            bytes: Байты отфильтрованного tar (без завершающих блоков).
+
+        Raises:
+            ValueError: Повреждённый заголовок tar.
+        """
+        out = bytearray()
+        self._buffer += data
+        buffer = self._buffer
+        pos = 0
+        while not self.ended:
+            if self._remaining:
+                take = min(self._remaining, len(buffer) - pos)
+                if take == 0:
+                    break
+                self._consume(buffer[pos:pos + take], out)
+                pos += take
+                self._remaining -= take
+                if self._remaining == 0:
+                    self._finish_entry()
+                continue
+            if len(buffer) - pos < BLOCK_SIZE:
+                break
+            block = bytes(buffer[pos:pos + BLOCK_SIZE])
+            pos += BLOCK_SIZE
+            if block == _ZERO_BLOCK:
+                self.ended = True
+                break
+            self._start_entry(block, out)
+        del buffer[:pos]
+        if self.ended:
+            buffer.clear()
+        return bytes(out)
+
+    def finish(self) -> bytes:
+        """
+        Завершающие блоки отфильтрованного архива.
+        """
+        return _ZERO_BLOCK * 2
+
+    def _start_entry(self, block: bytes, out: bytearray) -> None:
+        try:
+            info = tarfile.TarInfo.frombuf(block, "utf-8", "surrogateescape")
+        except tarfile.HeaderError as e:
+            raise ValueError(f"Повреждённый архив: {e}") from e
+
+        size = info.size
+        if info.type in _META_TYPES:
+            self._meta_type = info.type
+            self._collect = bytearray()
+            # Глобальный заголовок (у GitHub — SHA коммита) относится ко всему архиву
+            self._emit = info.type == tarfile.XGLTYPE
+            if self._emit:
+                out += block
+            else:
+                self._meta += block
+        else:
+            path = self._long_name or self._pax.get("path") or info.name
+            size = int(self._pax.get("size", size))
+            self._emit = self._matches(path)
+            if self._emit:
+                out += self._meta
+                out += block
+                self.matched += 1
+            self._meta.clear()
+            self._pax = {}
+            self._long_name = None
+            collect = info.isreg() and 0 < self.collect_max_size and size <= self.collect_max_size
+            self._collect = bytearray() if collect else None
+        self._data_left = size
+        self._remaining = _padded(size)
+        if self._remaining == 0:
+            self._finish_entry()
+
+    def _consume(self, chunk, out: bytearray) -> None:
+        useful = min(len(chunk), self._data_left)
+        self._data_left -= useful
+        if self._emit:
+            out += chunk
+        elif self._meta_type is not None:
+            self._meta += chunk
+        if self._collect is not None:
+            self._collect += chunk[:useful]
+
+    def _finish_entry(self) -> None:
+        if self._meta_type == tarfile.XHDTYPE:
+            try:
+                self._pax.update(_parse_pax(bytes(self._collect)))
+            except ValueError as e:
+                raise ValueError(f"Повреждённый заголовок pax: {e}") from e
+        elif self._meta_type == tarfile.GNUTYPE_LONGNAME:
+            self._long_name = self._collect.rstrip(b"\0").decode("utf-8", "surrogateescape")
+        elif self._meta_type is None and self._collect is not None:
+            self.blobs.append(bytes(self._collect))
+        self._meta_type = None
+        self._collect = None
+        self._emit = False
@@ -1,5 +1,8 @@
 # app/domain/models.py
 
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Literal
+
 from pydantic import BaseModel
 
 class RepoStructureResponse(BaseModel):
@@ -9,9 +12,49 @@ class RepoStructureResponse(BaseModel):
     Attributes:
         repo (str): Имя репозитория.
         tree (list): Список файлов и папок в репозитории.
+        sha (str | None): SHA дерева, из которого построен ответ.
+        truncated (bool): GitHub вернул усечённое дерево.
+        next_cursor (str | None): Курсор следующей страницы (None — страниц больше нет).
     """
     repo: str
     tree: list
+    sha: str | None = None
+    truncated: bool = False
+    next_cursor: str | None = None
+
+class TreeChange(BaseModel):
+    """
+    Изменение узла дерева между двумя ревизиями.
+
+    Attributes:
+        path (str): Путь узла.
+        type (str | None): Тип узла: "blob" или "tree".
+        change (str): "added", "modified" или "deleted".
+        sha (str | None): SHA узла в новой ревизии (None для удалённых).
+        previous_sha (str | None): SHA узла в исходной ревизии (None для добавленных).
+    """
+    path: str
+    type: str | None = None
+    change: Literal["added", "modified", "deleted"]
+    sha: str | None = None
+    previous_sha: str | None = None
+
+class RepoChangesResponse(BaseModel):
+    """
+    Ответ с изменениями структуры репозитория с указанной ревизии.
+
+    Attributes:
+        repo (str): Имя репозитория.
+        base_sha (str | None): SHA исходного дерева (ревизия since).
+        sha (str | None): SHA текущего дерева.
+        changes (list[TreeChange]): Добавленные, изменённые и удалённые узлы.
+        truncated (bool): Одно из деревьев усечено GitHub, список может быть неполным.
+    """
+    repo: str
+    base_sha: str | None = None
+    sha: str | None = None
+    changes: list[TreeChange]
+    truncated: bool = False
 
 class FileContentResponse(BaseModel):
     """
@@ -19,12 +62,21 @@ class FileContentResponse(BaseModel):
 
     Attributes:
         path (str): Путь к файлу.
-        content (str): Содержимое файла.
+        content (str): Содержимое файла (или запрошенного диапазона).
         encoding (str): Кодировка файла.
+        sha (str | None): SHA блоба.
+        total_lines (int | None): Число строк во всём файле.
+        size (int | None): Размер всего файла в байтах.
+        content_range (str | None): Выданный диапазон, например "lines 1-50/10000"
+            или "bytes 0-99/4096"; None — файл целиком.
     """
     path: str
     content: str
     encoding: str
+    sha: str | None = None
+    total_lines: int | None = None
+    size: int | None = None
+    content_range: str | None = None
 
 class CreateFileRequest(BaseModel):
     """
@@ -72,3 +124,146 @@ class DeleteFileRequest(BaseModel):
     path: str
     filename: str
     message: str
+
+class CommitOperation(BaseModel):
+    """
+    Одна файловая операция в пакетном коммите.
+
+    Attributes:
+        action (str): Тип операции: "create", "update" или "delete".
+        path (str): Путь к папке в репозитории.
+        filename (str): Имя файла.
+        content (str | None): Содержимое файла (обязательно для create/update).
+    """
+    action: Literal["create", "update", "delete"]
+    path: str
+    filename: str
+    content: str | None = None
+
+class CommitFilesRequest(BaseModel):
+    """
+    Запрос на атомарный коммит нескольких файлов.
+
+    Attributes:
+        message (str): Сообщение коммита.
+        operations (list[CommitOperation]): Файловые операции.
+        branch (str | None): Ветка; по умолчанию — ветка по умолчанию репозитория.
+    """
+    message: str
+    operations: list[CommitOperation]
+    branch: str | None = None
+
+class FileOperationResult(BaseModel):
+    """
+    Результат одной файловой операции пакетного коммита.
+
+    Attributes:
+        path (str): Полный путь к файлу.
+        action (str): Выполненная операция.
+        sha (str | None): SHA нового блоба (None для удаления).
+    """
+    path: str
+    action: str
+    sha: str | None = None
+
+class CommitFilesResponse(BaseModel):
+    """
+    Ответ на атомарный коммит нескольких файлов.
+
+    Attributes:
+        commit_sha (str): SHA созданного коммита.
+        branch (str): Ветка, на которую перемотан коммит.
+        files (list[FileOperationResult]): Результаты по каждому файлу.
+    """
+    commit_sha: str
+    branch: str
+    files: list[FileOperationResult]
+
+class BatchGetFilesRequest(BaseModel):
+    """
+    Запрос на пакетное чтение файлов.
+
+    Attributes:
+        paths (list[str]): Пути к файлам в репозитории.
+    """
+    paths: list[str]
+
+class BatchFileResult(BaseModel):
+    """
+    Результат чтения одного файла в пакетном запросе (одна строка NDJSON).
+
+    Attributes:
+        path (str): Запрошенный путь.
+        status (int): HTTP-статус результата для этого файла.
+        file (FileContentResponse | None): Содержимое файла при успехе.
+        error (str | None): Описание ошибки при неудаче.
+    """
+    path: str
+    status: int
+    file: FileContentResponse | None = None
+    error: str | None = None
+
+@dataclass
+class RawFileStream:
+    """
+    Потоковое содержимое файла для отдачи клиенту без буферизации.
+
+    Attributes:
+        status_code (int): 200 или 304 (содержимое не изменилось).
+        headers (dict[str, str]): Заголовки для проброса клиенту (ETag, Content-Length и т.п.).
+        media_type (str): MIME-тип содержимого.
+        chunks (AsyncIterator[bytes]): Порции содержимого ограниченного размера.
+        close (Callable[[], Awaitable[None]]): Закрытие upstream-соединения.
+    """
+    status_code: int
+    headers: dict[str, str]
+    media_type: str
+    chunks: AsyncIterator[bytes]
+    close: Callable[[], Awaitable[None]]
+
+class SearchMatch(BaseModel):
+    """
+    Строка файла, совпавшая с поисковым запросом.
+
+    Attributes:
+        path (str): Путь к файлу.
+        line (int): Номер строки (с 1).
+        snippet (str): Текст строки (обрезается до 200 символов).
+    """
+    path: str
+    line: int
+    snippet: str
+
+class SearchResponse(BaseModel):
+    """
+    Результат поиска по коду репозитория.
+
+    Attributes:
+        repo (str): Имя репозитория.
+        sha (str | None): SHA дерева, по которому выполнен поиск.
+        query (str): Запрос.
+        matches (list[SearchMatch]): Совпадения в порядке путей и строк.
+        truncated (bool): Совпадений больше, чем limit, или дерево GitHub усечено.
+    """
+    repo: str
+    sha: str | None
+    query: str
+    matches: list[SearchMatch]
+    truncated: bool = False
+
+class WebhookResult(BaseModel):
+    """
+    Результат обработки вебхука GitHub.
+
+    Attributes:
+        event (str): Тип события (заголовок X-GitHub-Event).
+        applied (bool): Событие повлияло на кэши.
+        repo (str | None): Репозиторий события.
+        branch (str | None): Ветка push-события.
+        paths (int | None): Число инвалидированных путей (None — сброшено всё содержимое).
+    """
+    event: str
+    applied: bool
+    repo: str | None = None
+    branch: str | None = None
+    paths: int | None = None
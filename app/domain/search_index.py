@@ -0,0 +1,358 @@
+# app/domain/search_index.py
+
+import asyncio
+import gzip
+import json
+import mmap
+import os
+import re
+import tempfile
+from bisect import bisect_right
+from collections import OrderedDict
+from pathlib import Path
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+from app.infrastructure.blob_store import BlobStore
+
+# Формат файла индекса; при несовпадении индекс строится заново
+FORMAT_VERSION = 2
+SNIPPET_MAX_CHARS = 200
+
+
+def trigrams(text: str) -> set[str]:
+    """
+    Триграммы текста без учёта регистра.
+    """
+    low = text.lower()
+    return {low[i:i + 3] for i in range(len(low) - 2)}
+
+
+def _required_literals(pattern: str) -> list[str]:
+    """
+    Литеральные фрагменты, которые обязаны входить в любое совпадение
+    регулярного выражения (последовательные символы верхнего уровня).
+
+    Ветвления, классы символов и повторы прерывают фрагмент; выражение
+    с альтернативой на верхнем уровне даёт пустой список (фильтра нет).
+    """
+    runs, current = [], []
+    for op, arg in sre_parse.parse(pattern):
+        if op is sre_parse.LITERAL:
+            current.append(chr(arg))
+            continue
+        if current:
+            runs.append("".join(current))
+            current = []
+    if current:
+        runs.append("".join(current))
+    return [run for run in runs if len(run) >= 3]
+
+
+def compile_query(query: str, regex: bool = False, ignore_case: bool = False) -> tuple[re.Pattern, set[str]]:
+    """
+    Подготовка поискового запроса.
+
+    Args:
+        query (str): Строка или регулярное выражение.
+        regex (bool): Интерпретировать query как регулярное выражение.
+        ignore_case (bool): Поиск без учёта регистра.
+
+    Returns:
+        tuple[re.Pattern, set[str]]: Выражение для проверки строк и триграммы,
+            которые должны быть у файла-кандидата.
+
+    Raises:
+        ValueError: Пустой запрос или некорректное регулярное выражение.
+    """
+    if not query:
+        raise ValueError("Пустой поисковый запрос")
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    try:
+        pattern = re.compile(query if regex else re.escape(query), flags)
+        literals = _required_literals(query) if regex else [query]
+    except re.error as e:
+        raise ValueError(f"Некорректное регулярное выражение: {e}")
+    required: set[str] = set()
+    for literal in literals:
+        required |= trigrams(literal)
+    return pattern, required
+
+
+class SearchIndex:
+    """
+    Триграммный индекс текстовых блобов одного дерева (ветки по умолчанию).
+
+    Тексты хранятся на диске по SHA блоба (в хранилище блобов индекса),
+    в памяти остаются только списки триграмм. При смене дерева загружаются
+    только новые блобы, а одинаковые файлы индексируются один раз.
+    Кандидаты отбираются пересечением списков триграмм, затем строки
+    проверяются регулярным выражением. Обновление и поиск читают диск,
+    поэтому выполняются вне цикла событий и не одновременно.
+    """
+    def __init__(self, store: BlobStore):
+        """
+        Args:
+            store (BlobStore): Хранилище текстов индексированных блобов.
+        """
+        self.store = store
+        self.tree_sha: str | None = None
+        self.truncated = False
+        self.paths: dict[str, str] = {}
+        # SHA проиндексированных блобов (тексты — в self.store)
+        self.indexed: set[str] = set()
+        # Блобы, которые не индексируются (двоичные или не в UTF-8): повторно не загружаются
+        self.skipped: set[str] = set()
+        self._postings: dict[str, set[str]] = {}
+
+    def missing(self, shas) -> set[str]:
+        """
+        SHA блобов, которых ещё нет в индексе.
+        """
+        return {sha for sha in shas if sha not in self.indexed and sha not in self.skipped}
+
+    def _text(self, sha: str) -> str | None:
+        data = self.store.get(sha)
+        if data is None:
+            return None
+        try:
+            return data[:].decode("utf-8")
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    def _add(self, sha: str, text: str) -> None:
+        self.indexed.add(sha)
+        for gram in trigrams(text):
+            self._postings.setdefault(gram, set()).add(sha)
+
+    def _remove(self, shas: set[str]) -> None:
+        if not shas:
+            return
+        self.indexed -= shas
+        for gram in list(self._postings):
+            postings = self._postings[gram]
+            postings -= shas
+            if not postings:
+                del self._postings[gram]
+
+    def update(
+        self,
+        tree_sha: str | None,
+        paths: dict[str, str],
+        texts: dict[str, str | None],
+        truncated: bool = False,
+    ) -> None:
+        """
+        Переход индекса на новое дерево (читает и пишет диск — вызывать вне цикла событий).
+
+        Args:
+            tree_sha (str | None): SHA дерева.
+            paths (dict[str, str]): Путь → SHA блоба для всех индексируемых файлов дерева.
+            texts (dict[str, str | None]): Новые блобы: SHA → текст (None — не текст).
+            truncated (bool): GitHub вернул усечённое дерево.
+        """
+        for sha, text in texts.items():
+            if text is None:
+                self.skipped.add(sha)
+                continue
+            self.store.put(sha, text.encode("utf-8"))
+            self._add(sha, text)
+
+        referenced = set(paths.values())
+        self._remove({sha for sha in self.indexed if sha not in referenced})
+        self.skipped &= referenced
+
+        self.tree_sha = tree_sha
+        self.truncated = truncated
+        self.paths = {path: sha for path, sha in paths.items() if sha in self.indexed}
+
+    def _candidates(self, required: set[str]) -> set[str] | None:
+        """
+        SHA блобов, содержащих все триграммы (None — фильтра нет, подходят все).
+        """
+        if not required:
+            return None
+        result: set[str] | None = None
+        for gram in sorted(required, key=lambda g: len(self._postings.get(g, ()))):
+            postings = self._postings.get(gram)
+            if not postings:
+                return set()
+            result = set(postings) if result is None else result & postings
+            if not result:
+                break
+        return result
+
+    def search(
+        self,
+        pattern: re.Pattern,
+        required: set[str],
+        prefix: str = "",
+        limit: int = 100,
+    ) -> tuple[list[dict], bool]:
+        """
+        Поиск совпадений по строкам файлов (читает диск — вызывать вне цикла событий).
+
+        Блоб, пропавший из хранилища, исключается из индекса и будет
+        загружен заново при следующем обновлении.
+
+        Args:
+            pattern (re.Pattern): Выражение из compile_query.
+            required (set[str]): Триграммы из compile_query.
+            prefix (str): Папка, в пределах которой ищутся файлы.
+            limit (int): Максимальное число совпадений.
+
+        Returns:
+            tuple[list[dict], bool]: Совпадения (path, line, snippet) в порядке
+                путей и признак того, что результат обрезан по limit.
+        """
+        candidates = self._candidates(required)
+        prefix = prefix.strip("/")
+        matches: list[dict] = []
+        lost: set[str] = set()
+        for path in sorted(self.paths):
+            if prefix and path != prefix and not path.startswith(prefix + "/"):
+                continue
+            sha = self.paths[path]
+            if candidates is not None and sha not in candidates:
+                continue
+            text = self._text(sha)
+            if text is None:
+                lost.add(sha)
+                continue
+            # Начала строк считаются только для файлов с совпадениями и не кэшируются
+            starts: list[int] | None = None
+            last_line = 0
+            for match in pattern.finditer(text):
+                if starts is None:
+                    starts = [0] + [m.end() for m in re.finditer("\n", text)]
+                line = bisect_right(starts, match.start())
+                if line == last_line:
+                    continue
+                if len(matches) >= limit:
+                    self._forget(lost)
+                    return matches, True
+                last_line = line
+                start = text.rfind("\n", 0, match.start()) + 1
+                end = text.find("\n", match.start())
+                snippet = text[start:end if end != -1 else len(text)].rstrip("\r")
+                matches.append({"path": path, "line": line, "snippet": snippet[:SNIPPET_MAX_CHARS]})
+        self._forget(lost)
+        return matches, False
+
+    def _forget(self, lost: set[str]) -> None:
+        """
+        Исключение блобов, вытесненных из хранилища: следующее обновление загрузит их заново.
+        """
+        if lost:
+            self._remove(lost)
+            self.tree_sha = None
+
+    def save(self, file: Path) -> None:
+        """
+        Атомарная запись описания индекса на диск (gzip JSON).
+
+        Тексты уже лежат в хранилище блобов, триграммы не сохраняются:
+        файл содержит только дерево, пути и пропущенные блобы.
+        """
+        file.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": FORMAT_VERSION,
+            "tree_sha": self.tree_sha,
+            "truncated": self.truncated,
+            "paths": self.paths,
+            "skipped": sorted(self.skipped),
+        }
+        fd, tmp = tempfile.mkstemp(dir=file.parent, prefix=file.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=5) as out:
+                out.write(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+            os.replace(tmp, file)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, file: Path, store: BlobStore) -> "SearchIndex":
+        """
+        Загрузка индекса с диска; при отсутствии или повреждении файла — пустой индекс.
+
+        Триграммы строятся заново по текстам из хранилища. Если часть
+        текстов вытеснена, индекс считается устаревшим и при обновлении
+        догрузит недостающие блобы.
+        """
+        index = cls(store)
+        try:
+            with gzip.open(file, "rb") as f:
+                data = json.loads(f.read())
+        except (OSError, EOFError, ValueError):
+            return index
+        if data.get("version") != FORMAT_VERSION:
+            return index
+        paths = data.get("paths") or {}
+        for sha in set(paths.values()):
+            text = index._text(sha)
+            if text is not None:
+                index._add(sha, text)
+        index.skipped = set(data.get("skipped") or ())
+        index.paths = {path: sha for path, sha in paths.items() if sha in index.indexed}
+        index.truncated = bool(data.get("truncated"))
+        if len(index.paths) == len(paths):
+            index.tree_sha = data.get("tree_sha")
+        return index
+
+
+class SearchIndexStore:
+    """
+    Индексы поиска по репозиториям: в памяти (LRU) и на диске.
+
+    На диске у каждого репозитория небольшой файл с описанием дерева,
+    а тексты блобов лежат по одному файлу на SHA в общем для репозиториев
+    хранилище (папка blobs). Обновление индекса и поиск по нему выполняются
+    под замком репозитория, чтобы одновременные запросы не загружали одни
+    и те же блобы и не читали индекс во время его изменения.
+    """
+    def __init__(self, directory: str | Path, max_repos: int = 8, max_bytes: int = 1024 * 1024 * 1024):
+        """
+        Args:
+            directory (str | Path): Папка для файлов индексов.
+            max_repos (int): Максимальное число индексов в памяти.
+            max_bytes (int): Лимит размера текстов на диске в байтах.
+        """
+        self.directory = Path(directory)
+        self.max_repos = max_repos
+        # Папки создаются при первой записи: без поиска по коду сервис ничего не пишет на диск
+        self.blobs = BlobStore(self.directory / "blobs", max_bytes, lazy=True)
+        self._indexes: OrderedDict[str, SearchIndex] = OrderedDict()
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def _file(self, repo: str) -> Path:
+        return self.directory / f"{repo}.json.gz"
+
+    def lock(self, repo: str) -> asyncio.Lock:
+        """
+        Замок обновления индекса репозитория.
+        """
+        return self._locks.setdefault(repo, asyncio.Lock())
+
+    async def get(self, repo: str) -> SearchIndex:
+        """
+        Индекс репозитория из памяти или с диска (пустой, если его ещё нет).
+        """
+        index = self._indexes.get(repo)
+        if index is None:
+            index = await asyncio.to_thread(SearchIndex.load, self._file(repo), self.blobs)
+            self._indexes[repo] = index
+        self._indexes.move_to_end(repo)
+        while len(self._indexes) > self.max_repos:
+            self._indexes.popitem(last=False)
+        return index
+
+    async def save(self, repo: str, index: SearchIndex) -> None:
+        """
+        Сохранение индекса репозитория на диск вне цикла событий.
+        """
+        await asyncio.to_thread(index.save, self._file(repo))
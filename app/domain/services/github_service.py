@@ -1,12 +1,75 @@
 # app/domain/services/github_service.py
 
+import asyncio
 import base64
 import httpx
-import hashlib
+import logging
+import mimetypes
+import re
+import zlib
+from typing import AsyncIterator
+
+from app.core.config import (
+    ARCHIVE_WARM_BATCH_BYTES,
+    ARCHIVE_WARM_MAX_FILE_SIZE,
+    BLOB_STORE_DIR,
+    BLOB_STORE_MAX_BYTES,
+    GITHUB_BATCH_READ_CONCURRENCY,
+    GITHUB_BLOB_UPLOAD_CONCURRENCY,
+    GITHUB_COMMIT_MAX_ATTEMPTS,
+    GITHUB_GRAPHQL_BATCH_MAX_BYTES,
+    GITHUB_GRAPHQL_BATCH_SIZE,
+    GITHUB_GRAPHQL_MAX_FILE_SIZE,
+    DECODED_BLOB_CACHE_MAX_BYTES,
+    GITHUB_RAW_CHUNK_SIZE,
+    GITHUB_TREE_INDEX_CACHE_SIZE,
+    SEARCH_INDEX_DIR,
+    SEARCH_INDEX_MAX_BYTES,
+    SEARCH_INDEX_MAX_REPOS,
+    SEARCH_MAX_FILE_SIZE,
+    VALIDATION_EXECUTOR,
+    VALIDATION_INLINE_MAX_CHARS,
+    VALIDATION_MAX_WORKERS,
+    VALIDATION_TIMEOUT,
+)
+from app.infrastructure.blob_store import BlobStore, git_blob_sha
+from app.infrastructure.cache import DecodedBlob, DecodedBlobCache
+from app.infrastructure.github_client import GitHubClient, qualified_repo
+from app.infrastructure.rate_limiter import Priority, request_priority
+from app.infrastructure.tracing import span
+from app.domain.models import (
+    BatchFileResult,
+    CommitFilesResponse,
+    CommitOperation,
+    FileContentResponse,
+    FileOperationResult,
+    RawFileStream,
+    RepoChangesResponse,
+    RepoStructureResponse,
+    SearchResponse,
+    TreeChange,
+    WebhookResult,
+)
+from app.domain.archive import TarFilter
+from app.domain.search_index import SearchIndex, SearchIndexStore, compile_query
+from app.domain.tree_index import TreeIndex, TreeIndexCache, TreeNode
+from app.domain.validation import ValidationExecutor, validators_for
+from app.domain.webhooks import PushEvent
+from app.core.exceptions import (
+    ResourceNotFoundError,
+    GitHubAPIError,
+    InvalidRepositoryError,
+    InvalidRequestError,
+    RangeNotSatisfiableError,
+)
+
+logger = logging.getLogger(__name__)
+
+# Полный SHA неизменяем, поэтому индекс по нему можно кэшировать под этим ключом
+_FULL_SHA = re.compile(r"[0-9a-f]{40}")
+# Блобы до этого размера декодируются в цикле событий: передача в поток дороже самого декодирования
+_DECODE_INLINE_MAX_BYTES = 64 * 1024
 
-from app.infrastructure.github_client import GitHubClient
-from app.domain.models import FileContentResponse, RepoStructureResponse
-from app.core.exceptions import ResourceNotFoundError, GitHubAPIError, InvalidRepositoryError
 
 class GitHubService:
     """
@@ -15,47 +78,426 @@ class GitHubService:
     Используется для получения структуры репозитория, содержимого файлов,
     создания, обновления и удаления файлов.
     """
-    def __init__(self, github_client: GitHubClient):
+    def __init__(
+        self,
+        github_client: GitHubClient,
+        tree_indexes: TreeIndexCache | None = None,
+        validator: ValidationExecutor | None = None,
+        search_indexes: SearchIndexStore | None = None,
+        decoded_blobs: DecodedBlobCache | None = None,
+        blob_store: BlobStore | None = None,
+    ):
         """
         Инициализация сервиса GitHub.
 
         Args:
             github_client (GitHubClient): Экземпляр клиента для работы с GitHub API.
+            tree_indexes (TreeIndexCache | None): Кэш индексов деревьев по SHA.
+            validator (ValidationExecutor | None): Пул для проверки содержимого файлов.
+            search_indexes (SearchIndexStore | None): Индексы поиска по коду.
+            decoded_blobs (DecodedBlobCache | None): Кэш декодированных блобов с индексом строк.
+            blob_store (BlobStore | None): Хранилище блобов на диске; по умолчанию
+                в BLOB_STORE_DIR, если она задана и принадлежит пользователю сервиса.
         """
         self.github_client = github_client
+        self.tree_indexes = tree_indexes or TreeIndexCache(GITHUB_TREE_INDEX_CACHE_SIZE)
+        self.validator = validator or ValidationExecutor(
+            kind=VALIDATION_EXECUTOR,
+            max_workers=VALIDATION_MAX_WORKERS,
+            timeout=VALIDATION_TIMEOUT,
+            inline_max_chars=VALIDATION_INLINE_MAX_CHARS,
+        )
+        self.search_indexes = search_indexes or SearchIndexStore(SEARCH_INDEX_DIR, SEARCH_INDEX_MAX_REPOS, SEARCH_INDEX_MAX_BYTES)
+        self.decoded_blobs = decoded_blobs or DecodedBlobCache(DECODED_BLOB_CACHE_MAX_BYTES)
+        if blob_store is None and BLOB_STORE_DIR:
+            try:
+                blob_store = BlobStore(BLOB_STORE_DIR, BLOB_STORE_MAX_BYTES)
+            except OSError as e:
+                logger.error("Хранилище блобов отключено: %s", e)
+        self.blob_store = blob_store
+
+    def close(self) -> None:
+        """
+        Освобождение ресурсов сервиса (пула проверок).
+        """
+        self.validator.shutdown()
 
-    async def get_repo_structure(self, repo: str) -> RepoStructureResponse:
+    async def get_repo_structure(
+        self,
+        repo: str,
+        ref: str | None = None,
+        prefix: str = "",
+        glob: str | None = None,
+        node_type: str | None = None,
+        max_depth: int | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+        fields: list[str] | None = None
+    ) -> RepoStructureResponse:
         """
         Получение структуры репозитория на GitHub.
 
+        Дерево загружается один раз на SHA и хранится в виде индекса путей,
+        поэтому фильтры и страницы обрабатываются без обхода всего дерева.
+        Ответ собирается без валидации: узлы индекса уже приведены к
+        компактному виду, а роутер сериализует его напрямую.
+
         Args:
             repo (str): Имя репозитория.
+            ref (str | None): Ветка, тег или SHA; по умолчанию — ветка по умолчанию.
+            prefix (str): Папка, в пределах которой выбираются узлы.
+            glob (str | None): Шаблон fnmatch по полному пути.
+            node_type (str | None): "blob" или "tree".
+            max_depth (int | None): Глубина относительно prefix.
+            cursor (str | None): Курсор следующей страницы.
+            limit (int | None): Размер страницы.
+            fields (list[str] | None): Поля узлов в ответе; по умолчанию path, type, sha, size.
 
         Returns:
             RepoStructureResponse: Модель с именем репозитория и его деревом.
         """
+        if fields:
+            unknown = sorted(set(fields) - set(TreeNode.FIELDS))
+            if unknown:
+                raise InvalidRequestError(f"Неизвестные поля: {', '.join(unknown)}")
+            selected = tuple(fields)
+        else:
+            selected = TreeNode.DEFAULT_FIELDS
+
+        index = await self._load_tree_index(repo, ref)
+        with span("query"):
+            try:
+                tree, next_cursor = index.query(
+                    prefix=prefix,
+                    glob=glob,
+                    node_type=node_type,
+                    max_depth=max_depth,
+                    cursor=cursor,
+                    limit=limit,
+                )
+            except ValueError as e:
+                raise InvalidRequestError(str(e))
+            nodes = [node.to_dict(selected) for node in tree]
+
+        return RepoStructureResponse.model_construct(
+            repo=repo,
+            tree=nodes,
+            sha=index.sha,
+            truncated=index.truncated,
+            next_cursor=next_cursor,
+        )
+
+    async def _load_tree_index(self, repo: str, ref: str | None) -> TreeIndex:
         try:
-            tree = await self.github_client.list_repo_tree(repo)
+            data = await self.github_client.get_tree(repo, ref=ref)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 raise InvalidRepositoryError(f"Репозиторий '{repo}' не найден")
             raise GitHubAPIError(f"GitHub API error: {e.response.text}", status_code=e.response.status_code)
+        with span("index"):
+            return self.tree_indexes.get_or_build(data)
 
-        return RepoStructureResponse(repo=repo, tree=tree)
+    async def get_structure_changes(
+        self,
+        repo: str,
+        since: str,
+        ref: str | None = None,
+        prefix: str = ""
+    ) -> RepoChangesResponse:
+        """
+        Изменения структуры репозитория с ревизии since.
+
+        Оба дерева берутся из кэша индексов (или загружаются один раз на SHA),
+        а сравнение обходит только поддеревья с различающимся SHA.
+
+        Args:
+            repo (str): Имя репозитория.
+            since (str): SHA коммита или дерева, с которого нужны изменения.
+            ref (str | None): Ветка, тег или SHA текущей ревизии; по умолчанию — ветка по умолчанию.
+            prefix (str): Папка, в пределах которой ищутся изменения.
 
-    async def get_file_content(self, repo: str, path: str) -> FileContentResponse:
+        Returns:
+            RepoChangesResponse: Добавленные, изменённые и удалённые узлы.
+        """
+        head = await self._load_tree_index(repo, ref)
+
+        base = self.tree_indexes.get(since)
+        if base is None:
+            try:
+                data = await self.github_client.get_tree(repo, ref=since)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code in (404, 422):
+                    raise ResourceNotFoundError(f"Ревизия '{since}' не найдена в репозитории '{repo}'")
+                raise GitHubAPIError(f"GitHub API error: {e.response.text}", status_code=e.response.status_code)
+            base = self.tree_indexes.get_or_build(data)
+            if _FULL_SHA.fullmatch(since) and since != base.sha:
+                self.tree_indexes.alias(since, base)
+
+        changes = [] if base.sha is not None and base.sha == head.sha else head.diff(base, prefix)
+        return RepoChangesResponse(
+            repo=repo,
+            base_sha=base.sha,
+            sha=head.sha,
+            changes=[TreeChange(**change) for change in changes],
+            truncated=base.truncated or head.truncated,
+        )
+
+    async def search_code(
+        self,
+        repo: str,
+        query: str,
+        regex: bool = False,
+        ignore_case: bool = False,
+        prefix: str = "",
+        limit: int = 100,
+    ) -> SearchResponse:
+        """
+        Поиск по содержимому текстовых файлов ветки по умолчанию.
+
+        Запрос выполняется по локальному триграммному индексу; перед поиском
+        индекс доводится до текущего дерева (загружаются только новые блобы).
+
+        Args:
+            repo (str): Имя репозитория.
+            query (str): Строка или регулярное выражение.
+            regex (bool): Интерпретировать query как регулярное выражение.
+            ignore_case (bool): Поиск без учёта регистра.
+            prefix (str): Папка, в пределах которой ищутся файлы.
+            limit (int): Максимальное число совпадений.
+
+        Returns:
+            SearchResponse: Совпадения (путь, номер строки, строка).
+        """
+        try:
+            pattern, required = compile_query(query, regex, ignore_case)
+        except ValueError as e:
+            raise InvalidRequestError(str(e))
+
+        async with self.search_indexes.lock(repo):
+            index = await self._sync_search_index(repo)
+            with span("search"):
+                matches, truncated = await asyncio.to_thread(
+                    index.search, pattern, required, prefix=prefix, limit=limit
+                )
+        return SearchResponse.model_construct(
+            repo=repo,
+            sha=index.tree_sha,
+            query=query,
+            matches=matches,
+            truncated=truncated or index.truncated,
+        )
+
+    async def _sync_search_index(self, repo: str) -> SearchIndex:
+        """
+        Приведение индекса поиска к текущему дереву ветки по умолчанию
+        (вызывается под замком индекса репозитория).
+
+        Блобы, SHA которых уже есть в индексе, не загружаются; новые
+        загружаются с фоновым приоритетом. Триграммы, запись текстов на диск
+        и сохранение описания индекса выполняются вне цикла событий.
+        """
+        index = await self.search_indexes.get(repo)
+        tree = await self._load_tree_index(repo, None)
+        if tree.sha is not None and tree.sha == index.tree_sha:
+            return index
+
+        blobs, _ = tree.query(node_type="blob")
+        paths = {
+            node.path: node.sha for node in blobs
+            if node.sha and (node.size or 0) <= SEARCH_MAX_FILE_SIZE
+        }
+        texts = await self._fetch_texts(repo, index.missing(paths.values()))
+        with span("index"):
+            await asyncio.to_thread(index.update, tree.sha, paths, texts, tree.truncated)
+        await self.search_indexes.save(repo, index)
+        return index
+
+    async def _fetch_texts(self, repo: str, shas: set[str]) -> dict[str, str | None]:
+        """
+        Загрузка блобов для индекса поиска: SHA → текст (None — двоичный или не UTF-8).
+        """
+        semaphore = asyncio.Semaphore(GITHUB_BATCH_READ_CONCURRENCY)
+
+        async def fetch(sha: str) -> tuple[str, str | None]:
+            async with semaphore:
+                try:
+                    data = await self._read_blob(repo, sha)
+                except httpx.HTTPStatusError as e:
+                    raise GitHubAPIError(f"GitHub API error: {e.response.text}", status_code=e.response.status_code)
+            if data.find(b"\0") != -1:
+                return sha, None
+            try:
+                return sha, data[:].decode("utf-8")
+            except UnicodeDecodeError:
+                return sha, None
+
+        with request_priority(Priority.BULK):
+            return dict(await asyncio.gather(*(fetch(sha) for sha in shas)))
+
+    async def get_file_content(
+        self,
+        repo: str,
+        path: str,
+        start_line: int | None = None,
+        end_line: int | None = None,
+        byte_range: tuple[int | None, int | None] | None = None,
+    ) -> FileContentResponse:
         """
         Получение и декодирование содержимого файла из репозитория.
 
+        Декодированный блоб хранится в кэше по SHA вместе с индексом начал
+        строк, поэтому диапазоны строк и байтов выдаются без повторного
+        декодирования всего файла.
+
         Args:
             repo (str): Имя репозитория.
             path (str): Путь к файлу.
+            start_line (int | None): Первая строка диапазона (с 1).
+            end_line (int | None): Последняя строка диапазона включительно.
+            byte_range (tuple[int | None, int | None] | None): Диапазон байтов из
+                заголовка Range: (первый, последний); (None, n) — последние n байтов.
+
+        Returns:
+            FileContentResponse: Содержимое файла или диапазона, SHA и число строк.
+        """
+        if byte_range is not None and (start_line is not None or end_line is not None):
+            raise InvalidRequestError("Диапазон строк и заголовок Range нельзя использовать вместе")
+        if start_line is not None and end_line is not None and end_line < start_line:
+            raise InvalidRequestError("end_line не может быть меньше start_line")
+
+        blob, text = await self._load_decoded_blob(repo, path)
+        content_range = None
+        with span("decode"):
+            if byte_range is not None:
+                try:
+                    first, last, content = blob.byte_range(*byte_range)
+                except ValueError as e:
+                    raise RangeNotSatisfiableError(str(e))
+                content_range = f"bytes {first}-{last}/{blob.size}"
+            elif start_line is not None or end_line is not None:
+                start = start_line or 1
+                if start > max(blob.total_lines, 1):
+                    raise RangeNotSatisfiableError(
+                        f"Строка {start} за пределами файла из {blob.total_lines} строк"
+                    )
+                end = min(end_line or blob.total_lines, blob.total_lines)
+                content = blob.lines(start, end)
+                content_range = f"lines {start}-{end}/{blob.total_lines}"
+            elif text is not None:
+                content = text
+            elif blob.size <= _DECODE_INLINE_MAX_BYTES:
+                content = blob.text()
+            else:
+                content = await asyncio.to_thread(blob.text)
+        return FileContentResponse(
+            path=path,
+            content=content,
+            encoding="utf-8",
+            sha=blob.sha or None,
+            total_lines=blob.total_lines,
+            size=blob.size,
+            content_range=content_range,
+        )
+
+    async def _read_blob(self, repo: str, sha: str):
+        """
+        Содержимое блоба: из хранилища на диске или из GitHub с сохранением на диск.
+
+        Returns:
+            bytes | mmap.mmap: Содержимое блоба.
+
+        Raises:
+            httpx.HTTPStatusError: Если GitHub вернул ошибку.
+        """
+        if self.blob_store is not None:
+            # Первое чтение блоба в процессе сверяет SHA всего содержимого
+            data = await asyncio.to_thread(self.blob_store.get, sha)
+            if data is not None:
+                return data
+        data = await self.github_client.get_blob(repo, sha)
+        await self._store_blob(sha, data)
+        return data
+
+    async def _store_blob(self, sha: str, data: bytes) -> None:
+        """
+        Сохранение блоба на диск вне цикла событий; сбой записи не прерывает запрос.
+        """
+        if self.blob_store is None:
+            return
+        try:
+            await asyncio.to_thread(self.blob_store.put, sha, data)
+        except (OSError, ValueError) as e:
+            logger.warning("Блоб %s не сохранён в хранилище: %s", sha, e)
+
+    async def _decode_blob(self, sha: str, data) -> tuple[DecodedBlob, str]:
+        """
+        Проверка UTF-8 и построение индекса строк; крупные блобы — вне цикла событий.
+
+        Raises:
+            UnicodeDecodeError: Содержимое не является текстом в UTF-8.
+        """
+        with span("decode"):
+            if len(data) <= _DECODE_INLINE_MAX_BYTES:
+                return DecodedBlob.decode(sha, data)
+            return await asyncio.to_thread(DecodedBlob.decode, sha, data)
+
+    async def _stored_blob(self, sha: str) -> tuple[DecodedBlob, str | None] | None:
+        """
+        Декодированный блоб из памяти или с диска (без обращения к GitHub).
+
+        Returns:
+            tuple[DecodedBlob, str | None] | None: Блоб и текст, если он был декодирован
+                сейчас (из памяти блоб берётся без текста); None — блоба нет.
+        """
+        blob = self.decoded_blobs.get(sha)
+        if blob is not None:
+            return blob, None
+        if self.blob_store is None:
+            return None
+        data = await asyncio.to_thread(self.blob_store.get, sha)
+        if data is None:
+            return None
+        blob, text = await self._decode_blob(sha, data)
+        return self.decoded_blobs.put(blob), text
+
+    async def _load_decoded_blob(self, repo: str, path: str) -> tuple[DecodedBlob, str | None]:
+        """
+        Содержимое файла ветки по умолчанию как DecodedBlob.
+
+        Если SHA файла известен по индексу, который поддерживают вебхуки,
+        блоб берётся из памяти или с диска без запросов к GitHub. Иначе
+        метаданные берутся из contents API (условный запрос или кэш), а
+        содержимое декодируется только при первом обращении к SHA и
+        сохраняется на диск. Файлы больше 1 МБ contents API отдаёт без
+        содержимого — они загружаются через git blobs API.
 
         Returns:
-            FileContentResponse: Содержимое файла и кодировка.
+            tuple[DecodedBlob, str | None]: Блоб и его текст целиком, если
+                содержимое декодировалось при этом вызове (иначе None).
+
+        Raises:
+            UnicodeDecodeError: Содержимое не является текстом в UTF-8.
         """
+        known_sha = self.github_client.fresh_blob_sha(repo, path)
+        stored = await self._stored_blob(known_sha) if known_sha else None
+        if stored is not None:
+            return stored
+
         try:
             api_data = await self.github_client.get_file_content(repo, path)
+            if not isinstance(api_data, dict):
+                raise InvalidRequestError(f"'{path}' — папка, а не файл")
+            sha = api_data.get("sha")
+            stored = await self._stored_blob(sha) if sha else None
+            if stored is not None:
+                return stored
+            if api_data.get("encoding") == "none" and sha:
+                data = await self._read_blob(repo, sha)
+            else:
+                with span("decode"):
+                    data = base64.b64decode(api_data.get("content", ""))
+                if sha:
+                    await self._store_blob(sha, data)
         except httpx.HTTPStatusError as e:
             # 404: репозиторий или файл не найден
             if e.response.status_code == 404:
@@ -66,13 +508,316 @@ class GitHubService:
                 status_code=e.response.status_code
             )
 
-        raw_b64 = api_data.get("content", "")
-        decoded = base64.b64decode(raw_b64).decode("utf-8")
-        return FileContentResponse(
+        blob, text = await self._decode_blob(sha or "", data)
+        return (self.decoded_blobs.put(blob) if sha else blob), text
+
+    async def open_raw_file(
+        self,
+        repo: str,
+        path: str,
+        ref: str | None = None,
+        if_none_match: str | None = None
+    ) -> RawFileStream:
+        """
+        Открытие потока с содержимым файла любого типа и размера.
+
+        Содержимое не декодируется и не держится в памяти целиком: оно
+        отдаётся порциями по GITHUB_RAW_CHUNK_SIZE байт. Content-Length,
+        ETag и Content-Encoding пробрасываются из ответа GitHub.
+
+        Args:
+            repo (str): Имя репозитория.
+            path (str): Путь к файлу.
+            ref (str | None): Ветка, тег или SHA.
+            if_none_match (str | None): ETag клиента для условного запроса.
+
+        Returns:
+            RawFileStream: Статус, заголовки и поток содержимого.
+        """
+        try:
+            upstream = await self.github_client.open_raw_stream(repo, path, ref=ref, if_none_match=if_none_match)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                raise ResourceNotFoundError(f"Репозиторий '{repo}' или файл '{path}' не найден")
+            raise GitHubAPIError(f"GitHub API error: {e.response.text}", status_code=e.response.status_code)
+
+        headers = {
+            name: upstream.headers[name]
+            for name in ("Content-Length", "ETag", "Last-Modified", "Content-Encoding")
+            if name in upstream.headers
+        }
+        media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+        async def chunks() -> AsyncIterator[bytes]:
+            try:
+                # Сырые байты (без распаковки), чтобы Content-Length и Content-Encoding совпадали
+                async for chunk in upstream.aiter_raw(GITHUB_RAW_CHUNK_SIZE):
+                    yield chunk
+            finally:
+                await upstream.aclose()
+
+        return RawFileStream(
+            status_code=upstream.status_code,
+            headers=headers,
+            media_type=media_type,
+            chunks=chunks(),
+            close=upstream.aclose,
+        )
+
+    async def open_archive(self, repo: str, ref: str | None = None, prefix: str | None = None) -> RawFileStream:
+        """
+        Открытие потока с архивом репозитория (tar.gz).
+
+        Без prefix архив GitHub отдаётся как есть, байт в байт. С prefix
+        архив распаковывается и разбирается по мере поступления, и клиенту
+        уходит новый tar.gz только с записями этой папки (или файла) —
+        без буферизации архива целиком. Попутно небольшие файлы
+        сохраняются в хранилище блобов, чтобы последующие чтения не
+        обращались к GitHub.
+
+        Args:
+            repo (str): Имя репозитория.
+            ref (str | None): Ветка, тег или SHA.
+            prefix (str | None): Путь папки или файла относительно корня репозитория.
+
+        Returns:
+            RawFileStream: Заголовки и поток архива.
+        """
+        prefix = prefix.strip("/") if prefix else None
+        try:
+            upstream = await self.github_client.open_archive_stream(repo, ref)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                raise ResourceNotFoundError(f"Репозиторий '{repo}' или ревизия '{ref}' не найдены")
+            raise GitHubAPIError(f"GitHub API error: {e.response.text}", status_code=e.response.status_code)
+
+        name = re.sub(r"[^A-Za-z0-9._-]+", "-", "-".join(filter(None, (repo, ref, prefix))))
+        headers = {"Content-Disposition": f'attachment; filename="{name}.tar.gz"'}
+        if prefix is None and "Content-Length" in upstream.headers:
+            headers["Content-Length"] = upstream.headers["Content-Length"]
+
+        warm_size = ARCHIVE_WARM_MAX_FILE_SIZE if self.blob_store is not None else 0
+        parser = TarFilter(prefix, warm_size) if prefix or warm_size else None
+
+        async def chunks() -> AsyncIterator[bytes]:
+            nonlocal parser
+            inflate = zlib.decompressobj(wbits=47)
+            deflate = zlib.compressobj(wbits=31) if prefix else None
+            try:
+                async for chunk in upstream.aiter_raw(GITHUB_RAW_CHUNK_SIZE):
+                    tar = bytearray()
+                    if parser is not None and not parser.ended:
+                        try:
+                            # Ограничение выхода: высокая степень сжатия не раздувает порцию в памяти
+                            data = inflate.decompress(chunk, GITHUB_RAW_CHUNK_SIZE)
+                            while True:
+                                tar += parser.feed(data)
+                                if not inflate.unconsumed_tail or parser.ended:
+                                    break
+                                data = inflate.decompress(inflate.unconsumed_tail, GITHUB_RAW_CHUNK_SIZE)
+                        except (zlib.error, ValueError) as e:
+                            if deflate is not None:
+                                raise
+                            # Прогрев необязателен: архив без фильтра отдаётся дальше как есть
+                            logger.warning("Архив %s не разобран для прогрева кэша: %s", repo, e)
+                            parser = None
+                        if parser is not None and sum(map(len, parser.blobs)) >= ARCHIVE_WARM_BATCH_BYTES:
+                            await self._store_blobs(parser.blobs)
+                            parser.blobs = []
+                    if deflate is None:
+                        yield chunk
+                    elif tar:
+                        compressed = deflate.compress(tar)
+                        if compressed:
+                            yield compressed
+                if deflate is not None:
+                    yield deflate.compress(parser.finish()) + deflate.flush()
+                if parser is not None and parser.blobs:
+                    await self._store_blobs(parser.blobs)
+            finally:
+                await upstream.aclose()
+
+        return RawFileStream(
+            status_code=200,
+            headers=headers,
+            media_type="application/gzip",
+            chunks=chunks(),
+            close=upstream.aclose,
+        )
+
+    async def _store_blobs(self, blobs: list[bytes]) -> None:
+        """
+        Сохранение пачки блобов на диск одним переходом в поток; сбой записи не прерывает запрос.
+        """
+        def put_all() -> None:
+            for data in blobs:
+                self.blob_store.put(git_blob_sha(data), data)
+
+        try:
+            await asyncio.to_thread(put_all)
+        except (OSError, ValueError) as e:
+            logger.warning("Блобы из архива не сохранены в хранилище: %s", e)
+
+    async def iter_file_contents(self, repo: str, paths: list[str]) -> AsyncIterator[BatchFileResult]:
+        """
+        Параллельное чтение нескольких файлов с выдачей результатов по мере готовности.
+
+        Размеры файлов берутся из дерева ветки по умолчанию: уже сохранённые
+        блобы отдаются без запросов, небольшие файлы читаются пакетами через
+        GraphQL (один запрос на GITHUB_GRAPHQL_BATCH_SIZE файлов), остальные —
+        по одному через contents API. Число одновременных запросов к GitHub
+        ограничено семафором (GITHUB_BATCH_READ_CONCURRENCY), чтобы не
+        упереться во вторичные лимиты, а сами запросы идут с фоновым
+        приоритетом и уступают интерактивным. Ошибка чтения одного файла не
+        прерывает остальные.
+
+        Args:
+            repo (str): Имя репозитория.
+            paths (list[str]): Пути к файлам (повторы игнорируются).
+
+        Yields:
+            BatchFileResult: Результат по очередному завершившемуся файлу.
+        """
+        semaphore = asyncio.Semaphore(GITHUB_BATCH_READ_CONCURRENCY)
+
+        async def fetch(path: str) -> list[BatchFileResult]:
+            async with semaphore:
+                try:
+                    file = await self.get_file_content(repo, path)
+                except GitHubAPIError as e:
+                    return [BatchFileResult(path=path, status=e.status_code, error=str(e))]
+                except UnicodeDecodeError:
+                    return [BatchFileResult(path=path, status=415, error=f"Файл '{path}' не является текстом в UTF-8")]
+            return [BatchFileResult(path=path, status=200, file=file)]
+
+        async def fetch_chunk(branch: str, chunk: list[str]) -> list[BatchFileResult]:
+            async with semaphore:
+                try:
+                    results, fallback = await self._read_small_files(repo, branch, chunk)
+                except GitHubAPIError as e:
+                    logger.warning("Пакетное чтение через GraphQL не удалось, чтение по одному файлу: %s", e)
+                    results, fallback = [], chunk
+            for more in await asyncio.gather(*(fetch(path) for path in fallback)):
+                results.extend(more)
+            return results
+
+        # Задачи наследуют контекст, а с ним и фоновый приоритет запросов
+        with request_priority(Priority.BULK):
+            ready, branch, chunks, single = await self._plan_batch_read(repo, list(dict.fromkeys(paths)))
+            tasks = [asyncio.create_task(fetch(path)) for path in single]
+            tasks += [asyncio.create_task(fetch_chunk(branch, chunk)) for chunk in chunks]
+        try:
+            for result in ready:
+                yield result
+            for next_done in asyncio.as_completed(tasks):
+                for result in await next_done:
+                    yield result
+        finally:
+            # Клиент отключился или генератор закрыт — незавершённые запросы не нужны
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    def _file_result(path: str, blob: DecodedBlob, text: str | None = None) -> BatchFileResult:
+        file = FileContentResponse(
             path=path,
-            content=decoded,
-            encoding="utf-8"
+            content=blob.text() if text is None else text,
+            encoding="utf-8",
+            sha=blob.sha or None,
+            total_lines=blob.total_lines,
+            size=blob.size,
         )
+        return BatchFileResult(path=path, status=200, file=file)
+
+    async def _plan_batch_read(
+        self, repo: str, paths: list[str]
+    ) -> tuple[list[BatchFileResult], str | None, list[list[str]], list[str]]:
+        """
+        Разбиение пакетного чтения: готовые результаты, пакеты для GraphQL и файлы для contents API.
+
+        Returns:
+            tuple: (результаты из памяти или с диска, ветка для выражений GraphQL,
+                пакеты путей небольших файлов, пути для чтения по одному).
+        """
+        if GITHUB_GRAPHQL_BATCH_SIZE < 2 or len(paths) < 2:
+            return [], None, [], paths
+        try:
+            index = await self._load_tree_index(repo, None)
+        except GitHubAPIError:
+            # Ошибку (например, 404) сообщат чтения по одному — для каждого файла
+            return [], None, [], paths
+
+        ready: list[BatchFileResult] = []
+        small: list[tuple[str, int]] = []
+        single: list[str] = []
+        for path in paths:
+            node = index.get(path)
+            if node is None or node.type != "blob" or node.size is None or node.size > GITHUB_GRAPHQL_MAX_FILE_SIZE:
+                single.append(path)
+                continue
+            try:
+                stored = await self._stored_blob(node.sha)
+            except UnicodeDecodeError:
+                ready.append(BatchFileResult(path=path, status=415, error=f"Файл '{path}' не является текстом в UTF-8"))
+                continue
+            if stored is not None:
+                ready.append(self._file_result(path, *stored))
+            else:
+                small.append((path, node.size))
+        # Один файл — тот же один запрос, а contents API к тому же ревалидируется по ETag
+        if len(small) < 2:
+            return ready, None, [], single + [path for path, _ in small]
+
+        try:
+            branch = await self.github_client.get_default_branch(repo)
+        except httpx.HTTPStatusError:
+            return ready, None, [], single + [path for path, _ in small]
+        chunks: list[list[str]] = [[]]
+        chunk_bytes = 0
+        for path, size in small:
+            if chunks[-1] and (len(chunks[-1]) >= GITHUB_GRAPHQL_BATCH_SIZE or chunk_bytes + size > GITHUB_GRAPHQL_BATCH_MAX_BYTES):
+                chunks.append([])
+                chunk_bytes = 0
+            chunks[-1].append(path)
+            chunk_bytes += size
+        return ready, branch, chunks, single
+
+    async def _read_small_files(
+        self, repo: str, branch: str, paths: list[str]
+    ) -> tuple[list[BatchFileResult], list[str]]:
+        """
+        Чтение пакета небольших файлов одним запросом к GraphQL API.
+
+        Содержимое принимается, только если его SHA совпадает с oid блоба
+        (текст передан без потерь); такие блобы сохраняются в кэш и на диск.
+
+        Returns:
+            tuple: (результаты, пути, которые нужно прочитать через contents API).
+
+        Raises:
+            GitHubAPIError: Запрос к GraphQL не удался.
+        """
+        try:
+            blobs = await self.github_client.get_blobs_graphql(repo, [f"{branch}:{path}" for path in paths])
+        except httpx.HTTPStatusError as e:
+            raise GitHubAPIError(f"GitHub API error: {e.response.text}", status_code=e.response.status_code)
+
+        results: list[BatchFileResult] = []
+        fallback: list[str] = []
+        for path, blob in zip(paths, blobs):
+            if blob is None or blob.get("isTruncated") or blob.get("isBinary") or blob.get("text") is None:
+                # Файл удалён или перемещён после чтения дерева, слишком велик или
+                # двоичный по мнению GitHub: статус и текст определит contents API
+                fallback.append(path)
+                continue
+            data = blob["text"].encode("utf-8")
+            sha = blob.get("oid")
+            if git_blob_sha(data) != sha:
+                fallback.append(path)
+                continue
+            await self._store_blob(sha, data)
+            results.append(self._file_result(path, self.decoded_blobs.put(DecodedBlob(sha, data)), blob["text"]))
+        return results, fallback
 
     async def create_file(
         self,
@@ -131,23 +876,14 @@ class GitHubService:
         Returns:
             FileContentResponse: Информация об обновлённом файле.
         """
-        if not content.strip():
+        if not content or content.isspace():
             raise ValueError("Передано пустое содержимое файла.")
 
-        if content_sha256:
-            actual_hash = hashlib.sha256(content.encode()).hexdigest()
-            if actual_hash != content_sha256:
-                raise ValueError("Контрольная сумма содержимого не совпадает. Возможна ошибка передачи.")
-
-        if content_lines is not None:
-            actual_lines = len(content.splitlines())
-            if actual_lines < int(0.8 * content_lines):
-                raise ValueError(f"Содержимое файла короче ожидаемого ({actual_lines} < {content_lines})")
-
-        try:
-            compile(content, filename, "exec")
-        except SyntaxError as e:
-            raise ValueError(f"Синтаксическая ошибка в файле: {e}")
+        # Хэш, подсчёт строк и синтаксис (по типу файла) проверяются параллельно вне цикла событий
+        with span("validate"):
+            errors = await self.validator.run(content, validators_for(filename, content_sha256, content_lines))
+        if errors:
+            raise ValueError(errors[0])
 
         try:
             result = await self.github_client.update_file(repo, path, filename, content, message)
@@ -188,3 +924,144 @@ class GitHubService:
             raise GitHubAPIError(f"GitHub API error: {e.response.text}", status_code=e.response.status_code)
 
         return FileContentResponse(path=url_path, content="", encoding="utf-8")
+
+    async def commit_files(
+        self,
+        repo: str,
+        operations: list[CommitOperation],
+        message: str,
+        branch: str | None = None
+    ) -> CommitFilesResponse:
+        """
+        Атомарный коммит нескольких файловых операций через Git Data API.
+
+        Блобы создаются параллельно, затем строится одно дерево поверх
+        текущего, создаётся один коммит и ветка перематывается на него.
+        Если ветка ушла вперёд, дерево пересобирается на новой голове
+        (блобы переиспользуются).
+
+        Args:
+            repo (str): Имя репозитория.
+            operations (list[CommitOperation]): Операции create/update/delete.
+            message (str): Сообщение коммита.
+            branch (str | None): Ветка; по умолчанию — ветка по умолчанию.
+
+        Returns:
+            CommitFilesResponse: SHA коммита и результаты по каждому файлу.
+
+        Raises:
+            InvalidRequestError: Нет операций, файл повторяется или не передано содержимое.
+        """
+        if not operations:
+            raise InvalidRequestError("Не передано ни одной файловой операции.")
+
+        paths = [f"{op.path.rstrip('/')}/{op.filename}" if op.path else op.filename for op in operations]
+        if len(set(paths)) != len(paths):
+            raise InvalidRequestError("Один и тот же файл указан в нескольких операциях.")
+        for op, full_path in zip(operations, paths):
+            if op.action != "delete" and op.content is None:
+                raise InvalidRequestError(f"Не передано содержимое файла '{full_path}' для операции {op.action}.")
+
+        try:
+            target_branch = branch or await self.github_client.get_default_branch(repo)
+
+            semaphore = asyncio.Semaphore(GITHUB_BLOB_UPLOAD_CONCURRENCY)
+
+            async def upload(op: CommitOperation) -> str | None:
+                if op.action == "delete":
+                    return None
+                async with semaphore:
+                    return await self.github_client.create_blob(repo, op.content)
+
+            blob_shas = await asyncio.gather(*(upload(op) for op in operations))
+
+            for attempt in range(1, GITHUB_COMMIT_MAX_ATTEMPTS + 1):
+                head_sha = await self.github_client.get_ref_sha(repo, target_branch)
+                base_tree = await self.github_client.get_commit_tree_sha(repo, head_sha)
+                modes = await self._file_modes(repo, base_tree, operations, paths)
+                entries = [
+                    {"path": full_path, "mode": modes.get(full_path, "100644"), "type": "blob", "sha": sha}
+                    for full_path, sha in zip(paths, blob_shas)
+                ]
+                tree_sha = await self.github_client.create_tree(repo, base_tree, entries)
+                commit_sha = await self.github_client.create_commit(repo, message, tree_sha, [head_sha])
+                try:
+                    await self.github_client.update_ref(repo, target_branch, commit_sha)
+                    break
+                except httpx.HTTPStatusError as e:
+                    # 422 — ветку успели сдвинуть, пересобираем коммит на новой голове
+                    if e.response.status_code != 422 or attempt == GITHUB_COMMIT_MAX_ATTEMPTS:
+                        raise
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                raise InvalidRepositoryError(f"Репозиторий '{repo}' или ветка '{branch}' не найдены")
+            raise GitHubAPIError(f"GitHub API error: {e.response.text}", status_code=e.response.status_code)
+
+        # Коммит уже в ветке: обновление кэшей не обращается к GitHub и не может его «провалить»
+        self.github_client.record_blob_shas(
+            repo, target_branch, dict(zip(paths, blob_shas)), default_branch=None if branch else target_branch
+        )
+        return CommitFilesResponse(
+            commit_sha=commit_sha,
+            branch=target_branch,
+            files=[
+                FileOperationResult(path=full_path, action=op.action, sha=sha)
+                for op, full_path, sha in zip(operations, paths, blob_shas)
+            ],
+        )
+
+    async def _file_modes(
+        self,
+        repo: str,
+        base_tree: str,
+        operations: list[CommitOperation],
+        paths: list[str],
+    ) -> dict[str, str]:
+        """
+        Режимы (100755, 120000 и т. п.) обновляемых файлов в базовом дереве,
+        чтобы коммит не менял их; новые файлы получают 100644.
+
+        Args:
+            repo (str): Имя репозитория.
+            base_tree (str): SHA дерева, поверх которого строится коммит.
+            operations (list[CommitOperation]): Операции коммита.
+            paths (list[str]): Полные пути файлов операций.
+
+        Returns:
+            dict[str, str]: Путь → режим для найденных в дереве файлов.
+        """
+        updated = [path for op, path in zip(operations, paths) if op.action == "update"]
+        if not updated:
+            return {}
+        tree = self.tree_indexes.get(base_tree) or await self._load_tree_index(repo, base_tree)
+        modes = {}
+        for path in updated:
+            node = tree.get(path)
+            if node is not None and node.type == "blob" and node.mode:
+                modes[path] = node.mode
+        return modes
+
+    def apply_push_event(self, event: PushEvent) -> WebhookResult:
+        """
+        Инвалидация кэшей по push-событию из вебхука.
+
+        Репозитории других владельцев адресуются как "owner/repo" — так же,
+        как при запросах с параметром owner.
+
+        Args:
+            event (PushEvent): Разобранное push-событие.
+
+        Returns:
+            WebhookResult: Что было сброшено.
+        """
+        self.github_client.apply_push(
+            qualified_repo(event.owner, event.repo), event.branch, event.head_sha, event.paths,
+            default_branch=event.default_branch,
+        )
+        return WebhookResult(
+            event="push",
+            applied=True,
+            repo=event.repo,
+            branch=event.branch,
+            paths=len(event.paths) if event.paths is not None else None,
+        )
@@ -0,0 +1,325 @@
+# app/domain/tree_index.py
+
+import base64
+import binascii
+import sys
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+
+
+class TreeNode:
+    """
+    Компактная запись дерева: только используемые поля узла GitHub
+    (без url и прочих полей, которые API возвращает на каждый узел).
+    """
+    __slots__ = ("path", "type", "sha", "size", "mode")
+
+    FIELDS = ("path", "type", "sha", "size", "mode")
+    DEFAULT_FIELDS = ("path", "type", "sha", "size")
+
+    def __init__(self, path: str, type: str | None, sha: str | None, size: int | None = None, mode: str | None = None):
+        self.path = path
+        self.type = type
+        self.sha = sha
+        self.size = size
+        self.mode = mode
+
+    @classmethod
+    def from_github(cls, entry: dict) -> "TreeNode":
+        """
+        Узел из записи trees API; повторяющиеся короткие строки интернируются.
+        """
+        node_type = entry.get("type")
+        mode = entry.get("mode")
+        return cls(
+            entry["path"],
+            sys.intern(node_type) if node_type else None,
+            entry.get("sha"),
+            entry.get("size"),
+            sys.intern(mode) if mode else None,
+        )
+
+    def to_dict(self, fields: tuple[str, ...] = DEFAULT_FIELDS) -> dict:
+        """
+        Выбранные поля узла для ответа.
+        """
+        return {field: getattr(self, field) for field in fields}
+
+
+class _TrieNode:
+    """
+    Узел префиксного дерева путей: запись дерева и дочерние сегменты.
+    """
+    __slots__ = ("entry", "children")
+
+    def __init__(self):
+        self.entry: TreeNode | None = None
+        self.children: dict[str, "_TrieNode"] = {}
+
+
+def encode_cursor(path: str) -> str:
+    """
+    Кодирование курсора пагинации (последнего выданного пути).
+    """
+    return base64.urlsafe_b64encode(path.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> str:
+    """
+    Декодирование курсора пагинации.
+
+    Raises:
+        ValueError: Если курсор повреждён.
+    """
+    try:
+        return base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+    except (binascii.Error, UnicodeError) as e:
+        raise ValueError(f"Некорректный курсор пагинации: {cursor}") from e
+
+
+class TreeIndex:
+    """
+    Индекс дерева репозитория в виде trie по сегментам пути.
+
+    Позволяет отвечать на запросы по префиксу, glob-шаблону, типу узла и
+    глубине, а также постранично, не обходя всё дерево: стоимость запроса
+    определяется размером поддерева под префиксом и размером страницы.
+    """
+    def __init__(self, sha: str | None, tree: list[dict], truncated: bool = False):
+        """
+        Args:
+            sha (str | None): SHA дерева.
+            tree (list[dict]): Узлы рекурсивного дерева GitHub.
+            truncated (bool): Признак усечённого ответа GitHub.
+        """
+        self.sha = sha
+        self.truncated = truncated
+        self.size = len(tree)
+        self._root = _TrieNode()
+        for entry in tree:
+            node = self._root
+            for segment in entry["path"].split("/"):
+                node = node.children.setdefault(segment, _TrieNode())
+            node.entry = TreeNode.from_github(entry)
+        self._sort(self._root)
+
+    @staticmethod
+    def _sort(root: _TrieNode) -> None:
+        # Сортируем сегменты один раз при построении: обход идёт в порядке путей,
+        # на котором основана пагинация
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node.children:
+                node.children = dict(sorted(node.children.items()))
+                stack.extend(node.children.values())
+
+    def _find(self, path: str) -> _TrieNode | None:
+        node = self._root
+        for segment in filter(None, path.split("/")):
+            node = node.children.get(segment)
+            if node is None:
+                return None
+        return node
+
+    def get(self, path: str) -> TreeNode | None:
+        """
+        Узел по полному пути или None, если его нет.
+        """
+        node = self._find(path)
+        return node.entry if node is not None else None
+
+    def query(
+        self,
+        prefix: str = "",
+        glob: str | None = None,
+        node_type: str | None = None,
+        max_depth: int | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> tuple[list[TreeNode], str | None]:
+        """
+        Выборка узлов дерева.
+
+        Args:
+            prefix (str): Папка (или файл), в пределах которой ищутся узлы.
+            glob (str | None): Шаблон fnmatch по полному пути ("*" совпадает и с "/").
+            node_type (str | None): "blob" или "tree".
+            max_depth (int | None): Максимальная глубина относительно prefix (1 — только прямые потомки).
+            cursor (str | None): Курсор со страницы, выданной ранее.
+            limit (int | None): Размер страницы; None — без ограничения.
+
+        Returns:
+            tuple[list[TreeNode], str | None]: Узлы страницы и курсор следующей страницы.
+        """
+        prefix = prefix.strip("/")
+        start = self._find(prefix)
+        if start is None:
+            return [], None
+
+        after = decode_cursor(cursor).split("/") if cursor else None
+        if after is not None and prefix:
+            prefix_segments = prefix.split("/")
+            if after[:len(prefix_segments)] != prefix_segments:
+                raise ValueError("Курсор не относится к запрошенному префиксу")
+            after = after[len(prefix_segments):]
+
+        results: list[TreeNode] = []
+
+        def matches(entry: TreeNode) -> bool:
+            if node_type is not None and entry.type != node_type:
+                return False
+            return glob is None or fnmatchcase(entry.path, glob)
+
+        def walk(node: _TrieNode, depth: int, after: list[str] | None) -> bool:
+            # Возвращает False, когда страница заполнена
+            if max_depth is not None and depth >= max_depth:
+                return True
+            for name, child in node.children.items():
+                child_after = None
+                if after:
+                    if name < after[0]:
+                        continue
+                    if name == after[0]:
+                        child_after = after[1:]
+                # Сам узел курсора уже выдан — его пропускаем, но потомков обходим
+                if child.entry is not None and child_after is None and matches(child.entry):
+                    if limit is not None and len(results) >= limit:
+                        return False
+                    results.append(child.entry)
+                if child.children and not walk(child, depth + 1, child_after or None):
+                    return False
+            return True
+
+        if start.entry is not None and not start.children:
+            # prefix указывает на файл
+            return ([start.entry] if after is None and matches(start.entry) else []), None
+
+        complete = walk(start, 0, after)
+        next_cursor = encode_cursor(results[-1].path) if not complete and results else None
+        return results, next_cursor
+
+    def _scope(self, prefix: str) -> _TrieNode:
+        # Узел-обёртка, единственный потомок которого — узел prefix: так в сравнение
+        # попадает и сама запись prefix (папка или файл)
+        if not prefix:
+            return self._root
+        scope = _TrieNode()
+        node = self._find(prefix)
+        if node is not None:
+            scope.children[prefix.rsplit("/", 1)[-1]] = node
+        return scope
+
+    def diff(self, base: "TreeIndex", prefix: str = "") -> list[dict]:
+        """
+        Изменения этого дерева относительно base.
+
+        Поддеревья с одинаковым SHA не обходятся, поэтому стоимость сравнения
+        определяется размером изменений, а не размером репозитория.
+
+        Args:
+            base (TreeIndex): Исходное дерево.
+            prefix (str): Папка (или файл), в пределах которой ищутся изменения.
+
+        Returns:
+            list[dict]: Изменения в порядке путей: path, type, change
+                ("added", "modified", "deleted"), sha и previous_sha.
+        """
+        prefix = prefix.strip("/")
+        changes: list[dict] = []
+
+        def change(kind: str, new: TreeNode | None, old: TreeNode | None) -> dict:
+            entry = new or old
+            return {
+                "path": entry.path,
+                "type": entry.type,
+                "change": kind,
+                "sha": new.sha if new else None,
+                "previous_sha": old.sha if old else None,
+            }
+
+        def whole(node: _TrieNode, kind: str) -> None:
+            # Поддерево, которого нет в одном из деревьев, выдаётся целиком
+            if node.entry is not None:
+                changes.append(change(kind, node.entry if kind == "added" else None,
+                                      node.entry if kind == "deleted" else None))
+            for child in node.children.values():
+                whole(child, kind)
+
+        def walk(old: _TrieNode, new: _TrieNode) -> None:
+            for name in sorted(old.children.keys() | new.children.keys()):
+                old_child = old.children.get(name)
+                new_child = new.children.get(name)
+                if old_child is None:
+                    whole(new_child, "added")
+                    continue
+                if new_child is None:
+                    whole(old_child, "deleted")
+                    continue
+                old_entry, new_entry = old_child.entry, new_child.entry
+                if old_entry is not None and new_entry is not None:
+                    if (old_entry.sha, old_entry.type, old_entry.mode) == (
+                        new_entry.sha, new_entry.type, new_entry.mode
+                    ):
+                        continue
+                    changes.append(change("modified", new_entry, old_entry))
+                elif new_entry is not None:
+                    changes.append(change("added", new_entry, None))
+                elif old_entry is not None:
+                    changes.append(change("deleted", None, old_entry))
+                walk(old_child, new_child)
+
+        walk(base._scope(prefix), self._scope(prefix))
+        return changes
+
+
+class TreeIndexCache:
+    """
+    LRU-кэш индексов деревьев по SHA дерева (деревья неизменяемы).
+    """
+    def __init__(self, max_entries: int = 16):
+        """
+        Args:
+            max_entries (int): Максимальное число индексов в памяти.
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, TreeIndex] = OrderedDict()
+
+    def get(self, sha: str) -> TreeIndex | None:
+        """
+        Индекс дерева по SHA или None.
+        """
+        index = self._entries.get(sha)
+        if index is not None:
+            self._entries.move_to_end(sha)
+        return index
+
+    def _put(self, key: str, index: TreeIndex) -> None:
+        self._entries[key] = index
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def alias(self, key: str, index: TreeIndex) -> None:
+        """
+        Регистрация индекса под дополнительным неизменяемым ключом (SHA коммита).
+        """
+        self._put(key, index)
+
+    def get_or_build(self, data: dict) -> TreeIndex:
+        """
+        Индекс для ответа trees API: из кэша или построенный заново.
+
+        Args:
+            data (dict): Ответ trees API (sha, tree, truncated).
+
+        Returns:
+            TreeIndex: Индекс дерева.
+        """
+        sha = data.get("sha")
+        index = self.get(sha) if sha else None
+        if index is None:
+            index = TreeIndex(sha, data.get("tree", []), bool(data.get("truncated")))
+            if sha:
+                self._put(sha, index)
+        return index
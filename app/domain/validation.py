@@ -0,0 +1,222 @@
+# app/domain/validation.py
+
+import asyncio
+import hashlib
+import json
+import os
+import tomllib
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable
+
+try:
+    import yaml
+except ImportError:  # PyYAML не обязателен: без него YAML не проверяется
+    yaml = None
+
+# Валидатор получает содержимое и параметры и возвращает текст ошибки или None.
+# Функции объявлены на уровне модуля, чтобы их можно было передать в пул процессов.
+Validator = tuple[Callable[..., str | None], tuple]
+
+
+def check_sha256(content: str, expected: str) -> str | None:
+    """
+    Сверка контрольной суммы SHA-256 содержимого.
+    """
+    if hashlib.sha256(content.encode()).hexdigest() != expected:
+        return "Контрольная сумма содержимого не совпадает. Возможна ошибка передачи."
+    return None
+
+
+def check_line_count(content: str, expected: int) -> str | None:
+    """
+    Проверка, что содержимое не короче ожидаемого (допускается 20% расхождения).
+    """
+    actual_lines = len(content.splitlines())
+    if actual_lines < int(0.8 * expected):
+        return f"Содержимое файла короче ожидаемого ({actual_lines} < {expected})"
+    return None
+
+
+def check_python(content: str, filename: str) -> str | None:
+    """
+    Проверка синтаксиса Python.
+    """
+    try:
+        compile(content, filename, "exec")
+    except SyntaxError as e:
+        return f"Синтаксическая ошибка в файле: {e}"
+    return None
+
+
+def check_json(content: str, filename: str) -> str | None:
+    """
+    Проверка синтаксиса JSON.
+    """
+    try:
+        json.loads(content)
+    except json.JSONDecodeError as e:
+        return f"Ошибка JSON в файле {filename}: {e}"
+    return None
+
+
+def check_toml(content: str, filename: str) -> str | None:
+    """
+    Проверка синтаксиса TOML.
+    """
+    try:
+        tomllib.loads(content)
+    except tomllib.TOMLDecodeError as e:
+        return f"Ошибка TOML в файле {filename}: {e}"
+    return None
+
+
+def check_yaml(content: str, filename: str) -> str | None:
+    """
+    Проверка синтаксиса YAML (допускаются многодокументные файлы).
+    """
+    try:
+        for _ in yaml.safe_load_all(content):
+            pass
+    except yaml.YAMLError as e:
+        return f"Ошибка YAML в файле {filename}: {e}"
+    return None
+
+
+SYNTAX_VALIDATORS: dict[str, Callable[[str, str], str | None]] = {
+    ".py": check_python,
+    ".pyi": check_python,
+    ".json": check_json,
+    ".toml": check_toml,
+}
+if yaml is not None:
+    SYNTAX_VALIDATORS[".yaml"] = check_yaml
+    SYNTAX_VALIDATORS[".yml"] = check_yaml
+
+
+def validators_for(
+    filename: str,
+    content_sha256: str | None = None,
+    content_lines: int | None = None
+) -> list[Validator]:
+    """
+    Набор проверок для файла: целостность и синтаксис по расширению.
+
+    Args:
+        filename (str): Имя файла.
+        content_sha256 (str | None): Ожидаемая контрольная сумма.
+        content_lines (int | None): Ожидаемое количество строк.
+
+    Returns:
+        list[Validator]: Пары (функция, аргументы после содержимого) в порядке отчёта об ошибках.
+    """
+    validators: list[Validator] = []
+    if content_sha256:
+        validators.append((check_sha256, (content_sha256,)))
+    if content_lines is not None:
+        validators.append((check_line_count, (content_lines,)))
+    syntax = SYNTAX_VALIDATORS.get(os.path.splitext(filename)[1].lower())
+    if syntax is not None:
+        validators.append((syntax, (filename,)))
+    return validators
+
+
+class ValidationExecutor:
+    """
+    Выполнение проверок содержимого вне цикла событий.
+
+    Небольшое содержимое проверяется на месте (передача в пул дороже самой
+    проверки). Крупное — в пуле процессов или потоков ограниченного размера,
+    все проверки одного запроса параллельно и с общим таймаутом.
+
+    Разбор синтаксиса (compile, json.loads и т. п.) держит GIL, поэтому
+    только пул процессов действительно освобождает цикл событий; пул
+    потоков годится лишь для окружений, где процессы недоступны. По таймауту
+    процессы пула завершаются (пул создаётся заново), а зависшая проверка
+    в потоке продолжает работать до конца.
+    """
+    def __init__(
+        self,
+        kind: str = "process",
+        max_workers: int = 4,
+        timeout: float = 10.0,
+        inline_max_chars: int = 64 * 1024,
+    ):
+        """
+        Args:
+            kind (str): "process" или "thread".
+            max_workers (int): Размер пула.
+            timeout (float): Общий таймаут проверок одного запроса, с.
+            inline_max_chars (int): Содержимое до этой длины (в символах) проверяется без пула.
+        """
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Неизвестный тип пула проверок: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.inline_max_chars = inline_max_chars
+        self._executor: Executor | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="validation")
+        return self._executor
+
+    async def run(self, content: str, validators: list[Validator]) -> list[str]:
+        """
+        Выполнение проверок.
+
+        Args:
+            content (str): Проверяемое содержимое.
+            validators (list[Validator]): Проверки из validators_for().
+
+        Returns:
+            list[str]: Ошибки в порядке проверок (пустой список — всё в порядке).
+
+        Raises:
+            ValueError: Если проверки не уложились в таймаут.
+        """
+        if not validators:
+            return []
+        if len(content) <= self.inline_max_chars:
+            results = [fn(content, *args) for fn, args in validators]
+        else:
+            try:
+                results = await self._run_in_pool(content, validators)
+            except BrokenExecutor:
+                # Пул завершён по таймауту чужой проверки: повтор в новом пуле
+                results = await self._run_in_pool(content, validators)
+        return [error for error in results if error]
+
+    async def _run_in_pool(self, content: str, validators: list[Validator]) -> list[str | None]:
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        futures = [loop.run_in_executor(executor, fn, content, *args) for fn, args in validators]
+        try:
+            return await asyncio.wait_for(asyncio.gather(*futures), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self._terminate(executor)
+            raise ValueError(f"Проверка содержимого не уложилась в {self.timeout:g} с")
+
+    def _terminate(self, executor: Executor) -> None:
+        """
+        Остановка пула с зависшей проверкой: процессы завершаются, чтобы
+        не занимать CPU; следующий запрос создаст новый пул.
+        """
+        if self._executor is executor:
+            self._executor = None
+        if isinstance(executor, ProcessPoolExecutor):
+            # Публичного способа завершить процессы пула в Python 3.11 нет
+            for process in list((getattr(executor, "_processes", None) or {}).values()):
+                process.terminate()
+        executor.shutdown(wait=False)
+
+    def shutdown(self) -> None:
+        """
+        Остановка пула (без ожидания зависших проверок).
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,80 @@
+# app/domain/webhooks.py
+
+import hashlib
+import hmac
+from dataclasses import dataclass
+
+# Список коммитов в push-событии усекается GitHub; на границе изменённые пути неполны
+PUSH_COMMITS_LIMIT = 2048
+
+
+def verify_signature(secret: str | None, body: bytes, signature: str | None) -> bool:
+    """
+    Проверка подписи вебхука (заголовок X-Hub-Signature-256).
+
+    Args:
+        secret (str | None): Секрет вебхука; без него ни одна подпись не принимается.
+        body (bytes): Тело запроса как есть.
+        signature (str | None): Значение заголовка вида "sha256=<hex>".
+
+    Returns:
+        bool: True, если подпись совпала.
+    """
+    if not secret or not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+
+@dataclass
+class PushEvent:
+    """
+    Push-событие, сведённое к тому, что нужно для инвалидации кэшей.
+
+    Attributes:
+        owner (str): Владелец репозитория.
+        repo (str): Имя репозитория.
+        branch (str): Ветка, в которую пришёл push.
+        head_sha (str | None): Новый головной коммит (None — ветка удалена).
+        paths (set[str] | None): Добавленные, изменённые и удалённые пути;
+            None, если список неполон (force push, создание/удаление ветки, усечение).
+        default_branch (str | None): Ветка по умолчанию на момент события.
+    """
+    owner: str
+    repo: str
+    branch: str
+    head_sha: str | None
+    paths: set[str] | None
+    default_branch: str | None
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "PushEvent | None":
+        """
+        Разбор тела push-события.
+
+        Returns:
+            PushEvent | None: Событие или None, если push не в ветку (например, тег).
+        """
+        ref = payload.get("ref") or ""
+        if not ref.startswith("refs/heads/"):
+            return None
+        repository = payload.get("repository") or {}
+        owner = repository.get("owner") or {}
+        commits = payload.get("commits") or []
+        deleted = bool(payload.get("deleted"))
+
+        paths: set[str] | None = None
+        if not (payload.get("forced") or payload.get("created") or deleted) and len(commits) < PUSH_COMMITS_LIMIT:
+            paths = set()
+            for commit in commits:
+                for key in ("added", "modified", "removed"):
+                    paths.update(commit.get(key) or ())
+
+        return cls(
+            owner=owner.get("login") or owner.get("name") or "",
+            repo=repository.get("name") or "",
+            branch=ref[len("refs/heads/"):],
+            head_sha=None if deleted else payload.get("after"),
+            paths=paths,
+            default_branch=repository.get("default_branch"),
+        )
@@ -0,0 +1,230 @@
+# app/infrastructure/blob_store.py
+
+import hashlib
+import mmap
+import os
+import re
+import stat
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+_BLOB_SHA = re.compile(r"[0-9a-f]{40}")
+
+
+def git_blob_sha(data: bytes) -> str:
+    """
+    SHA-1 объекта git blob для содержимого.
+    """
+    digest = hashlib.sha1(f"blob {len(data)}\0".encode())
+    digest.update(data)
+    return digest.hexdigest()
+
+
+class BlobStore:
+    """
+    Хранилище блобов на диске, адресуемое SHA блоба.
+
+    Блобы неизменяемы, поэтому файлы не устаревают и общие для всех
+    воркеров: чтение идёт через mmap, и процессы делят страницы через
+    page cache ОС. Размер ограничен; при превышении удаляются давно не
+    читанные файлы (время последнего чтения — mtime файла, обновляется
+    пакетами и не чаще touch_interval).
+
+    Папка принадлежит пользователю процесса и закрыта для остальных (0700);
+    файлы чужих владельцев не читаются, а содержимое каждого блоба
+    сверяется с SHA при первом чтении в процессе. Методы можно вызывать
+    из нескольких потоков одновременно.
+    """
+    # После вытеснения занято не больше этой доли лимита, чтобы не сканировать папку на каждой записи
+    LOW_WATERMARK = 0.9
+    # Сколько отметок о чтении копить перед обновлением mtime
+    TOUCH_BATCH = 256
+    # Сколько SHA помнить как уже сверенные с содержимым
+    VERIFIED_MAX = 65536
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_bytes: int = 1024 * 1024 * 1024,
+        touch_interval: float = 60.0,
+        lazy: bool = False,
+    ):
+        """
+        Args:
+            directory (str | Path): Папка хранилища (общая для воркеров).
+            max_bytes (int): Максимальный суммарный размер блобов в байтах.
+            touch_interval (float): Точность времени последнего чтения, с.
+            lazy (bool): Создавать и проверять папку при первой записи, а не сразу.
+
+        Raises:
+            PermissionError: Папка принадлежит другому пользователю.
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        # Оценка занятого места этим процессом; точное значение считается при вытеснении
+        self._bytes: int | None = None
+        self._touched: set[Path] = set()
+        self._verified: OrderedDict[str, None] = OrderedDict()
+        # Учёт прочитанных, сверенных и записанных блобов общий для потоков
+        self._lock = threading.Lock()
+        self._prepared = False
+        if not lazy:
+            self._prepare()
+
+    def _prepare(self) -> None:
+        """
+        Создание папки с правами 0700 и проверка её владельца.
+        """
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        info = self.directory.stat()
+        if hasattr(os, "geteuid") and info.st_uid != os.geteuid():
+            raise PermissionError(f"Папка хранилища блобов {self.directory} принадлежит другому пользователю")
+        if stat.S_IMODE(info.st_mode) & 0o077:
+            os.chmod(self.directory, 0o700)
+        self._prepared = True
+
+    def _path(self, sha: str) -> Path:
+        if not _BLOB_SHA.fullmatch(sha):
+            raise ValueError(f"Некорректный SHA блоба: {sha!r}")
+        return self.directory / sha[:2] / sha[2:]
+
+    def get(self, sha: str) -> bytes | mmap.mmap | None:
+        """
+        Содержимое блоба, отображённое в память, или None, если его нет.
+
+        Файл чужого владельца или с содержимым, не соответствующим SHA,
+        считается отсутствующим (повреждённый файл удаляется).
+
+        Args:
+            sha (str): SHA блоба.
+
+        Returns:
+            bytes | mmap.mmap | None: Содержимое только для чтения.
+        """
+        path = self._path(sha)
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            return None
+        try:
+            info = os.fstat(fd)
+            if hasattr(os, "geteuid") and info.st_uid != os.geteuid():
+                return None
+            if info.st_size == 0:
+                data = b""
+            else:
+                data = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+
+        if sha not in self._verified:
+            if git_blob_sha(data) != sha:
+                self._discard(path)
+                return None
+            with self._lock:
+                self._verified[sha] = None
+                while len(self._verified) > self.VERIFIED_MAX:
+                    self._verified.popitem(last=False)
+
+        if time.time() - info.st_mtime > self.touch_interval:
+            with self._lock:
+                self._touched.add(path)
+                full = len(self._touched) >= self.TOUCH_BATCH
+            if full:
+                self.touch()
+        return data
+
+    def touch(self) -> None:
+        """
+        Запись накопленных отметок о чтении (mtime файлов) для вытеснения.
+        """
+        with self._lock:
+            touched, self._touched = self._touched, set()
+        for path in touched:
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                pass  # уже вытеснен
+
+    def _discard(self, path: Path) -> None:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def put(self, sha: str, data: bytes) -> None:
+        """
+        Сохранение блоба (атомарно; повторная запись того же SHA ничего не делает).
+
+        Args:
+            sha (str): SHA блоба.
+            data (bytes): Содержимое.
+
+        Raises:
+            ValueError: SHA не соответствует содержимому.
+        """
+        path = self._path(sha)
+        if path.exists():
+            return
+        if git_blob_sha(data) != sha:
+            raise ValueError(f"Содержимое не соответствует SHA блоба {sha}")
+        if not self._prepared:
+            self._prepare()
+        path.parent.mkdir(mode=0o700, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+        if self._bytes is None:
+            self._bytes = self.usage()
+        else:
+            with self._lock:
+                self._bytes += len(data)
+        if self._touched:
+            self.touch()
+        if self._bytes > self.max_bytes:
+            self.evict()
+
+    def _files(self) -> list[os.DirEntry]:
+        if not self.directory.is_dir():
+            return []
+        entries = []
+        for fan_out in os.scandir(self.directory):
+            if fan_out.is_dir():
+                entries.extend(entry for entry in os.scandir(fan_out.path) if not entry.name.startswith("."))
+        return entries
+
+    def usage(self) -> int:
+        """
+        Суммарный размер блобов на диске в байтах.
+        """
+        return sum(entry.stat().st_size for entry in self._files())
+
+    def evict(self) -> None:
+        """
+        Удаление давно не читанных блобов, пока занятое место выше нижней границы.
+        """
+        self.touch()
+        stats = []
+        for entry in self._files():
+            try:
+                stats.append((entry.stat().st_mtime, entry.stat().st_size, entry.path))
+            except FileNotFoundError:
+                continue
+        total = sum(size for _, size, _ in stats)
+        target = self.max_bytes * self.LOW_WATERMARK
+        for _, size, path in sorted(stats):
+            if total <= target:
+                break
+            self._discard(path)  # мог быть уже удалён другим воркером
+            total -= size
+        self._bytes = total
@@ -0,0 +1,509 @@
+# app/infrastructure/cache.py
+
+import asyncio
+import math
+import mmap
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from app.infrastructure.shared_cache import SharedCache
+
+
+def _to_wall(moment: float) -> float:
+    """
+    Перевод момента по time.monotonic() во время time.time() (для общего кэша).
+    """
+    if moment <= 0 or math.isinf(moment):
+        return moment
+    return time.time() + (moment - time.monotonic())
+
+
+def _to_monotonic(moment: float) -> float:
+    """
+    Перевод момента по time.time() в time.monotonic().
+    """
+    if moment <= 0 or math.isinf(moment):
+        return moment
+    return time.monotonic() + (moment - time.time())
+
+
+@dataclass
+class CachedResponse:
+    """
+    Закэшированный ответ GitHub API с валидаторами для условного запроса.
+
+    Attributes:
+        etag (str | None): Значение заголовка ETag.
+        last_modified (str | None): Значение заголовка Last-Modified.
+        body (Any): Разобранное JSON-тело ответа.
+        size (int): Размер исходного тела в байтах (для учёта памяти).
+        fresh_until (float): До этого момента (time.monotonic()) запись
+            заведомо актуальна и отдаётся без запроса к GitHub.
+    """
+    etag: str | None
+    last_modified: str | None
+    body: Any
+    size: int = 0
+    fresh_until: float = 0.0
+
+
+class ResponseCache:
+    """
+    LRU-кэш ответов GitHub API по URL для условных запросов (If-None-Match).
+
+    Память ограничена как числом записей, так и суммарным размером тел.
+    Счётчики:
+        hits — тело отдано из кэша (по ответу 304 или без запроса, пока запись свежа);
+        misses — тело пришлось загрузить целиком;
+        revalidations — отправлен условный запрос по закэшированной записи.
+
+    С общим кэшем (backend) промах в памяти дочитывается из него, записи
+    и инвалидации передаются туда же, а инвалидации других воркеров
+    применяются к памяти этого процесса.
+    """
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        max_bytes: int = 64 * 1024 * 1024,
+        backend: SharedCache | None = None,
+    ):
+        """
+        Args:
+            max_entries (int): Максимальное число записей.
+            max_bytes (int): Максимальный суммарный размер тел в байтах.
+            backend (SharedCache | None): Общий для воркеров кэш.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.backend = backend
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        if backend is not None:
+            backend.subscribe(self._on_invalidation)
+
+    def _on_invalidation(self, kind: str, key: str) -> None:
+        if kind == "url":
+            self._discard(key)
+        elif kind == "prefix":
+            for url in [k for k in self._entries if k.startswith(key)]:
+                self._discard(url)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> CachedResponse | None:
+        """
+        Получение записи с отметкой о недавнем использовании.
+
+        Args:
+            key (str): Ключ (URL запроса).
+
+        Returns:
+            CachedResponse | None: Запись или None, если её нет.
+        """
+        entry = self._lookup(key)
+        if entry is None and self.backend is not None:
+            entry = self._from_shared(key, self.backend.get_response(key))
+        return entry
+
+    async def load(self, key: str) -> CachedResponse | None:
+        """
+        То же, что get, но промах в памяти дочитывается из общего кэша
+        в пуле потоков: чтение и декодирование большого тела не занимают
+        цикл событий.
+
+        Args:
+            key (str): Ключ (URL запроса).
+
+        Returns:
+            CachedResponse | None: Запись или None, если её нет.
+        """
+        entry = self._lookup(key)
+        if entry is None and self.backend is not None:
+            shared = await asyncio.to_thread(self.backend.get_response, key)
+            entry = self._entries.get(key) or self._from_shared(key, shared)
+        return entry
+
+    def _lookup(self, key: str) -> CachedResponse | None:
+        if self.backend is not None:
+            self.backend.poll()
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _from_shared(self, key: str, shared: tuple | None) -> CachedResponse | None:
+        if shared is None:
+            return None
+        etag, last_modified, body, size, fresh_until = shared
+        entry = CachedResponse(etag, last_modified, body, size, _to_monotonic(fresh_until))
+        self._store(key, entry)
+        return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        """
+        Сохранение записи с вытеснением давно не использованных.
+
+        Args:
+            key (str): Ключ (URL запроса).
+            entry (CachedResponse): Запись для сохранения.
+        """
+        self._store(key, entry)
+        if self.backend is not None:
+            self.backend.put_response(
+                key, entry.etag, entry.last_modified, entry.body, entry.size, _to_wall(entry.fresh_until)
+            )
+
+    def _store(self, key: str, entry: CachedResponse) -> None:
+        self._discard(key)
+        if entry.size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def invalidate(self, key: str) -> None:
+        """
+        Удаление записи по ключу, если она есть.
+        """
+        self._discard(key)
+        if self.backend is not None:
+            self.backend.invalidate("url", key)
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        """
+        Удаление всех записей, ключ которых начинается с prefix.
+        """
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            self._discard(key)
+        if self.backend is not None:
+            self.backend.invalidate("prefix", prefix)
+
+    def stats(self) -> dict:
+        """
+        Текущие счётчики и заполненность кэша.
+
+        Returns:
+            dict: hits, misses, revalidations, entries, bytes.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+
+@dataclass
+class RepoMetadata:
+    """
+    Мета-информация о репозитории, нужная для построения запросов.
+
+    Attributes:
+        default_branch (str): Ветка по умолчанию.
+        head_sha (str | None): SHA последнего известного коммита ветки.
+        expires_at (float): Момент устаревания записи (time.monotonic()).
+    """
+    default_branch: str
+    head_sha: str | None
+    expires_at: float
+
+
+class RepoMetadataCache:
+    """
+    Кэш мета-информации о репозиториях с ограниченным временем жизни.
+
+    С общим кэшем (backend) записи видны всем воркерам, а изменения
+    и инвалидации одного воркера сбрасывают запись в памяти остальных.
+    """
+    def __init__(self, ttl: float = 300.0, backend: SharedCache | None = None):
+        """
+        Args:
+            ttl (float): Время жизни записи в секундах.
+            backend (SharedCache | None): Общий для воркеров кэш.
+        """
+        self.ttl = ttl
+        self.backend = backend
+        self._entries: dict[str, RepoMetadata] = {}
+        if backend is not None:
+            backend.subscribe(self._on_invalidation)
+
+    def _on_invalidation(self, kind: str, key: str) -> None:
+        if kind == "repo":
+            self._entries.pop(key, None)
+
+    def get(self, repo: str) -> RepoMetadata | None:
+        """
+        Получение актуальной записи; устаревшие записи удаляются.
+
+        Args:
+            repo (str): Имя репозитория.
+
+        Returns:
+            RepoMetadata | None: Запись или None, если её нет или она устарела.
+        """
+        if self.backend is not None:
+            self.backend.poll()
+        entry = self._entries.get(repo)
+        if entry is None and self.backend is not None:
+            shared = self.backend.get_repo(repo)
+            if shared is not None:
+                default_branch, head_sha, expires_at = shared
+                entry = RepoMetadata(default_branch, head_sha, _to_monotonic(expires_at))
+                self._entries[repo] = entry
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[repo]
+            return None
+        return entry
+
+    def set(self, repo: str, default_branch: str, head_sha: str | None = None) -> RepoMetadata:
+        """
+        Сохранение мета-информации о репозитории.
+
+        Args:
+            repo (str): Имя репозитория.
+            default_branch (str): Ветка по умолчанию.
+            head_sha (str | None): SHA последнего коммита ветки, если известен.
+
+        Returns:
+            RepoMetadata: Сохранённая запись.
+        """
+        entry = RepoMetadata(default_branch, head_sha, time.monotonic() + self.ttl)
+        self._entries[repo] = entry
+        if self.backend is not None:
+            self.backend.put_repo(repo, default_branch, head_sha, self.ttl)
+        return entry
+
+    def update_head(self, repo: str, head_sha: str) -> None:
+        """
+        Обновление SHA головы ветки у существующей записи (например, после коммита).
+        """
+        entry = self.get(repo)
+        if entry is not None:
+            entry.head_sha = head_sha
+            if self.backend is not None:
+                # Другие воркеры перечитают запись из общего кэша
+                self.backend.invalidate("repo", repo)
+                self.backend.put_repo(repo, entry.default_branch, head_sha, entry.expires_at - time.monotonic())
+
+    def invalidate(self, repo: str) -> None:
+        """
+        Удаление записи о репозитории.
+        """
+        self._entries.pop(repo, None)
+        if self.backend is not None:
+            self.backend.invalidate("repo", repo)
+
+
+class BlobShaIndex:
+    """
+    Индекс path → blob SHA для файлов ветки по умолчанию.
+
+    Наполняется из листингов дерева и ответов на запись, чтобы обновление
+    и удаление файла могли отправить SHA без предварительного GET.
+    Размер ограничен, вытесняются давно не использованные пути.
+    """
+    def __init__(self, max_entries: int = 200_000):
+        """
+        Args:
+            max_entries (int): Максимальное число путей в индексе.
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], str] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, repo: str, path: str) -> str | None:
+        """
+        SHA блоба по пути или None, если он неизвестен.
+        """
+        key = (repo, path)
+        sha = self._entries.get(key)
+        if sha is not None:
+            self._entries.move_to_end(key)
+        return sha
+
+    def set(self, repo: str, path: str, sha: str) -> None:
+        """
+        Запоминание SHA блоба для пути.
+        """
+        key = (repo, path)
+        self._entries[key] = sha
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def update_from_tree(self, repo: str, tree: list) -> None:
+        """
+        Заполнение индекса из узлов дерева (учитываются только блобы).
+        """
+        for node in tree:
+            if node.get("type") == "blob" and node.get("sha"):
+                self.set(repo, node["path"], node["sha"])
+
+    def invalidate(self, repo: str, path: str) -> None:
+        """
+        Удаление пути из индекса.
+        """
+        self._entries.pop((repo, path), None)
+
+    def invalidate_repo(self, repo: str) -> None:
+        """
+        Удаление всех путей репозитория из индекса.
+        """
+        for key in [k for k in self._entries if k[0] == repo]:
+            del self._entries[key]
+
+
+class DecodedBlob:
+    """
+    Декодированное содержимое блоба (UTF-8) с индексом начал строк.
+
+    Хранятся исходные байты (или их отображение в память из BlobStore)
+    и смещения начал строк в байтах, поэтому срез строк или байтов
+    декодирует только сам срез.
+    """
+    __slots__ = ("sha", "data", "line_starts")
+
+    def __init__(self, sha: str, data: bytes | mmap.mmap):
+        """
+        Args:
+            sha (str): SHA блоба.
+            data (bytes | mmap.mmap): Содержимое в UTF-8 (проверяется вызывающим).
+        """
+        self.sha = sha
+        self.data = data
+        starts = array("Q")
+        if data:
+            starts.append(0)
+            pos = data.find(b"\n")
+            while pos != -1 and pos + 1 < len(data):
+                starts.append(pos + 1)
+                pos = data.find(b"\n", pos + 1)
+        self.line_starts = starts
+
+    @classmethod
+    def decode(cls, sha: str, data: bytes | mmap.mmap) -> tuple["DecodedBlob", str]:
+        """
+        Проверка UTF-8 и построение блоба с индексом строк.
+
+        Returns:
+            tuple[DecodedBlob, str]: Блоб и полученный при проверке текст целиком.
+
+        Raises:
+            UnicodeDecodeError: Содержимое не является текстом в UTF-8.
+        """
+        text = data[:].decode("utf-8")
+        return cls(sha, data), text
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    @property
+    def total_lines(self) -> int:
+        return len(self.line_starts)
+
+    def text(self) -> str:
+        return self.data[:].decode("utf-8")
+
+    def lines(self, start: int, end: int | None = None) -> str:
+        """
+        Строки с start по end включительно (нумерация с 1; end обрезается по концу файла).
+        """
+        total = len(self.line_starts)
+        end = total if end is None else min(end, total)
+        if start > end:
+            return ""
+        first = self.line_starts[start - 1]
+        last = self.line_starts[end] if end < total else len(self.data)
+        return self.data[first:last].decode("utf-8")
+
+    def byte_range(self, first: int | None, last: int | None) -> tuple[int, int, str]:
+        """
+        Срез по диапазону байтов в смысле заголовка Range.
+
+        Границы сдвигаются вперёд до границ символов UTF-8, чтобы срез
+        декодировался без потерь.
+
+        Args:
+            first (int | None): Первый байт; None — суффиксный диапазон (last последних байтов).
+            last (int | None): Последний байт включительно; None — до конца.
+
+        Returns:
+            tuple[int, int, str]: Фактические первый и последний байт и текст среза.
+
+        Raises:
+            ValueError: Диапазон не пересекается с содержимым.
+        """
+        size = len(self.data)
+        if first is None:
+            start, end = max(size - (last or 0), 0), size
+        else:
+            start, end = first, size if last is None else min(last + 1, size)
+        if start >= size or start >= end:
+            raise ValueError(f"Диапазон вне содержимого размером {size} байт")
+        # 0b10xxxxxx — продолжение многобайтового символа
+        while start < size and self.data[start] & 0xC0 == 0x80:
+            start += 1
+        while end < size and self.data[end] & 0xC0 == 0x80:
+            end += 1
+        return start, end - 1, self.data[start:end].decode("utf-8")
+
+
+class DecodedBlobCache:
+    """
+    LRU-кэш декодированных блобов по SHA с ограничением суммарного размера.
+
+    Блобы неизменяемы, поэтому записи не устаревают.
+    """
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            max_bytes (int): Максимальный суммарный размер содержимого в байтах.
+        """
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, DecodedBlob] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, sha: str) -> DecodedBlob | None:
+        """
+        Блоб по SHA с отметкой о недавнем использовании.
+        """
+        blob = self._entries.get(sha)
+        if blob is not None:
+            self._entries.move_to_end(sha)
+        return blob
+
+    def put(self, blob: DecodedBlob) -> DecodedBlob:
+        """
+        Сохранение блоба с вытеснением давно не использованных.
+        """
+        if blob.size > self.max_bytes or blob.sha in self._entries:
+            return blob
+        self._entries[blob.sha] = blob
+        self._bytes += blob.size
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+        return blob
@@ -0,0 +1,261 @@
+# app/infrastructure/credentials.py
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+from app.core.config import (
+    GITHUB_API_URL,
+    GITHUB_APP_ID,
+    GITHUB_APP_INSTALLATIONS,
+    GITHUB_APP_PRIVATE_KEY,
+    GITHUB_APP_PRIVATE_KEY_PATH,
+    GITHUB_TOKEN_RESELECT_INTERVAL,
+    GITHUB_TOKENS,
+    MY_GITHUB_TOKEN,
+)
+from app.core.exceptions import UpstreamUnavailableError
+from app.infrastructure.rate_limiter import Priority, RateLimitScheduler
+
+try:
+    import jwt
+except ImportError:  # PyJWT не обязателен: без него токены GitHub App недоступны
+    jwt = None
+
+
+class Credential(ABC):
+    """
+    Учётные данные для запросов к GitHub.
+
+    Attributes:
+        name (str): Метка для учёта лимитов и диагностики (не секрет).
+        owner (str | None): Владелец, к репозиториям которого есть доступ;
+            None — учётные данные подходят для любого владельца.
+    """
+    def __init__(self, name: str, owner: str | None = None):
+        self.name = name
+        self.owner = owner
+
+    @abstractmethod
+    async def authorization(self, http: httpx.AsyncClient) -> str:
+        """
+        Значение заголовка Authorization (при необходимости токен обновляется).
+
+        Args:
+            http (httpx.AsyncClient): HTTP-клиент для обновления токена.
+        """
+
+    def invalidate(self) -> None:
+        """
+        Сброс токена после ответа 401.
+        """
+
+
+class StaticToken(Credential):
+    """
+    Персональный токен доступа.
+    """
+    def __init__(self, token: str, name: str = "", owner: str | None = None):
+        super().__init__(name, owner)
+        self._token = token
+
+    async def authorization(self, http: httpx.AsyncClient) -> str:
+        return f"Bearer {self._token}"
+
+
+class AppInstallationToken(Credential):
+    """
+    Токен установки GitHub App с автоматическим обновлением.
+
+    Токен живёт час; новый запрашивается по JWT приложения, когда до
+    истечения остаётся меньше REFRESH_MARGIN. Одновременные обновления
+    объединяются.
+    """
+    REFRESH_MARGIN = 300.0
+
+    def __init__(self, app_id: str, private_key: str, installation_id: str, owner: str | None = None):
+        """
+        Args:
+            app_id (str): ID приложения.
+            private_key (str): Закрытый ключ приложения (PEM).
+            installation_id (str): ID установки.
+            owner (str | None): Аккаунт, в который установлено приложение.
+        """
+        super().__init__(f"app-{installation_id}", owner)
+        self.app_id = app_id
+        self.installation_id = installation_id
+        self._private_key = private_key
+        self._token: str | None = None
+        self._expires_at = 0.0  # time.time()
+        self._lock = asyncio.Lock()
+        self.refreshes = 0
+
+    def _app_jwt(self) -> str:
+        if jwt is None:
+            raise RuntimeError("Для токенов GitHub App нужен пакет PyJWT[crypto]")
+        now = int(time.time())
+        # iat в прошлом — на случай расхождения часов с GitHub
+        payload = {"iat": now - 60, "exp": now + 540, "iss": str(self.app_id)}
+        return jwt.encode(payload, self._private_key, algorithm="RS256")
+
+    def _stale(self) -> bool:
+        return self._token is None or self._expires_at - time.time() < self.REFRESH_MARGIN
+
+    async def authorization(self, http: httpx.AsyncClient) -> str:
+        if self._stale():
+            async with self._lock:
+                if self._stale():
+                    await self._refresh(http)
+        return f"token {self._token}"
+
+    async def _refresh(self, http: httpx.AsyncClient) -> None:
+        url = f"{GITHUB_API_URL}/app/installations/{self.installation_id}/access_tokens"
+        headers = {"Authorization": f"Bearer {self._app_jwt()}", "Accept": "application/vnd.github+json"}
+        try:
+            response = await http.post(url, headers=headers)
+        except httpx.TransportError as e:
+            raise UpstreamUnavailableError(f"GitHub недоступен: {e!r}") from e
+        response.raise_for_status()
+        data = response.json()
+        self._token = data["token"]
+        self._expires_at = datetime.fromisoformat(data["expires_at"].replace("Z", "+00:00")).timestamp()
+        self.refreshes += 1
+
+    def invalidate(self) -> None:
+        self._token = None
+
+
+class TokenPool:
+    """
+    Пул учётных данных с выбором по остатку лимита.
+
+    Лимиты GitHub считаются для каждого токена отдельно, поэтому пропускная
+    способность чтений растёт с числом учётных данных. Для запроса берутся
+    учётные данные владельца репозитория (или универсальные) с наибольшим
+    остатком бюджета ресурса по данным планировщика. Запрос, который ждёт
+    бюджет своих учётных данных, периодически перепроверяет выбор и
+    переходит к другим, если у них бюджет больше.
+    """
+    def __init__(self, credentials: list[Credential], reselect_interval: float = 1.0):
+        """
+        Args:
+            credentials (list[Credential]): Учётные данные (хотя бы одни).
+            reselect_interval (float): Как часто ожидающий запрос перепроверяет выбор, с.
+        """
+        if not credentials:
+            raise ValueError("Пул учётных данных GitHub пуст")
+        self.credentials = credentials
+        self.reselect_interval = reselect_interval
+        self.reselected = 0
+
+    def __len__(self) -> int:
+        return len(self.credentials)
+
+    def select(self, scheduler: RateLimitScheduler, resource: str = "core", owner: str | None = None) -> Credential:
+        """
+        Выбор учётных данных для запроса.
+
+        Args:
+            scheduler (RateLimitScheduler): Планировщик с остатками лимитов.
+            resource (str): Ресурс лимита GitHub.
+            owner (str | None): Владелец репозитория запроса.
+
+        Returns:
+            Credential: Учётные данные с наибольшим остатком бюджета.
+        """
+        if len(self.credentials) == 1:
+            return self.credentials[0]
+        candidates = self.credentials
+        if owner is not None:
+            owner = owner.lower()
+            candidates = [c for c in candidates if c.owner is None or c.owner.lower() == owner] or candidates
+        # max() оставляет первый из равных: неизвестный остаток (inf) пробуется по порядку
+        return max(candidates, key=lambda c: scheduler.headroom(resource, c.name))
+
+    async def acquire(
+        self,
+        scheduler: RateLimitScheduler,
+        resource: str = "core",
+        owner: str | None = None,
+        priority: Priority | None = None
+    ) -> Credential:
+        """
+        Выбор учётных данных и ожидание разрешения планировщика на запрос от их имени.
+
+        Если разрешение не пришло за reselect_interval (бюджет исчерпан или
+        приостановлен) и у других учётных данных бюджет больше, запрос
+        уходит из очереди и встаёт в очередь к ним.
+
+        Args:
+            scheduler (RateLimitScheduler): Планировщик с остатками лимитов.
+            resource (str): Ресурс лимита GitHub.
+            owner (str | None): Владелец репозитория запроса.
+            priority (Priority | None): Приоритет; по умолчанию — из контекста задачи.
+
+        Returns:
+            Credential: Учётные данные, на запрос от имени которых получено разрешение.
+        """
+        credential = self.select(scheduler, resource, owner)
+        if len(self.credentials) == 1:
+            await scheduler.acquire(priority, resource=resource, credential=credential.name)
+            return credential
+        while True:
+            waiting = asyncio.ensure_future(scheduler.acquire(priority, resource=resource, credential=credential.name))
+            try:
+                while True:
+                    done, _ = await asyncio.wait({waiting}, timeout=self.reselect_interval)
+                    if done:
+                        waiting.result()
+                        return credential
+                    better = self.select(scheduler, resource, owner)
+                    if (
+                        better is not credential
+                        and scheduler.headroom(resource, better.name) > scheduler.headroom(resource, credential.name)
+                    ):
+                        break
+            finally:
+                waiting.cancel()
+            try:
+                await waiting
+            except asyncio.CancelledError:
+                pass
+            else:
+                # Разрешение пришло одновременно с отменой: используем его
+                return credential
+            self.reselected += 1
+            credential = better
+
+
+def token_pool_from_config() -> TokenPool:
+    """
+    Пул из MY_GITHUB_TOKEN, GITHUB_TOKENS и установок GitHub App.
+
+    Raises:
+        ValueError: Некорректная настройка GitHub App.
+    """
+    tokens = [MY_GITHUB_TOKEN] + [token.strip() for token in GITHUB_TOKENS.split(",") if token.strip()]
+    credentials: list[Credential] = [StaticToken(token) for token in dict.fromkeys(tokens)]
+
+    installations = [item.strip() for item in GITHUB_APP_INSTALLATIONS.split(",") if item.strip()]
+    if installations:
+        private_key = GITHUB_APP_PRIVATE_KEY
+        if private_key is None and GITHUB_APP_PRIVATE_KEY_PATH:
+            private_key = Path(GITHUB_APP_PRIVATE_KEY_PATH).read_text()
+        if not GITHUB_APP_ID or not private_key:
+            raise ValueError("Для GITHUB_APP_INSTALLATIONS нужны GITHUB_APP_ID и закрытый ключ приложения")
+        if jwt is None:
+            raise ValueError("Для токенов GitHub App нужен пакет PyJWT[crypto]")
+        for item in installations:
+            owner, sep, installation_id = item.rpartition("=")
+            if not sep or not owner or not installation_id.isdigit():
+                raise ValueError(f"Некорректная установка GitHub App {item!r}, ожидается owner=installation_id")
+            credentials.append(AppInstallationToken(GITHUB_APP_ID, private_key.replace("\\n", "\n"), installation_id, owner))
+
+    if len(credentials) > 1:
+        for number, credential in enumerate(credentials, 1):
+            if not credential.name:
+                credential.name = f"token-{number}"
+    return TokenPool(credentials, GITHUB_TOKEN_RESELECT_INTERVAL)
@@ -1,63 +1,585 @@
 # app/infrastructure/github_client.py
 
+import asyncio
 import base64
+import math
+import re
+import time
 import httpx
-from app.core.config import MY_GITHUB_TOKEN, MY_GITHUB_USERNAME
+from app.core.config import (
+    GITHUB_API_URL,
+    GITHUB_BLOB_INDEX_MAX_ENTRIES,
+    GITHUB_BREAKER_FAILURE_THRESHOLD,
+    GITHUB_BREAKER_PROBE_TIMEOUT,
+    GITHUB_BREAKER_RESET_TIMEOUT,
+    GITHUB_CACHE_MAX_BYTES,
+    GITHUB_CACHE_MAX_ENTRIES,
+    GITHUB_GRAPHQL_URL,
+    GITHUB_MUTATION_INTERVAL,
+    GITHUB_RATE_LIMIT_BULK_RESERVE,
+    GITHUB_RATE_LIMIT_BURST,
+    GITHUB_RATE_LIMIT_PACING_THRESHOLD,
+    GITHUB_REPO_METADATA_TTL,
+    GITHUB_RETRY_BASE_DELAY,
+    GITHUB_RETRY_DEADLINE,
+    GITHUB_RETRY_MAX_ATTEMPTS,
+    GITHUB_RETRY_MAX_DELAY,
+    GITHUB_SECONDARY_LIMIT_PAUSE,
+    GITHUB_WEBHOOK_SECRET,
+    GITHUB_WEBHOOK_TRUST_TTL,
+    MY_GITHUB_USERNAME,
+    SHARED_CACHE_BATCH_SIZE,
+    SHARED_CACHE_FLUSH_INTERVAL,
+    SHARED_CACHE_PATH,
+    SHARED_CACHE_POLL_INTERVAL,
+    SHARED_CACHE_TTL,
+)
+from app.core.exceptions import GraphQLError, UpstreamUnavailableError
+from app.infrastructure.cache import (
+    BlobShaIndex,
+    CachedResponse,
+    RepoMetadataCache,
+    ResponseCache,
+)
+from app.infrastructure.credentials import TokenPool, token_pool_from_config
+from app.infrastructure.http_client import create_http_client
+from app.infrastructure.metrics import Metrics
+from app.infrastructure.rate_limiter import RateLimitScheduler
+from app.infrastructure.retry import CircuitBreaker, RetryPolicy
+from app.infrastructure.shared_cache import SharedCache, SQLiteSharedCache
+from app.infrastructure.single_flight import SingleFlight
+from app.infrastructure.tracing import span
+
+# Деревья и коммиты, запрошенные по полному SHA, не меняются никогда
+_IMMUTABLE_URL = re.compile(r"/git/(trees|commits)/[0-9a-f]{40}(\?|$)")
+_REPO_OWNER = re.compile(r"^/repos/([^/]+)/")
+
+
+def qualified_repo(owner: str | None, repo: str) -> str:
+    """
+    Имя репозитория для клиента и сервиса: "owner/repo" для чужого владельца.
+
+    Репозитории MY_GITHUB_USERNAME называются коротко, поэтому ключи кэшей
+    для них не зависят от того, указан ли владелец в запросе.
+
+    Args:
+        owner (str | None): Владелец репозитория.
+        repo (str): Имя репозитория.
+
+    Returns:
+        str: "repo" или "owner/repo".
+    """
+    if not owner or owner.lower() == MY_GITHUB_USERNAME.lower():
+        return repo
+    return f"{owner}/{repo}"
+
 
 class GitHubClient:
     """
     Клиент для работы с GitHub API.
 
     Предоставляет методы для CRUD-файлов и получения структуры репозитория.
+    Все запросы идут через один долгоживущий httpx.AsyncClient, чтобы
+    переиспользовать соединения из пула.
     """
-    def __init__(self):
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient | None = None,
+        cache: ResponseCache | None = None,
+        repo_metadata: RepoMetadataCache | None = None,
+        blob_shas: BlobShaIndex | None = None,
+        scheduler: RateLimitScheduler | None = None,
+        retry_policy: RetryPolicy | None = None,
+        metrics: Metrics | None = None,
+        trust_ttl: float | None = None,
+        shared_cache: SharedCache | None = None,
+        tokens: TokenPool | None = None,
+    ):
         """
         Инициализация GitHub клиента с базовым URL и заголовками.
+
+        Args:
+            http_client (httpx.AsyncClient | None): Общий HTTP-клиент. Если не
+                передан, клиент создаётся и принадлежит этому экземпляру.
+            cache (ResponseCache | None): Кэш ответов для условных GET-запросов.
+            repo_metadata (RepoMetadataCache | None): Кэш default_branch и head SHA.
+            blob_shas (BlobShaIndex | None): Индекс path → blob SHA ветки по умолчанию.
+            scheduler (RateLimitScheduler | None): Планировщик запросов с учётом лимитов GitHub.
+            retry_policy (RetryPolicy | None): Политика повторов при сбоях GitHub.
+            metrics (Metrics | None): Метрики, в которые пишется каждая попытка запроса.
+            trust_ttl (float | None): Сколько секунд записи кэша для веток и содержимого
+                отдаются без ревалидации. По умолчанию GITHUB_WEBHOOK_TRUST_TTL, если
+                настроен секрет вебхука (актуальность поддерживают push-события), иначе 0.
+            shared_cache (SharedCache | None): Общий для воркеров кэш под кэшами ответов
+                и мета-информации. Если не передан и задан SHARED_CACHE_PATH, создаётся
+                и принадлежит этому экземпляру.
+            tokens (TokenPool | None): Пул учётных данных; по умолчанию — из настроек
+                (MY_GITHUB_TOKEN, GITHUB_TOKENS, установки GitHub App).
+        """
+        self.base_url = GITHUB_API_URL
+        # Authorization подставляется при отправке: токен выбирается из пула
+        self.headers: dict[str, str] = {}
+        self.tokens = tokens or token_pool_from_config()
+        self._owns_http_client = http_client is None
+        self._http = http_client or create_http_client()
+        self._owns_shared_cache = shared_cache is None and bool(SHARED_CACHE_PATH)
+        if self._owns_shared_cache:
+            shared_cache = SQLiteSharedCache(
+                SHARED_CACHE_PATH,
+                ttl=SHARED_CACHE_TTL,
+                batch_size=SHARED_CACHE_BATCH_SIZE,
+                flush_interval=SHARED_CACHE_FLUSH_INTERVAL,
+                poll_interval=SHARED_CACHE_POLL_INTERVAL,
+            )
+        self.shared_cache = shared_cache
+        self.cache = cache or ResponseCache(GITHUB_CACHE_MAX_ENTRIES, GITHUB_CACHE_MAX_BYTES, backend=shared_cache)
+        self.repo_metadata = repo_metadata or RepoMetadataCache(GITHUB_REPO_METADATA_TTL, backend=shared_cache)
+        self.blob_shas = blob_shas or BlobShaIndex(GITHUB_BLOB_INDEX_MAX_ENTRIES)
+        self._indexed_trees: dict[str, str] = {}
+        self.scheduler = scheduler or RateLimitScheduler(
+            burst=GITHUB_RATE_LIMIT_BURST,
+            pacing_threshold=GITHUB_RATE_LIMIT_PACING_THRESHOLD,
+            bulk_reserve=GITHUB_RATE_LIMIT_BULK_RESERVE,
+            secondary_pause=GITHUB_SECONDARY_LIMIT_PAUSE,
+            mutation_interval=GITHUB_MUTATION_INTERVAL,
+        )
+        self.flights = SingleFlight()
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_attempts=GITHUB_RETRY_MAX_ATTEMPTS,
+            base_delay=GITHUB_RETRY_BASE_DELAY,
+            max_delay=GITHUB_RETRY_MAX_DELAY,
+            deadline=GITHUB_RETRY_DEADLINE,
+        )
+        self.breakers: dict[str, CircuitBreaker] = {}
+        if trust_ttl is None:
+            trust_ttl = GITHUB_WEBHOOK_TRUST_TTL if GITHUB_WEBHOOK_SECRET else 0.0
+        self.trust_ttl = trust_ttl
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.bind_client(self)
+
+    async def aclose(self) -> None:
+        """
+        Закрытие HTTP-клиента и общего кэша, если они были созданы этим экземпляром.
+        """
+        if self._owns_http_client:
+            await self._http.aclose()
+        if self._owns_shared_cache:
+            self.shared_cache.close()
+
+    def _repo_url(self, repo: str) -> str:
+        """
+        Базовый URL репозитория в GitHub API.
+
+        Args:
+            repo (str): Имя репозитория ("repo" у MY_GITHUB_USERNAME или "owner/repo").
+
+        Returns:
+            str: URL вида https://api.github.com/repos/{owner}/{repo}.
+        """
+        owner, name = self._owner_and_name(repo)
+        return f"{self.base_url}/repos/{owner}/{name}"
+
+    @staticmethod
+    def _owner_and_name(repo: str) -> tuple[str, str]:
+        owner, _, name = repo.rpartition("/")
+        return owner or MY_GITHUB_USERNAME, name
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        *,
+        mutation_repo: str | None = None,
+        retry_safe: bool = False,
+        stream: bool = False,
+        owner: str | None = None,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Отправка запроса к GitHub через планировщик лимитов и политику повторов.
+
+        Все обращения к API идут через этот метод: перед отправкой запрос
+        ждёт разрешения планировщика, после — заголовки лимитов ответа
+        обновляют его состояние. Изменяющие запросы в один репозиторий
+        выполняются последовательно. GET-запросы, а также записи, которые
+        безопасно повторить (retry_safe), повторяются при сетевых ошибках и 5xx.
+
+        Args:
+            method (str): HTTP-метод.
+            url (str): Полный URL.
+            mutation_repo (str | None): Репозиторий, который изменяет запрос.
+            retry_safe (bool): Запись защищена предусловием SHA или идемпотентна.
+            stream (bool): Не читать тело ответа (вызывающий обязан закрыть ответ).
+            owner (str | None): Владелец репозитория для выбора учётных данных, если
+                его нет в URL (GraphQL).
+            **kwargs: Параметры httpx.AsyncClient.build_request (headers, json, params).
+
+        Returns:
+            httpx.Response: Ответ GitHub (статус не проверяется).
+
+        Raises:
+            UpstreamUnavailableError: GitHub недоступен или разомкнут предохранитель.
+        """
+        request = self._http.build_request(method, url, **kwargs)
+        retryable = method in ("GET", "HEAD") or retry_safe
+        if mutation_repo is None:
+            return await self._dispatch(request, stream, retryable, owner)
+        async with self.scheduler.mutation_lock(mutation_repo):
+            await self.scheduler.wait_mutation_interval(mutation_repo)
+            return await self._dispatch(request, stream, retryable, owner)
+
+    def _breaker(self, host: str) -> CircuitBreaker:
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            breaker = self.breakers[host] = CircuitBreaker(
+                GITHUB_BREAKER_FAILURE_THRESHOLD, GITHUB_BREAKER_RESET_TIMEOUT, GITHUB_BREAKER_PROBE_TIMEOUT
+            )
+        return breaker
+
+    @staticmethod
+    def _resource(path: str) -> str:
+        """
+        Ресурс лимита GitHub, который расходует запрос.
+        """
+        if path.endswith("/graphql"):
+            return "graphql"
+        if path.startswith("/search/"):
+            return "search"
+        return "core"
+
+    async def _dispatch(
+        self, request: httpx.Request, stream: bool, retryable: bool, owner: str | None = None
+    ) -> httpx.Response:
+        breaker = self._breaker(request.url.host)
+        resource = self._resource(request.url.path)
+        if owner is None:
+            owner_match = _REPO_OWNER.match(request.url.path)
+            owner = owner_match.group(1) if owner_match else None
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            if not breaker.allow():
+                raise UpstreamUnavailableError(f"GitHub ({request.url.host}) временно недоступен, запрос отклонён")
+            probe = breaker.state == breaker.HALF_OPEN
+
+            sent_at = time.perf_counter()
+            try:
+                with span("rate_limit_wait"):
+                    credential = await self.tokens.acquire(self.scheduler, resource, owner)
+                request.headers["Authorization"] = await credential.authorization(self._http)
+                self.retry_policy.attempts += 1
+                sent_at = time.perf_counter()
+                with span("upstream"):
+                    sending = self._http.send(request, stream=stream)
+                    # Зависший пробный запрос не должен держать предохранитель полуоткрытым
+                    response = await (asyncio.wait_for(sending, breaker.probe_timeout) if probe else sending)
+            except (httpx.TransportError, asyncio.TimeoutError) as e:
+                if self.metrics is not None:
+                    self.metrics.observe_upstream(
+                        request.method, request.url.path, "error", time.perf_counter() - sent_at, len(request.content), 0
+                    )
+                breaker.record_failure()
+                delay = self.retry_policy.next_delay(attempt, started) if retryable else None
+                if delay is None:
+                    raise UpstreamUnavailableError(f"GitHub недоступен: {e!r}") from e
+                with span("retry_backoff"):
+                    await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Отмена или ошибка до ответа: результата нет, слот пробного запроса освобождается
+                if probe:
+                    breaker.release()
+                raise
+
+            if self.metrics is not None:
+                # Для потоковых ответов тело ещё не прочитано: берём Content-Length
+                received = int(response.headers.get("Content-Length", 0)) if stream else len(response.content)
+                self.metrics.observe_upstream(
+                    request.method, request.url.path, response.status_code,
+                    time.perf_counter() - sent_at, len(request.content), received,
+                )
+
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+            message = ""
+            if response.status_code in (403, 429):
+                await response.aread()
+                message = response.text
+            self.scheduler.update(response.headers, response.status_code, message, credential=credential.name)
+            if response.status_code == 401:
+                credential.invalidate()
+
+            if retryable and response.status_code in self.retry_policy.retry_statuses:
+                delay = self.retry_policy.next_delay(attempt, started)
+                if delay is not None:
+                    await response.aclose()
+                    with span("retry_backoff"):
+                        await asyncio.sleep(delay)
+                    continue
+            return response
+
+    async def _get_json(self, url: str) -> dict:
+        """
+        GET-запрос с ревалидацией по ETag / Last-Modified.
+
+        Если для URL есть закэшированный ответ, запрос отправляется условным;
+        ответ 304 не расходует лимит GitHub, и тело берётся из кэша. Свежие
+        записи (неизменяемые SHA-адреса, содержимое под защитой вебхука)
+        отдаются вовсе без запроса.
+        Одновременные одинаковые запросы (метод и URL; токены пула
+        равноправны) объединяются в один запрос к GitHub.
+
+        Args:
+            url (str): Полный URL запроса.
+
+        Returns:
+            dict: Разобранное JSON-тело ответа (общее для объединённых вызовов — не изменять).
+
+        Raises:
+            httpx.HTTPStatusError: Если GitHub вернул ошибку.
+        """
+        cached = await self.cache.load(url)
+        if cached is not None and cached.fresh_until > time.monotonic():
+            self.cache.hits += 1
+            return cached.body
+        key = ("GET", url)
+        return await self.flights.do(key, lambda: self._fetch_json(url))
+
+    async def _fetch_json(self, url: str) -> dict:
+        cached = await self.cache.load(url)
+        headers = self.headers
+        if cached is not None:
+            headers = dict(self.headers)
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+            self.cache.revalidations += 1
+
+        response = await self._send("GET", url, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            self.cache.hits += 1
+            return cached.body
+
+        response.raise_for_status()
+        self.cache.misses += 1
+        with span("json_parse"):
+            body = response.json()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self.cache.set(url, CachedResponse(etag, last_modified, body, len(response.content), self._fresh_until(url)))
+        return body
+
+    def _fresh_until(self, url: str) -> float:
+        """
+        До какого момента ответ по URL можно отдавать без ревалидации.
+
+        Ответы по полному SHA неизменяемы. Деревья веток и содержимое
+        считаются свежими trust_ttl секунд: push-вебхук и собственные записи
+        сервиса инвалидируют их раньше. Ссылки на ветки всегда ревалидируются —
+        от них зависит fast-forward при коммите.
+        """
+        if _IMMUTABLE_URL.search(url):
+            return math.inf
+        if self.trust_ttl > 0 and ("/contents/" in url or "/git/trees/" in url):
+            return time.monotonic() + self.trust_ttl
+        return 0.0
+
+    def _invalidate_path(self, repo: str, path: str) -> None:
+        """
+        Сброс кэша содержимого файла ветки по умолчанию, листингов всех
+        его родительских папок (в них меняется SHA поддерева) и SHA в индексе.
         """
-        self.base_url = "https://api.github.com"
-        self.headers = {"Authorization": f"Bearer {MY_GITHUB_TOKEN}"}
+        contents = f"{self._repo_url(repo)}/contents/"
+        self.cache.invalidate(contents + path)
+        parts = path.split("/")
+        for depth in range(len(parts)):
+            self.cache.invalidate(contents + "/".join(parts[:depth]))
+        self.blob_shas.invalidate(repo, path)
+
+    def _invalidate_branch(self, repo: str, branch: str | None) -> None:
+        """
+        Сброс кэша дерева и ссылки ветки. Если ветка неизвестна (мета-информация
+        устарела), сбрасываются деревья всех веток репозитория.
+        """
+        if branch is None:
+            self.cache.invalidate_prefix(f"{self._repo_url(repo)}/git/trees/")
+            self.cache.invalidate_prefix(f"{self._repo_url(repo)}/git/ref/heads/")
+            return
+        self.cache.invalidate(self._tree_url(repo, branch))
+        self.cache.invalidate(f"{self._repo_url(repo)}/git/ref/heads/{branch}")
+
+    def _apply_write(self, repo: str, path: str, result: dict, encoded: str | None = None) -> None:
+        """
+        Обновление кэшей после записи файла через contents API, чтобы чтение
+        после записи не требовало запросов к GitHub.
+
+        Args:
+            repo (str): Имя репозитория.
+            path (str): Полный путь к файлу.
+            result (dict): Ответ GitHub на запись.
+            encoded (str | None): Новое содержимое в base64; None — файл удалён.
+        """
+        self._remember_commit(repo, result)
+        cached = self.repo_metadata.get(repo)
+        self._invalidate_branch(repo, cached.default_branch if cached else None)
+        self._invalidate_path(repo, path)
+        info = result.get("content")
+        if encoded is None or not info:
+            return
+        self.blob_shas.set(repo, path, info["sha"])
+        if self.trust_ttl > 0:
+            body = {**info, "encoding": "base64", "content": encoded}
+            self.cache.set(
+                f"{self._repo_url(repo)}/contents/{path}",
+                CachedResponse(None, None, body, len(encoded), time.monotonic() + self.trust_ttl),
+            )
+
+    def apply_push(
+        self,
+        repo: str,
+        branch: str,
+        head_sha: str | None,
+        paths: set[str] | None,
+        default_branch: str | None = None,
+    ) -> None:
+        """
+        Инвалидация кэшей по push-событию.
+
+        Всегда сбрасываются дерево и ссылка ветки. Для ветки по умолчанию
+        дополнительно сбрасывается содержимое изменённых путей (или всё
+        содержимое репозитория, если список путей неполон) и обновляется head SHA.
+
+        Args:
+            repo (str): Имя репозитория.
+            branch (str): Ветка, в которую пришёл push.
+            head_sha (str | None): Новый головной коммит (None — ветка удалена).
+            paths (set[str] | None): Изменённые пути; None — список неизвестен.
+            default_branch (str | None): Ветка по умолчанию из события, если передана.
+        """
+        self._invalidate_branch(repo, branch)
+        cached = self.repo_metadata.get(repo)
+        if cached is not None and default_branch and cached.default_branch != default_branch:
+            # Ветку по умолчанию сменили: всё содержимое без ref теперь из другой ветки
+            self.repo_metadata.invalidate(repo)
+            self.cache.invalidate(self._repo_url(repo))
+            cached, paths = None, None
+        if branch != (default_branch or (cached.default_branch if cached else branch)):
+            return
+
+        if cached is not None and head_sha:
+            self.repo_metadata.update_head(repo, head_sha)
+        if paths is None:
+            self.cache.invalidate_prefix(f"{self._repo_url(repo)}/contents/")
+            self.blob_shas.invalidate_repo(repo)
+            return
+        for path in paths:
+            self._invalidate_path(repo, path)
 
     async def get_repo_info(self, repo: str) -> dict:
         """
         Получение мета-информации о репозитории (включая default_branch).
 
+        Попутно обновляет кэш мета-информации репозитория.
+
         Args:
             repo (str): Имя репозитория.
 
         Returns:
             dict: Полная информация о репозитории.
         """
-        url = f"{self.base_url}/repos/{MY_GITHUB_USERNAME}/{repo}"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers)
-        response.raise_for_status()
-        return response.json()
+        info = await self._get_json(self._repo_url(repo))
+        cached = self.repo_metadata.get(repo)
+        head_sha = cached.head_sha if cached and cached.default_branch == info.get("default_branch") else None
+        self.repo_metadata.set(repo, info.get("default_branch", "main"), head_sha)
+        return info
+
+    async def get_default_branch(self, repo: str) -> str:
+        """
+        Ветка по умолчанию из кэша; запрос к GitHub — только если записи нет или она устарела.
+
+        Args:
+            repo (str): Имя репозитория.
+
+        Returns:
+            str: Имя ветки по умолчанию.
+        """
+        cached = self.repo_metadata.get(repo)
+        if cached is not None:
+            return cached.default_branch
+        info = await self.get_repo_info(repo)
+        return info.get("default_branch", "main")
+
+    async def get_tree(self, repo: str, ref: str | None = None) -> dict:
+        """
+        Получение рекурсивного дерева репозитория вместе с его SHA.
+
+        Если ref не передан, используется закэшированная ветка по умолчанию.
+        При 404 на закэшированной ветке (например, её переименовали) ветка
+        один раз переопределяется запросом к GitHub, и запрос повторяется.
 
-    async def list_repo_tree(self, repo: str) -> list:
+        Args:
+            repo (str): Имя репозитория.
+            ref (str | None): Ветка, тег или SHA; если задан, ветка по умолчанию не запрашивается.
+
+        Returns:
+            dict: Ответ trees API: sha, tree (список узлов), truncated.
+        """
+        if ref is not None:
+            return await self._get_json(self._tree_url(repo, ref))
+
+        branch = await self.get_default_branch(repo)
+        try:
+            data = await self._get_json(self._tree_url(repo, branch))
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code != 404:
+                raise
+            self.repo_metadata.invalidate(repo)
+            fresh_branch = await self.get_default_branch(repo)
+            if fresh_branch == branch:
+                raise
+            data = await self._get_json(self._tree_url(repo, fresh_branch))
+
+        # Индексируем SHA блобов только при смене дерева, а не на каждый опрос
+        if self._indexed_trees.get(repo) != data.get("sha"):
+            self.blob_shas.update_from_tree(repo, data.get("tree", []))
+            self._indexed_trees[repo] = data.get("sha")
+        return data
+
+    async def list_repo_tree(self, repo: str, ref: str | None = None) -> list:
         """
         Получение полного дерева файлов и папок репозитория рекурсивно.
 
         Args:
             repo (str): Имя репозитория.
+            ref (str | None): Ветка, тег или SHA; по умолчанию — ветка по умолчанию.
 
         Returns:
             list: Список узлов дерева (type="blob" для файлов, "tree" для папок).
         """
-        # Узнаём default_branch, чтобы обойти все ветки
-        repo_info = await self.get_repo_info(repo)
-        branch = repo_info.get("default_branch", "main")
-
-        url = (
-            f"{self.base_url}/repos/"
-            f"{MY_GITHUB_USERNAME}/{repo}/git/trees/{branch}"
-            "?recursive=1"
-        )
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers)
-        response.raise_for_status()
-        data = response.json()
+        data = await self.get_tree(repo, ref=ref)
         return data.get("tree", [])
 
+    def _remember_commit(self, repo: str, result: dict) -> None:
+        """
+        Запоминание SHA коммита, созданного записью через contents API.
+        """
+        commit_sha = (result.get("commit") or {}).get("sha")
+        if commit_sha:
+            self.repo_metadata.update_head(repo, commit_sha)
+
+    def _tree_url(self, repo: str, ref: str) -> str:
+        """
+        URL рекурсивного дерева для ветки, тега или SHA.
+        """
+        return f"{self._repo_url(repo)}/git/trees/{ref}?recursive=1"
+
     async def get_file_content(self, repo: str, path: str) -> dict:
         """
         Получение содержимого файла из репозитория.
@@ -69,9 +591,83 @@ class GitHubClient:
         Returns:
             dict: JSON с base64-контентом, SHA и прочими метаданными.
         """
-        url = f"{self.base_url}/repos/{MY_GITHUB_USERNAME}/{repo}/contents/{path}"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers)
+        data = await self._get_json(f"{self._repo_url(repo)}/contents/{path}")
+        if isinstance(data, dict) and data.get("type") == "file" and data.get("sha"):
+            self.blob_shas.set(repo, path, data["sha"])
+        return data
+
+    def fresh_blob_sha(self, repo: str, path: str) -> str | None:
+        """
+        SHA блоба по пути из индекса, если индексу можно верить без запроса.
+
+        Индекс точен, только пока его поддерживают push-вебхуки (trust_ttl > 0);
+        иначе возвращается None, и актуальный SHA нужно получить у GitHub.
+        """
+        if self.trust_ttl <= 0:
+            return None
+        return self.blob_shas.get(repo, path)
+
+    async def _fetch_blob_sha(self, repo: str, path: str) -> str:
+        """
+        Получение актуального SHA файла без загрузки его содержимого.
+
+        Запрашивается листинг родительской папки (только метаданные записей);
+        SHA соседних файлов попутно попадают в индекс. Если файла в листинге
+        нет, выполняется обычный запрос содержимого, который вернёт 404.
+
+        Args:
+            repo (str): Имя репозитория.
+            path (str): Путь к файлу.
+
+        Returns:
+            str: SHA блоба.
+        """
+        parent = path.rsplit("/", 1)[0] if "/" in path else ""
+        listing = await self._get_json(f"{self._repo_url(repo)}/contents/{parent}")
+        if isinstance(listing, list):
+            for entry in listing:
+                if entry.get("type") == "file" and entry.get("sha"):
+                    self.blob_shas.set(repo, entry["path"], entry["sha"])
+        sha = self.blob_shas.get(repo, path)
+        if sha is None:
+            existing = await self.get_file_content(repo, path)
+            sha = existing["sha"]
+        return sha
+
+    async def _write_with_sha(self, method: str, repo: str, path: str, payload: dict) -> dict:
+        """
+        Запись (PUT/DELETE) существующего файла с оптимистичным SHA из индекса.
+
+        Если SHA известен, он отправляется сразу; при конфликте (409/422)
+        SHA переполучается и запрос повторяется один раз. Если SHA неизвестен,
+        он запрашивается до записи.
+
+        Args:
+            method (str): HTTP-метод ("PUT" или "DELETE").
+            repo (str): Имя репозитория.
+            path (str): Полный путь к файлу.
+            payload (dict): Тело запроса без поля sha.
+
+        Returns:
+            dict: Ответ GitHub API.
+        """
+        url = f"{self._repo_url(repo)}/contents/{path}"
+        sha = self.blob_shas.get(repo, path)
+        optimistic = sha is not None
+        if not optimistic:
+            sha = await self._fetch_blob_sha(repo, path)
+
+        response = await self._send(
+            method, url, json={**payload, "sha": sha}, headers=self.headers, mutation_repo=repo, retry_safe=True
+        )
+        if optimistic and response.status_code in (409, 422):
+            # Листинг папки мог быть закэшированным как свежий (trust_ttl): сбрасываем и его
+            self._invalidate_path(repo, path)
+            sha = await self._fetch_blob_sha(repo, path)
+            response = await self._send(
+                method, url, json={**payload, "sha": sha}, headers=self.headers, mutation_repo=repo, retry_safe=True
+            )
+
         response.raise_for_status()
         return response.json()
 
@@ -91,13 +687,14 @@ class GitHubClient:
         """
         encoded_content = base64.b64encode(content.encode("utf-8")).decode("ascii")
         url_path = f"{path.rstrip('/')}/{filename}" if path else filename
-        url = f"{self.base_url}/repos/{MY_GITHUB_USERNAME}/{repo}/contents/{url_path}"
+        url = f"{self._repo_url(repo)}/contents/{url_path}"
         payload = {"message": message, "content": encoded_content}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.put(url, json=payload, headers=self.headers)
+        response = await self._send("PUT", url, json=payload, headers=self.headers, mutation_repo=repo)
         response.raise_for_status()
-        return response.json()
+        result = response.json()
+        self._apply_write(repo, url_path, result, encoded_content)
+        return result
 
     async def update_file(self, repo: str, path: str, filename: str, content: str, message: str) -> dict:
         """
@@ -114,16 +711,12 @@ class GitHubClient:
             dict: Ответ GitHub API.
         """
         url_path = f"{path.rstrip('/')}/{filename}" if path else filename
-        existing = await self.get_file_content(repo, url_path)
-        sha = existing["sha"]
         encoded = base64.b64encode(content.encode("utf-8")).decode("ascii")
-        url = f"{self.base_url}/repos/{MY_GITHUB_USERNAME}/{repo}/contents/{url_path}"
-        payload = {"message": message, "content": encoded, "sha": sha}
+        payload = {"message": message, "content": encoded}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.put(url, json=payload, headers=self.headers)
-        response.raise_for_status()
-        return response.json()
+        result = await self._write_with_sha("PUT", repo, url_path, payload)
+        self._apply_write(repo, url_path, result, encoded)
+        return result
 
     async def delete_file(self, repo: str, path: str, filename: str, message: str) -> dict:
         """
@@ -139,12 +732,301 @@ class GitHubClient:
             dict: Ответ GitHub API.
         """
         url_path = f"{path.rstrip('/')}/{filename}" if path else filename
-        existing = await self.get_file_content(repo, url_path)
-        sha = existing["sha"]
-        url = f"{self.base_url}/repos/{MY_GITHUB_USERNAME}/{repo}/contents/{url_path}"
-        payload = {"message": message, "sha": sha}
+        payload = {"message": message}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.request("DELETE", url, json=payload, headers=self.headers)
+        result = await self._write_with_sha("DELETE", repo, url_path, payload)
+        self._apply_write(repo, url_path, result)
+        return result
+
+    async def get_ref_sha(self, repo: str, branch: str) -> str:
+        """
+        SHA коммита, на который указывает ветка.
+
+        Args:
+            repo (str): Имя репозитория.
+            branch (str): Имя ветки.
+
+        Returns:
+            str: SHA головного коммита ветки.
+        """
+        data = await self._get_json(f"{self._repo_url(repo)}/git/ref/heads/{branch}")
+        return data["object"]["sha"]
+
+    async def get_commit_tree_sha(self, repo: str, commit_sha: str) -> str:
+        """
+        SHA корневого дерева коммита.
+
+        Args:
+            repo (str): Имя репозитория.
+            commit_sha (str): SHA коммита.
+
+        Returns:
+            str: SHA дерева.
+        """
+        data = await self._get_json(f"{self._repo_url(repo)}/git/commits/{commit_sha}")
+        return data["tree"]["sha"]
+
+    async def get_blob(self, repo: str, sha: str) -> bytes:
+        """
+        Содержимое блоба по SHA (media type vnd.github.raw, без base64).
+
+        Блобы неизменяемы и не кэшируются здесь: их хранят вызывающие.
+
+        Args:
+            repo (str): Имя репозитория.
+            sha (str): SHA блоба.
+
+        Returns:
+            bytes: Содержимое блоба.
+        """
+        headers = {**self.headers, "Accept": "application/vnd.github.raw"}
+        response = await self._send("GET", f"{self._repo_url(repo)}/git/blobs/{sha}", headers=headers)
         response.raise_for_status()
-        return response.json()
+        return response.content
+
+    async def get_blobs_graphql(self, repo: str, expressions: list[str]) -> list[dict | None]:
+        """
+        Несколько блобов одним запросом к GraphQL API.
+
+        Вызывающий сам ограничивает число выражений и суммарный размер
+        блобов: от них зависят стоимость и время выполнения запроса.
+
+        Args:
+            repo (str): Имя репозитория.
+            expressions (list[str]): Выражения вида "ref:path".
+
+        Returns:
+            list[dict | None]: Для каждого выражения — oid, byteSize, isBinary,
+                isTruncated и text, или None, если объекта нет или это не файл.
+
+        Raises:
+            GraphQLError: GitHub вернул ошибки вместо данных репозитория.
+            httpx.HTTPStatusError: Если GitHub вернул ошибку HTTP.
+        """
+        owner, name = self._owner_and_name(repo)
+        variables = {"owner": owner, "name": name}
+        declarations = ["$owner: String!", "$name: String!"]
+        fields = []
+        for i, expression in enumerate(expressions):
+            variables[f"e{i}"] = expression
+            declarations.append(f"$e{i}: String!")
+            fields.append(f"f{i}: object(expression: $e{i}) {{ ... on Blob {{ oid byteSize isBinary isTruncated text }} }}")
+        query = f"query({', '.join(declarations)}) {{ repository(owner: $owner, name: $name) {{ {' '.join(fields)} }} }}"
+
+        # Запрос только читает данные, поэтому его безопасно повторять
+        response = await self._send(
+            "POST", GITHUB_GRAPHQL_URL, json={"query": query, "variables": variables},
+            headers=self.headers, retry_safe=True, owner=owner,
+        )
+        response.raise_for_status()
+        with span("json_parse"):
+            body = response.json()
+        repository = (body.get("data") or {}).get("repository")
+        if repository is None:
+            messages = "; ".join(error.get("message", "") for error in body.get("errors") or [])
+            raise GraphQLError(f"GitHub GraphQL error: {messages or 'репозиторий не найден'}")
+        # Объект без полей Blob (папка, подмодуль) приходит пустым
+        return [repository.get(f"f{i}") or None for i in range(len(expressions))]
+
+    async def create_blob(self, repo: str, content: str) -> str:
+        """
+        Создание блоба из текстового содержимого.
+
+        Args:
+            repo (str): Имя репозитория.
+            content (str): Текстовое содержимое (UTF-8).
+
+        Returns:
+            str: SHA созданного блоба.
+        """
+        encoded = base64.b64encode(content.encode("utf-8")).decode("ascii")
+        payload = {"content": encoded, "encoding": "base64"}
+        # Объекты git адресуются содержимым: повтор создаст тот же объект
+        response = await self._send(
+            "POST",
+            f"{self._repo_url(repo)}/git/blobs",
+            json=payload,
+            headers=self.headers,
+            mutation_repo=repo,
+            retry_safe=True,
+        )
+        response.raise_for_status()
+        return response.json()["sha"]
+
+    async def create_tree(self, repo: str, base_tree: str, entries: list[dict]) -> str:
+        """
+        Создание дерева поверх базового.
+
+        Args:
+            repo (str): Имя репозитория.
+            base_tree (str): SHA базового дерева.
+            entries (list[dict]): Изменённые узлы (sha=None удаляет путь).
+
+        Returns:
+            str: SHA нового дерева.
+        """
+        payload = {"base_tree": base_tree, "tree": entries}
+        # Объекты git адресуются содержимым: повтор создаст тот же объект
+        response = await self._send(
+            "POST",
+            f"{self._repo_url(repo)}/git/trees",
+            json=payload,
+            headers=self.headers,
+            mutation_repo=repo,
+            retry_safe=True,
+        )
+        response.raise_for_status()
+        return response.json()["sha"]
+
+    async def create_commit(self, repo: str, message: str, tree_sha: str, parents: list[str]) -> str:
+        """
+        Создание коммита.
+
+        Args:
+            repo (str): Имя репозитория.
+            message (str): Сообщение коммита.
+            tree_sha (str): SHA дерева коммита.
+            parents (list[str]): SHA родительских коммитов.
+
+        Returns:
+            str: SHA нового коммита.
+        """
+        payload = {"message": message, "tree": tree_sha, "parents": parents}
+        response = await self._send(
+            "POST", f"{self._repo_url(repo)}/git/commits", json=payload, headers=self.headers, mutation_repo=repo
+        )
+        response.raise_for_status()
+        return response.json()["sha"]
+
+    async def update_ref(self, repo: str, branch: str, commit_sha: str) -> None:
+        """
+        Перемотка ветки на коммит (только fast-forward).
+
+        Args:
+            repo (str): Имя репозитория.
+            branch (str): Имя ветки.
+            commit_sha (str): SHA нового головного коммита.
+
+        Raises:
+            httpx.HTTPStatusError: 422, если ветка ушла вперёд и перемотка невозможна.
+        """
+        payload = {"sha": commit_sha, "force": False}
+        response = await self._send(
+            "PATCH",
+            f"{self._repo_url(repo)}/git/refs/heads/{branch}",
+            json=payload,
+            headers=self.headers,
+            mutation_repo=repo,
+        )
+        response.raise_for_status()
+        cached = self.repo_metadata.get(repo)
+        if cached is not None and cached.default_branch == branch:
+            self.repo_metadata.update_head(repo, commit_sha)
+
+    def record_blob_shas(
+        self,
+        repo: str,
+        branch: str,
+        changes: dict[str, str | None],
+        default_branch: str | None = None,
+    ) -> None:
+        """
+        Обновление кэшей и индекса path → blob SHA после коммита в ветку.
+
+        Дерево и ссылка ветки сбрасываются всегда; содержимое и индекс
+        описывают только ветку по умолчанию, поэтому коммиты в другие ветки
+        их не меняют. Запросов к GitHub не выполняется: если ветка по
+        умолчанию неизвестна, кэш содержимого путей сбрасывается, но новые
+        SHA в индекс не записываются.
+
+        Args:
+            repo (str): Имя репозитория.
+            branch (str): Ветка, в которую сделан коммит.
+            changes (dict[str, str | None]): Путь → новый SHA (None — файл удалён).
+            default_branch (str | None): Ветка по умолчанию, если уже известна;
+                иначе берётся из кэша мета-информации.
+        """
+        self._invalidate_branch(repo, branch)
+        if default_branch is None:
+            cached = self.repo_metadata.get(repo)
+            default_branch = cached.default_branch if cached is not None else None
+        if default_branch is not None and branch != default_branch:
+            return
+        for path, sha in changes.items():
+            self._invalidate_path(repo, path)
+            if sha is not None and default_branch is not None:
+                self.blob_shas.set(repo, path, sha)
+
+    async def open_raw_stream(
+        self,
+        repo: str,
+        path: str,
+        ref: str | None = None,
+        if_none_match: str | None = None
+    ) -> httpx.Response:
+        """
+        Открытие потока с «сырым» содержимым файла (media type vnd.github.raw).
+
+        Тело не читается: вызывающий код обязан итерировать его и закрыть ответ
+        (response.aclose()). Работает и для бинарных файлов, и для файлов
+        больше 1 МБ, для которых contents API не отдаёт содержимое в JSON.
+
+        Args:
+            repo (str): Имя репозитория.
+            path (str): Путь к файлу.
+            ref (str | None): Ветка, тег или SHA.
+            if_none_match (str | None): ETag клиента для условного запроса.
+
+        Returns:
+            httpx.Response: Открытый потоковый ответ (200 или 304).
+
+        Raises:
+            httpx.HTTPStatusError: Если GitHub вернул ошибку.
+        """
+        headers = {**self.headers, "Accept": "application/vnd.github.raw"}
+        if if_none_match:
+            headers["If-None-Match"] = if_none_match
+        params = {"ref": ref} if ref else None
+        response = await self._send(
+            "GET", f"{self._repo_url(repo)}/contents/{path}", headers=headers, params=params, stream=True
+        )
+        if response.is_error:
+            await response.aread()
+            await response.aclose()
+            response.raise_for_status()
+        return response
+
+    async def open_archive_stream(self, repo: str, ref: str | None = None) -> httpx.Response:
+        """
+        Открытие потока с архивом репозитория (tar.gz).
+
+        GitHub отвечает редиректом на codeload с одноразовой ссылкой: она
+        не требует авторизации и не расходует лимит API, поэтому запрос по
+        ней идёт мимо планировщика. Тело не читается: вызывающий код обязан
+        итерировать его и закрыть ответ.
+
+        Args:
+            repo (str): Имя репозитория.
+            ref (str | None): Ветка, тег или SHA; по умолчанию ветка по умолчанию.
+
+        Returns:
+            httpx.Response: Открытый потоковый ответ с архивом.
+
+        Raises:
+            httpx.HTTPStatusError: Если GitHub вернул ошибку.
+            UpstreamUnavailableError: GitHub недоступен.
+        """
+        url = f"{self._repo_url(repo)}/tarball" + (f"/{ref}" if ref else "")
+        response = await self._send("GET", url, headers=self.headers, stream=True)
+        if response.is_redirect and "Location" in response.headers:
+            location = response.headers["Location"]
+            await response.aclose()
+            try:
+                response = await self._http.send(self._http.build_request("GET", location), stream=True)
+            except httpx.TransportError as e:
+                raise UpstreamUnavailableError(f"GitHub недоступен: {e!r}") from e
+        if response.is_error:
+            await response.aread()
+            await response.aclose()
+            response.raise_for_status()
+        return response
@@ -0,0 +1,69 @@
+# app/infrastructure/http_client.py
+
+import importlib.util
+import logging
+
+import httpx
+
+from app.core.config import (
+    GITHUB_HTTP2,
+    GITHUB_HTTP_KEEPALIVE_EXPIRY,
+    GITHUB_HTTP_MAX_CONNECTIONS,
+    GITHUB_HTTP_MAX_KEEPALIVE,
+    GITHUB_TIMEOUT_CONNECT,
+    GITHUB_TIMEOUT_POOL,
+    GITHUB_TIMEOUT_READ,
+    GITHUB_TIMEOUT_WRITE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def http2_available() -> bool:
+    """
+    Проверка, установлен ли пакет h2, необходимый httpx для HTTP/2.
+
+    Returns:
+        bool: True, если HTTP/2 можно включить.
+    """
+    return importlib.util.find_spec("h2") is not None
+
+
+def create_http_client(transport: httpx.AsyncBaseTransport | None = None) -> httpx.AsyncClient:
+    """
+    Создание долгоживущего HTTP-клиента для обращений к GitHub API.
+
+    Клиент держит пул keep-alive соединений, поэтому TCP+TLS рукопожатие
+    выполняется один раз на соединение, а не на каждый запрос. HTTP/2
+    включается, только если он разрешён в конфигурации и установлен h2.
+
+    Args:
+        transport (httpx.AsyncBaseTransport | None): Альтернативный транспорт
+            (используется в тестах и бенчмарках).
+
+    Returns:
+        httpx.AsyncClient: Настроенный асинхронный клиент.
+    """
+    limits = httpx.Limits(
+        max_connections=GITHUB_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=GITHUB_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=GITHUB_HTTP_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(
+        connect=GITHUB_TIMEOUT_CONNECT,
+        read=GITHUB_TIMEOUT_READ,
+        write=GITHUB_TIMEOUT_WRITE,
+        pool=GITHUB_TIMEOUT_POOL,
+    )
+
+    http2 = GITHUB_HTTP2
+    if http2 and not http2_available():
+        logger.warning("GITHUB_HTTP2 включён, но пакет h2 не установлен — используется HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=timeout,
+        http2=http2,
+        transport=transport,
+    )
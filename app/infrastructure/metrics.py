@@ -0,0 +1,303 @@
+# app/infrastructure/metrics.py
+
+import re
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Шаблоны путей GitHub API: метки upstream-метрик не должны зависеть от имён
+# репозиториев, путей файлов и SHA, иначе число рядов растёт без ограничений
+_UPSTREAM_TEMPLATES = [
+    (re.compile(r"^/repos/[^/]+/[^/]+/contents(/.*)?$"), "/repos/{owner}/{repo}/contents/{path}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/git/trees/[^/]+$"), "/repos/{owner}/{repo}/git/trees/{sha}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/git/ref/heads/.+$"), "/repos/{owner}/{repo}/git/ref/heads/{branch}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/git/refs/heads/.+$"), "/repos/{owner}/{repo}/git/refs/heads/{branch}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/git/commits/[^/]+$"), "/repos/{owner}/{repo}/git/commits/{sha}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/git/blobs/[^/]+$"), "/repos/{owner}/{repo}/git/blobs/{sha}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/git/(blobs|trees|commits)$"), r"/repos/{owner}/{repo}/git/\1"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/tarball(/.*)?$"), "/repos/{owner}/{repo}/tarball/{ref}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+$"), "/repos/{owner}/{repo}"),
+    (re.compile(r"^(/api)?/graphql$"), "/graphql"),
+]
+
+
+def upstream_template(path: str) -> str:
+    """
+    Шаблон пути запроса к GitHub для меток метрик.
+    """
+    for pattern, template in _UPSTREAM_TEMPLATES:
+        match = pattern.match(path)
+        if match:
+            return match.expand(template) if "\\" in template else template
+    return "other"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """
+    Семейство рядов одной метрики: значения по кортежам меток.
+    """
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def _label_text(self, values: tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(self.labels, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def _samples(self) -> Iterable[str]:
+        for values, value in sorted(self._values.items()):
+            yield f"{self.name}{self._label_text(values)} {_format_value(value)}"
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+
+class Counter(_Metric):
+    """
+    Монотонно растущий счётчик.
+    """
+    kind = "counter"
+
+    def inc(self, labels: tuple[str, ...] = (), amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def set_total(self, labels: tuple[str, ...], value: float) -> None:
+        """
+        Значение счётчика, который уже ведётся в другом объекте (выставляется коллектором).
+        """
+        self._values[labels] = value
+
+
+class Gauge(_Metric):
+    """
+    Произвольно меняющееся значение.
+    """
+    kind = "gauge"
+
+    def set(self, labels: tuple[str, ...], value: float) -> None:
+        self._values[labels] = value
+
+    def inc(self, labels: tuple[str, ...] = (), amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, labels: tuple[str, ...] = (), amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+    def clear(self) -> None:
+        self._values.clear()
+
+
+class Histogram(_Metric):
+    """
+    Гистограмма с фиксированными границами корзин.
+
+    При наблюдении увеличивается одна корзина (поиск делением пополам);
+    накопленные значения считаются только при выдаче метрик.
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            # [счётчики корзин (последняя — +Inf), сумма, количество]
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def _samples(self) -> Iterable[str]:
+        bounds = self.buckets + (float("inf"),)
+        for values, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                label_text = self._label_text(values, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{label_text} {cumulative}"
+            yield f"{self.name}_sum{self._label_text(values)} {_format_value(total)}"
+            yield f"{self.name}_count{self._label_text(values)} {count}"
+
+
+class MetricsRegistry:
+    """
+    Реестр метрик с выдачей в текстовом формате Prometheus (0.0.4).
+
+    Коллекторы вызываются только при выдаче: значения, которые уже хранятся
+    в других объектах (кэш, планировщик), не дублируются на горячем пути.
+    """
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Метрика {metric.name} уже зарегистрирована")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """
+        Функция, обновляющая метрики непосредственно перед выдачей.
+        """
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Все метрики в текстовом формате Prometheus.
+        """
+        for collector in self._collectors:
+            collector()
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class Metrics:
+    """
+    Метрики сервиса: HTTP API, запросы к GitHub, кэш и лимиты.
+    """
+    def __init__(self, registry: MetricsRegistry | None = None):
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+        self.http_duration = r.histogram(
+            "http_request_duration_seconds", "Длительность обработки запросов к API", ("method", "route", "status")
+        )
+        self.http_in_flight = r.gauge(
+            "http_requests_in_flight", "Запросы к API в обработке", ("method", "route")
+        )
+        self.http_bytes = r.counter(
+            "http_bytes_total", "Байты тел запросов и ответов API", ("direction",)
+        )
+        self.upstream_requests = r.counter(
+            "github_requests_total", "Запросы к GitHub API", ("method", "endpoint", "status")
+        )
+        self.upstream_duration = r.histogram(
+            "github_request_duration_seconds", "Длительность запросов к GitHub API", ("method", "endpoint")
+        )
+        self.upstream_bytes = r.counter(
+            "github_bytes_total", "Байты тел запросов к GitHub и его ответов", ("direction",)
+        )
+        self.cache_events = r.counter(
+            "github_cache_events_total", "События кэша ответов GitHub: hits, misses, revalidations", ("event",)
+        )
+        self.cache_ratio = r.gauge(
+            "github_cache_ratio", "Доля запросов из кэша, обслуженных без тела (hit) и загруженных заново (miss)", ("kind",)
+        )
+        self.cache_size = r.gauge(
+            "github_cache_size", "Заполненность кэша ответов GitHub", ("unit",)
+        )
+        self.rate_limit_remaining = r.gauge(
+            "github_rate_limit_remaining", "Остаток лимита GitHub по ресурсу", ("resource",)
+        )
+        self.rate_limit_limit = r.gauge(
+            "github_rate_limit_limit", "Размер лимита GitHub по ресурсу", ("resource",)
+        )
+        self.rate_limit_reset = r.gauge(
+            "github_rate_limit_reset_timestamp_seconds", "Момент сброса лимита GitHub (Unix time)", ("resource",)
+        )
+        self.retry_events = r.counter(
+            "github_retry_events_total", "Попытки запросов к GitHub: attempts, retries, exhausted", ("event",)
+        )
+        self.breaker_state = r.gauge(
+            "github_circuit_breaker_state", "Состояние предохранителя хоста (1 — текущее)", ("host", "state")
+        )
+        self.breaker_failures = r.gauge(
+            "github_circuit_breaker_failures", "Неудачные попытки подряд по хосту", ("host",)
+        )
+        self.breaker_rejected = r.counter(
+            "github_circuit_breaker_rejected_total", "Запросы, отклонённые разомкнутым предохранителем", ("host",)
+        )
+        self._github_client = None
+        r.add_collector(self._collect_client)
+
+    def observe_upstream(self, method: str, path: str, status: int | str, elapsed: float, sent: int, received: int) -> None:
+        """
+        Учёт одной попытки запроса к GitHub.
+
+        Args:
+            method (str): HTTP-метод.
+            path (str): Путь запроса (приводится к шаблону).
+            status (int | str): HTTP-статус или "error" при сетевой ошибке.
+            elapsed (float): Длительность, с.
+            sent (int): Байты тела запроса.
+            received (int): Байты тела ответа (если известны).
+        """
+        endpoint = upstream_template(path)
+        self.upstream_requests.inc((method, endpoint, str(status)))
+        self.upstream_duration.observe((method, endpoint), elapsed)
+        if sent:
+            self.upstream_bytes.inc(("sent",), sent)
+        if received:
+            self.upstream_bytes.inc(("received",), received)
+
+    def bind_client(self, github_client) -> None:
+        """
+        Публикация состояния кэша и лимитов клиента GitHub вместе с метриками.
+
+        Args:
+            github_client (GitHubClient): Клиент, чьё состояние публикуется.
+        """
+        self._github_client = github_client
+
+    def _collect_client(self) -> None:
+        client = self._github_client
+        if client is None:
+            return
+        stats = client.cache.stats()
+        for event in ("hits", "misses", "revalidations"):
+            self.cache_events.set_total((event,), stats[event])
+        lookups = stats["hits"] + stats["misses"]
+        self.cache_ratio.set(("hit",), stats["hits"] / lookups if lookups else 0.0)
+        self.cache_ratio.set(("miss",), stats["misses"] / lookups if lookups else 0.0)
+        self.cache_size.set(("entries",), stats["entries"])
+        self.cache_size.set(("bytes",), stats["bytes"])
+
+        for event, value in client.retry_policy.snapshot().items():
+            self.retry_events.set_total((event,), value)
+        for host, breaker in client.breakers.items():
+            snapshot = breaker.snapshot()
+            for state in (breaker.CLOSED, breaker.OPEN, breaker.HALF_OPEN):
+                self.breaker_state.set((host, state), 1 if snapshot["state"] == state else 0)
+            self.breaker_failures.set((host,), snapshot["failures"])
+            self.breaker_rejected.set_total((host,), snapshot["rejected"])
+
+        for resource, budget in client.scheduler.snapshot()["resources"].items():
+            if budget["remaining"] is not None:
+                self.rate_limit_remaining.set((resource,), budget["remaining"])
+            if budget["limit"] is not None:
+                self.rate_limit_limit.set((resource,), budget["limit"])
+            if budget["reset_at"] is not None:
+                self.rate_limit_reset.set((resource,), budget["reset_at"])
@@ -0,0 +1,288 @@
+# app/infrastructure/rate_limiter.py
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Iterator, Mapping
+
+
+class Priority(IntEnum):
+    """
+    Приоритет запроса к GitHub: интерактивные чтения обслуживаются раньше фоновых.
+    """
+    INTERACTIVE = 0
+    BULK = 1
+
+
+# Приоритет запросов текущей задачи; наследуется задачами, созданными внутри
+current_priority: ContextVar[Priority] = ContextVar("current_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """
+    Установка приоритета для всех запросов к GitHub внутри блока.
+
+    Args:
+        priority (Priority): Приоритет запросов.
+    """
+    token = current_priority.set(priority)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+class _Budget:
+    """
+    Состояние лимита одного ресурса GitHub (core, graphql, search...) и
+    очередь запросов, которые его ждут.
+    """
+    __slots__ = ("limit", "remaining", "reset_at", "paused_until", "tokens", "refilled_at", "queue", "cond")
+
+    def __init__(self, burst: int):
+        self.limit: int | None = None
+        self.remaining: int | None = None
+        self.reset_at: float | None = None      # time.time() момента сброса лимита
+        self.paused_until: float = 0.0          # time.monotonic() окончания паузы
+        self.tokens: float = float(burst)
+        self.refilled_at: float = time.monotonic()
+        self.queue: list[tuple[int, int]] = []
+        self.cond = asyncio.Condition()
+
+
+class RateLimitScheduler:
+    """
+    Планировщик запросов к GitHub с учётом лимитов из заголовков ответов.
+
+    - Отслеживает X-RateLimit-Remaining / X-RateLimit-Reset по каждому ресурсу
+      (и по каждым учётным данным: у каждого токена свой лимит).
+    - Пока бюджет велик, не задерживает запросы; когда остаток опускается ниже
+      порога, равномерно распределяет его до момента сброса (token bucket).
+    - Фоновые (BULK) запросы останавливаются, когда остаток ниже резерва,
+      оставляя бюджет интерактивным; в очереди интерактивные идут первыми.
+    - Очередь у каждого бюджета своя: запросы, ждущие исчерпанный или
+      приостановленный бюджет, не задерживают другие ресурсы и токены.
+    - После 403/429 с Retry-After (вторичный лимит) приостанавливает запросы.
+    - Сериализует изменяющие запросы в пределах одного репозитория.
+    """
+    def __init__(
+        self,
+        burst: int = 20,
+        pacing_threshold: int = 1000,
+        bulk_reserve: int = 200,
+        secondary_pause: float = 60.0,
+        mutation_interval: float = 0.0,
+    ):
+        """
+        Args:
+            burst (int): Ёмкость token bucket (допустимый всплеск при пейсинге).
+            pacing_threshold (int): Остаток, ниже которого включается пейсинг.
+            bulk_reserve (int): Остаток, ниже которого фоновые запросы ждут сброса лимита.
+            secondary_pause (float): Пауза после вторичного лимита без Retry-After, с.
+            mutation_interval (float): Минимальный интервал между изменяющими запросами в репозиторий, с.
+        """
+        self.burst = burst
+        self.pacing_threshold = pacing_threshold
+        self.bulk_reserve = bulk_reserve
+        self.secondary_pause = secondary_pause
+        self.mutation_interval = mutation_interval
+        self._budgets: dict[str, _Budget] = {}
+        self._seq = itertools.count()
+        self._mutation_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+        self._last_mutation: dict[str, float] = {}
+        self.throttled = 0
+
+    @staticmethod
+    def _key(resource: str, credential: str) -> str:
+        return f"{resource}:{credential}" if credential else resource
+
+    def _budget(self, resource: str, credential: str = "") -> _Budget:
+        key = self._key(resource, credential)
+        budget = self._budgets.get(key)
+        if budget is None:
+            budget = self._budgets[key] = _Budget(self.burst)
+        return budget
+
+    def headroom(self, resource: str = "core", credential: str = "") -> float:
+        """
+        Оценка остатка бюджета для выбора учётных данных.
+
+        Args:
+            resource (str): Ресурс лимита GitHub.
+            credential (str): Метка учётных данных.
+
+        Returns:
+            float: Остаток; inf — неизвестен или лимит уже сброшен; -1 — запросы приостановлены.
+        """
+        budget = self._budgets.get(self._key(resource, credential))
+        if budget is None:
+            return math.inf
+        if budget.paused_until > time.monotonic():
+            return -1.0
+        if budget.remaining is None or (budget.reset_at is not None and budget.reset_at <= time.time()):
+            return math.inf
+        return float(budget.remaining)
+
+    def _delay(self, budget: _Budget, priority: Priority) -> float:
+        """
+        Сколько секунд нужно подождать перед запросом (0 — можно сразу).
+        """
+        now = time.monotonic()
+        if budget.paused_until > now:
+            return budget.paused_until - now
+        if budget.remaining is None or budget.reset_at is None:
+            return 0.0
+
+        until_reset = max(budget.reset_at - time.time(), 0.0)
+        if until_reset == 0.0:
+            return 0.0
+        if budget.remaining <= 0:
+            return until_reset
+        if priority == Priority.BULK and budget.remaining <= self.bulk_reserve:
+            return until_reset
+        if budget.remaining >= self.pacing_threshold:
+            return 0.0
+
+        # Пейсинг: остаток бюджета равномерно до момента сброса
+        rate = budget.remaining / until_reset
+        budget.tokens = min(self.burst, budget.tokens + (now - budget.refilled_at) * rate)
+        budget.refilled_at = now
+        if budget.tokens >= 1:
+            return 0.0
+        return (1 - budget.tokens) / rate
+
+    def _consume(self, budget: _Budget) -> None:
+        budget.tokens = max(budget.tokens - 1, 0.0)
+        if budget.remaining is not None:
+            # Оценка до прихода заголовков; ответ уточнит значение
+            budget.remaining = max(budget.remaining - 1, 0)
+
+    async def acquire(self, priority: Priority | None = None, resource: str = "core", credential: str = "") -> None:
+        """
+        Ожидание разрешения на запрос к GitHub.
+
+        Args:
+            priority (Priority | None): Приоритет; по умолчанию — из контекста задачи.
+            resource (str): Ресурс лимита GitHub ("core", "graphql", ...).
+            credential (str): Метка учётных данных, от имени которых идёт запрос.
+        """
+        priority = current_priority.get() if priority is None else priority
+        budget = self._budget(resource, credential)
+        if not budget.queue and self._delay(budget, priority) <= 0:
+            self._consume(budget)
+            return
+
+        queue = budget.queue
+        entry = (int(priority), next(self._seq))
+        async with budget.cond:
+            heapq.heappush(queue, entry)
+            try:
+                while True:
+                    if queue[0] == entry:
+                        delay = self._delay(budget, priority)
+                        if delay <= 0:
+                            heapq.heappop(queue)
+                            self._consume(budget)
+                            budget.cond.notify_all()
+                            return
+                        self.throttled += 1
+                        try:
+                            await asyncio.wait_for(budget.cond.wait(), timeout=delay)
+                        except asyncio.TimeoutError:
+                            pass
+                    else:
+                        await budget.cond.wait()
+            except BaseException:
+                if entry in queue:
+                    queue.remove(entry)
+                    heapq.heapify(queue)
+                    budget.cond.notify_all()
+                raise
+
+    def update(self, headers: Mapping[str, str], status_code: int, message: str = "", credential: str = "") -> None:
+        """
+        Обновление состояния по заголовкам ответа GitHub.
+
+        Args:
+            headers (Mapping[str, str]): Заголовки ответа.
+            status_code (int): HTTP-статус ответа.
+            message (str): Тело ответа об ошибке (для распознавания вторичного лимита).
+            credential (str): Метка учётных данных, от имени которых шёл запрос.
+        """
+        budget = self._budget(headers.get("X-RateLimit-Resource", "core"), credential)
+        if "X-RateLimit-Remaining" in headers:
+            budget.remaining = int(headers["X-RateLimit-Remaining"])
+        if "X-RateLimit-Reset" in headers:
+            budget.reset_at = float(headers["X-RateLimit-Reset"])
+        if "X-RateLimit-Limit" in headers:
+            budget.limit = int(headers["X-RateLimit-Limit"])
+
+        if status_code in (403, 429):
+            now = time.monotonic()
+            if "Retry-After" in headers:
+                budget.paused_until = now + float(headers["Retry-After"])
+            elif budget.remaining == 0 and budget.reset_at is not None:
+                budget.paused_until = now + max(budget.reset_at - time.time(), 0.0)
+            elif status_code == 429 or "secondary rate limit" in message.lower():
+                # Вторичный лимит без Retry-After: GitHub рекомендует подождать минуту
+                budget.paused_until = now + self.secondary_pause
+
+    def mutation_lock(self, repo: str) -> asyncio.Lock:
+        """
+        Блокировка для последовательного выполнения изменяющих запросов в репозиторий.
+
+        Args:
+            repo (str): Имя репозитория.
+
+        Returns:
+            asyncio.Lock: Общая блокировка репозитория.
+        """
+        lock = self._mutation_locks.get(repo)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._mutation_locks[repo] = lock
+        return lock
+
+    async def wait_mutation_interval(self, repo: str) -> None:
+        """
+        Выдерживание минимального интервала между изменяющими запросами в репозиторий.
+        Вызывается под mutation_lock(repo).
+        """
+        if self.mutation_interval > 0:
+            elapsed = time.monotonic() - self._last_mutation.get(repo, 0.0)
+            if elapsed < self.mutation_interval:
+                await asyncio.sleep(self.mutation_interval - elapsed)
+        self._last_mutation[repo] = time.monotonic()
+
+    def snapshot(self) -> dict:
+        """
+        Текущее состояние планировщика для диагностики.
+
+        Returns:
+            dict: Состояние бюджетов по ресурсам (для пула токенов — "ресурс:метка"),
+                длина очередей и счётчики.
+        """
+        now = time.monotonic()
+        return {
+            "queued": sum(len(budget.queue) for budget in self._budgets.values()),
+            "throttled": self.throttled,
+            "active_mutation_locks": sum(1 for lock in self._mutation_locks.values() if lock.locked()),
+            "resources": {
+                name: {
+                    "limit": budget.limit,
+                    "remaining": budget.remaining,
+                    "reset_at": budget.reset_at,
+                    "paused_for": round(max(budget.paused_until - now, 0.0), 3),
+                    "pacing": budget.remaining is not None and budget.remaining < self.pacing_threshold,
+                    "queued": len(budget.queue),
+                }
+                for name, budget in self._budgets.items()
+            },
+        }
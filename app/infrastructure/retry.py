@@ -0,0 +1,148 @@
+# app/infrastructure/retry.py
+
+import random
+import time
+
+
+class RetryPolicy:
+    """
+    Политика повторов запросов к GitHub: экспоненциальная задержка со
+    случайным разбросом (full jitter) и общий бюджет времени на запрос.
+    """
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.2,
+        max_delay: float = 5.0,
+        deadline: float = 10.0,
+        retry_statuses: tuple[int, ...] = (500, 502, 503, 504),
+    ):
+        """
+        Args:
+            max_attempts (int): Максимум попыток, включая первую.
+            base_delay (float): Базовая задержка перед повтором, с.
+            max_delay (float): Предельная задержка перед повтором, с.
+            deadline (float): Общий бюджет времени на все попытки, с.
+            retry_statuses (tuple[int, ...]): HTTP-статусы, после которых запрос повторяется.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retry_statuses = retry_statuses
+        self.attempts = 0
+        self.retries = 0
+        self.exhausted = 0
+
+    def next_delay(self, attempt: int, started: float) -> float | None:
+        """
+        Задержка перед следующей попыткой или None, если повторять нельзя.
+
+        Args:
+            attempt (int): Номер завершившейся попытки (с 1).
+            started (float): Момент начала первой попытки (time.monotonic()).
+
+        Returns:
+            float | None: Задержка в секундах или None.
+        """
+        if attempt >= self.max_attempts:
+            self.exhausted += 1
+            return None
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        if time.monotonic() - started + delay > self.deadline:
+            self.exhausted += 1
+            return None
+        self.retries += 1
+        return delay
+
+    def snapshot(self) -> dict:
+        """
+        Счётчики попыток для диагностики.
+        """
+        return {"attempts": self.attempts, "retries": self.retries, "exhausted": self.exhausted}
+
+
+class CircuitBreaker:
+    """
+    Предохранитель для upstream-хоста.
+
+    closed — запросы идут как обычно; после failure_threshold подряд
+    неудачных попыток (сетевые ошибки, 5xx) переходит в open и отклоняет
+    запросы без обращения к хосту. Через reset_timeout переходит в
+    half_open и пропускает один пробный запрос: успех закрывает
+    предохранитель, неудача снова открывает. Пробный запрос, прерванный
+    без результата (отмена), освобождает слот через release(); если он
+    завис дольше probe_timeout, пропускается новый пробный запрос.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, probe_timeout: float = 10.0):
+        """
+        Args:
+            failure_threshold (int): Число неудач подряд для размыкания.
+            reset_timeout (float): Время в разомкнутом состоянии до пробного запроса, с.
+            probe_timeout (float): Предельное время пробного запроса, с.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe_timeout = probe_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probe_in_flight = False
+        self._probe_started = 0.0
+
+    def allow(self) -> bool:
+        """
+        Можно ли отправить запрос.
+
+        Returns:
+            bool: False, если предохранитель разомкнут.
+        """
+        if self.state == self.CLOSED:
+            return True
+        now = time.monotonic()
+        if self.state == self.OPEN and now - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+        if self.state == self.HALF_OPEN and (
+            not self._probe_in_flight or now - self._probe_started >= self.probe_timeout
+        ):
+            self._probe_in_flight = True
+            self._probe_started = now
+            return True
+        self.rejected += 1
+        return False
+
+    def release(self) -> None:
+        """
+        Освобождение слота пробного запроса, прерванного без результата.
+        """
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        """
+        Учёт успешной попытки.
+        """
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """
+        Учёт неудачной попытки.
+        """
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> dict:
+        """
+        Состояние предохранителя для диагностики.
+        """
+        return {"state": self.state, "failures": self.failures, "rejected": self.rejected}
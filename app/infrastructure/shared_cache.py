@@ -0,0 +1,354 @@
+# app/infrastructure/shared_cache.py
+
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+# Событие инвалидации: ("url", ключ), ("prefix", префикс URL) или ("repo", имя репозитория)
+Invalidation = tuple[str, str]
+
+
+class SharedCache(ABC):
+    """
+    Общий для воркеров уровень кэша (L2) под кэшами в памяти процесса.
+
+    Хранит ответы GitHub по URL (ETag/Last-Modified и тело, в том числе
+    листинги деревьев) и мета-информацию о репозиториях. Инвалидации
+    рассылаются всем процессам: каждый применяет их к своему кэшу в памяти
+    через подписчиков (subscribe/poll). Ошибки этого уровня не должны
+    прерывать запросы: реализация возвращает промах и пишет предупреждение.
+    Методы вызываются из цикла событий и не должны ждать блокировок базы;
+    get_response может вызываться и из пула потоков (декодирование тела).
+    """
+    @abstractmethod
+    def get_response(self, url: str) -> tuple[str | None, str | None, object, int, float] | None:
+        """
+        Ответ по URL: (etag, last_modified, тело, размер, fresh_until по time.time()).
+        """
+        ...
+
+    @abstractmethod
+    def put_response(self, url: str, etag: str | None, last_modified: str | None, body, size: int, fresh_until: float) -> None:
+        ...
+
+    @abstractmethod
+    def get_repo(self, repo: str) -> tuple[str, str | None, float] | None:
+        """
+        Мета-информация о репозитории: (default_branch, head_sha, expires_at по time.time()).
+        """
+        ...
+
+    @abstractmethod
+    def put_repo(self, repo: str, default_branch: str, head_sha: str | None, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    def invalidate(self, kind: str, key: str) -> None:
+        """
+        Удаление записей и рассылка инвалидации другим процессам.
+
+        Args:
+            kind (str): "url", "prefix" или "repo".
+            key (str): URL, префикс URL или имя репозитория.
+        """
+        ...
+
+    @abstractmethod
+    def subscribe(self, listener: Callable[[str, str], None]) -> None:
+        """
+        Подписка кэша в памяти на инвалидации из других процессов.
+        """
+        ...
+
+    @abstractmethod
+    def poll(self) -> None:
+        """
+        Доставка подписчикам новых инвалидаций (не чаще заданного интервала).
+        """
+        ...
+
+    @abstractmethod
+    def flush(self) -> None:
+        """
+        Запись отложенных изменений с ожиданием её завершения (блокирует вызывающий поток).
+        """
+        ...
+
+    @abstractmethod
+    def close(self) -> None:
+        ...
+
+
+def _encode_time(value: float) -> float | None:
+    return None if math.isinf(value) else value
+
+
+def _decode_time(value: float | None) -> float:
+    return math.inf if value is None else value
+
+
+class SQLiteSharedCache(SharedCache):
+    """
+    Общий кэш в локальной базе SQLite в режиме WAL.
+
+    Читатели не блокируют писателя, поэтому воркеры на одном хосте
+    работают с одним файлом. Вся запись (и кодирование тел в JSON) идёт
+    в отдельном потоке: ответы накапливаются и пишутся пакетом (по размеру
+    пакета или интервалу), инвалидации и мета-информация — при следующем
+    проходе писателя. Чтение идёт через соединения без ожидания блокировок:
+    занятая база даёт промах, а не задержку цикла событий. Журнал
+    инвалидаций других процессов читается не чаще poll_interval.
+    """
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS responses (
+            url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body TEXT NOT NULL,
+            size INTEGER NOT NULL, fresh_until REAL, expires_at REAL NOT NULL)""",
+        """CREATE TABLE IF NOT EXISTS repos (
+            repo TEXT PRIMARY KEY, default_branch TEXT NOT NULL, head_sha TEXT, expires_at REAL NOT NULL)""",
+        """CREATE TABLE IF NOT EXISTS invalidations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, key TEXT NOT NULL, created_at REAL NOT NULL)""",
+    )
+    # Сколько хранится журнал инвалидаций: процесс, отставший сильнее, всё равно сверяется по ETag
+    INVALIDATION_RETENTION = 3600.0
+
+    def __init__(
+        self,
+        path: str | Path,
+        ttl: float = 86400.0,
+        batch_size: int = 64,
+        flush_interval: float = 1.0,
+        poll_interval: float = 0.5,
+        busy_timeout: float = 1.0,
+    ):
+        """
+        Args:
+            path (str | Path): Файл базы данных.
+            ttl (float): Время жизни ответа в базе, с.
+            batch_size (int): Сколько записей накапливать перед записью.
+            flush_interval (float): Максимальная задержка записи накопленного, с.
+            poll_interval (float): Как часто читать журнал инвалидаций, с.
+            busy_timeout (float): Сколько поток записи ждёт блокировки базы другим процессом, с.
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.poll_interval = poll_interval
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=busy_timeout, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        for statement in self.SCHEMA:
+            self._db.execute(statement)
+        row = self._db.execute("SELECT COALESCE(MAX(id), 0) FROM invalidations").fetchone()
+        self._last_invalidation = row[0]
+        self._last_poll = time.monotonic()
+        self._listeners: list[Callable[[str, str], None]] = []
+        self._readers = threading.local()
+        self._reader_connections: list[sqlite3.Connection] = []
+
+        # Состояние, общее с потоком записи (под self._cond)
+        self._cond = threading.Condition()
+        # Ответы, ещё не записанные в базу: url → (etag, last_modified, тело, размер, fresh_until)
+        self._pending: dict[str, tuple] = {}
+        # Инвалидации и мета-информация в порядке поступления
+        self._operations: list[tuple] = []
+        # Собственные инвалидации уже применены к кэшу в памяти этого процесса
+        self._own_invalidations: set[int] = set()
+        self._requested = 0
+        self._completed = 0
+        self._closing = False
+        self._writer = threading.Thread(target=self._write_loop, name="shared-cache-writer", daemon=True)
+        self._writer.start()
+
+    def _safely(self, action: str, operation: Callable, default=None):
+        try:
+            return operation()
+        except sqlite3.Error as e:
+            logger.warning("Общий кэш: %s не выполнено: %s", action, e)
+            return default
+
+    def _reader(self) -> sqlite3.Connection:
+        """
+        Соединение для чтения в текущем потоке; блокировку базы не ждёт.
+        """
+        db = getattr(self._readers, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=0, isolation_level=None, check_same_thread=False)
+            self._readers.db = db
+            with self._cond:
+                self._reader_connections.append(db)
+        return db
+
+    def get_response(self, url: str):
+        with self._cond:
+            pending = self._pending.get(url)
+        if pending is not None:
+            return pending
+        row = self._safely("чтение ответа", lambda: self._reader().execute(
+            "SELECT etag, last_modified, body, size, fresh_until FROM responses WHERE url = ? AND expires_at > ?",
+            (url, time.time()),
+        ).fetchone())
+        if row is None:
+            return None
+        etag, last_modified, body, size, fresh_until = row
+        return etag, last_modified, json.loads(body), size, _decode_time(fresh_until)
+
+    def put_response(self, url, etag, last_modified, body, size, fresh_until) -> None:
+        with self._cond:
+            self._pending[url] = (etag, last_modified, body, size, fresh_until)
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify_all()
+
+    def get_repo(self, repo: str):
+        row = self._safely("чтение репозитория", lambda: self._reader().execute(
+            "SELECT default_branch, head_sha, expires_at FROM repos WHERE repo = ? AND expires_at > ?",
+            (repo, time.time()),
+        ).fetchone())
+        return tuple(row) if row else None
+
+    def put_repo(self, repo: str, default_branch: str, head_sha: str | None, ttl: float) -> None:
+        self._enqueue(("repo", repo, default_branch, head_sha, time.time() + ttl))
+
+    def invalidate(self, kind: str, key: str) -> None:
+        with self._cond:
+            if kind == "url":
+                self._pending.pop(key, None)
+            elif kind == "prefix":
+                for url in [url for url in self._pending if url.startswith(key)]:
+                    del self._pending[url]
+        self._enqueue(("invalidate", kind, key))
+
+    def _enqueue(self, operation: tuple) -> None:
+        with self._cond:
+            self._operations.append(operation)
+            self._cond.notify_all()
+
+    def subscribe(self, listener: Callable[[str, str], None]) -> None:
+        self._listeners.append(listener)
+
+    def poll(self) -> None:
+        now = time.monotonic()
+        if now - self._last_poll < self.poll_interval:
+            return
+        self._last_poll = now
+        rows = self._safely("чтение инвалидаций", lambda: self._reader().execute(
+            "SELECT id, kind, key FROM invalidations WHERE id > ? ORDER BY id", (self._last_invalidation,)
+        ).fetchall(), default=[])
+        for row_id, kind, key in rows:
+            self._last_invalidation = row_id
+            with self._cond:
+                own = row_id in self._own_invalidations
+                self._own_invalidations.discard(row_id)
+            if own:
+                continue
+            for listener in self._listeners:
+                listener(kind, key)
+
+    def flush(self) -> None:
+        """
+        Ожидание записи всего накопленного (для остановки и тестов; не для цикла событий).
+        """
+        with self._cond:
+            if self._closing and not self._writer.is_alive():
+                return
+            self._requested += 1
+            target = self._requested
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: self._completed >= target or not self._writer.is_alive())
+
+    def close(self) -> None:
+        self.flush()
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._writer.join()
+        self._db.close()
+        for db in self._reader_connections:
+            db.close()
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closing or self._operations or self._requested > self._completed
+                    or len(self._pending) >= self.batch_size,
+                    timeout=self.flush_interval,
+                )
+                if self._closing:
+                    return
+                operations, self._operations = self._operations, []
+                pending = dict(self._pending)
+                requested = self._requested
+            written = self._write(operations, pending)
+            with self._cond:
+                if written:
+                    for url, row in pending.items():
+                        if self._pending.get(url) is row:
+                            del self._pending[url]
+                elif len(self._pending) > self.batch_size * 16:
+                    # При занятой базе записи ждут следующей попытки, но не копятся без предела
+                    self._pending.clear()
+                self._completed = requested
+                self._cond.notify_all()
+
+    def _write(self, operations: list[tuple], pending: dict[str, tuple]) -> bool:
+        """
+        Запись операций и пакета ответов (в потоке записи).
+
+        Returns:
+            bool: Записан ли пакет ответов.
+        """
+        for operation in operations:
+            if operation[0] == "repo":
+                self._safely("запись репозитория", lambda: self._db.execute(
+                    "INSERT OR REPLACE INTO repos VALUES (?, ?, ?, ?)", operation[1:]
+                ))
+            else:
+                self._safely("инвалидация", lambda: self._write_invalidation(*operation[1:]))
+        if not pending:
+            return True
+        now = time.time()
+        rows = [
+            (url, etag, last_modified, json.dumps(body, separators=(",", ":")), size,
+             _encode_time(fresh_until), now + self.ttl)
+            for url, (etag, last_modified, body, size, fresh_until) in pending.items()
+        ]
+
+        def apply():
+            with self._db:
+                self._db.execute("BEGIN IMMEDIATE")
+                self._db.executemany("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+                self._db.execute("DELETE FROM repos WHERE expires_at <= ?", (now,))
+                self._db.execute(
+                    "DELETE FROM invalidations WHERE created_at <= ?", (now - self.INVALIDATION_RETENTION,)
+                )
+            return True
+        return self._safely("запись пакета", apply, default=False)
+
+    def _write_invalidation(self, kind: str, key: str) -> None:
+        if kind == "url":
+            statement, argument = "DELETE FROM responses WHERE url = ?", key
+        elif kind == "prefix":
+            escaped = key.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            statement, argument = "DELETE FROM responses WHERE url LIKE ? ESCAPE '\\'", escaped + "%"
+        else:
+            statement, argument = "DELETE FROM repos WHERE repo = ?", key
+        with self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.execute(statement, (argument,))
+            cursor = self._db.execute(
+                "INSERT INTO invalidations (kind, key, created_at) VALUES (?, ?, ?)", (kind, key, time.time())
+            )
+            # До фиксации: poll этого процесса не должен увидеть запись раньше отметки
+            with self._cond:
+                self._own_invalidations.add(cursor.lastrowid)
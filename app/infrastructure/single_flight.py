@@ -0,0 +1,69 @@
+# app/infrastructure/single_flight.py
+
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    """
+    Выполняющийся общий вызов и число ожидающих его результата.
+    """
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Объединение одинаковых одновременных вызовов в один (single-flight).
+
+    Первый вызов по ключу запускает операцию отдельной задачей, остальные
+    ждут её результата. Исключение операции получают все ожидающие. Отмена
+    одного ожидающего не отменяет операцию для остальных; операция
+    отменяется, только когда не осталось ни одного ожидающего.
+    """
+    def __init__(self):
+        self._calls: dict[Hashable, _Call] = {}
+        self.leaders = 0
+        self.shared = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Выполнение fn или присоединение к уже выполняющемуся вызову с тем же ключом.
+
+        Args:
+            key (Hashable): Ключ вызова (например, метод, URL и авторизация).
+            fn (Callable[[], Awaitable[T]]): Операция, которую нужно выполнить.
+
+        Returns:
+            T: Результат операции.
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _, key=key, call=call: self._forget(key, call))
+            self.leaders += 1
+        else:
+            self.shared += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+                # Отменённая задача завершится позже: новые вызовы не должны к ней присоединяться
+                self._forget(key, call)
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
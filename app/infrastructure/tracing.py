@@ -0,0 +1,113 @@
+# app/infrastructure/tracing.py
+
+import time
+from contextvars import ContextVar, Token
+
+
+class Trace:
+    """
+    Разбивка времени одного запроса по фазам (upstream, decode, validate...).
+
+    Одноимённые фазы суммируются: у параллельных запросов к GitHub сумма
+    может превышать общее время запроса.
+    """
+    __slots__ = ("request_id", "spans")
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.spans: dict[str, list] = {}
+
+    def add(self, name: str, duration: float) -> None:
+        """
+        Учёт длительности фазы, с.
+        """
+        entry = self.spans.get(name)
+        if entry is None:
+            self.spans[name] = [duration, 1]
+        else:
+            entry[0] += duration
+            entry[1] += 1
+
+    def server_timing(self, total: float | None = None) -> str:
+        """
+        Значение заголовка Server-Timing (длительности в миллисекундах).
+        """
+        parts = [f"{name};dur={duration * 1000:.1f}" for name, (duration, _) in self.spans.items()]
+        if total is not None:
+            parts.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(parts)
+
+    def as_dict(self) -> dict:
+        """
+        Фазы для журнала: длительность в миллисекундах и число вхождений.
+        """
+        return {name: {"ms": round(duration * 1000, 2), "count": count} for name, (duration, count) in self.spans.items()}
+
+
+_current_trace: ContextVar[Trace | None] = ContextVar("current_trace", default=None)
+
+
+def current_trace() -> Trace | None:
+    """
+    Трасса текущего запроса или None, если запрос не трассируется.
+    """
+    return _current_trace.get()
+
+
+def start_trace(request_id: str) -> tuple[Trace, Token]:
+    """
+    Начало трассировки запроса в текущем контексте.
+
+    Returns:
+        tuple[Trace, Token]: Трасса и токен для end_trace().
+    """
+    trace = Trace(request_id)
+    return trace, _current_trace.set(trace)
+
+
+def end_trace(token: Token) -> None:
+    """
+    Завершение трассировки, начатой start_trace().
+    """
+    _current_trace.reset(token)
+
+
+class _Span:
+    __slots__ = ("trace", "name", "started")
+
+    def __init__(self, trace: Trace, name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.trace.add(self.name, time.perf_counter() - self.started)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str) -> _Span | _NoopSpan:
+    """
+    Контекстный менеджер фазы запроса.
+
+    Если запрос не трассируется (не попал в выборку), возвращается общий
+    пустой менеджер, поэтому стоимость вне выборки — одно чтение ContextVar.
+
+    Args:
+        name (str): Имя фазы (токен заголовка Server-Timing).
+    """
+    trace = _current_trace.get()
+    return _NOOP_SPAN if trace is None else _Span(trace, name)
@@ -0,0 +1,111 @@
+# benchmarks/__main__.py
+
+"""
+Нагрузочные прогоны сервиса против фейкового GitHub в памяти процесса.
+
+    python -m benchmarks                      # все сценарии, сравнение с baseline.json
+    python -m benchmarks -s bulk_reads        # один сценарий
+    python -m benchmarks --latency-tolerance 0.5   # сравнивать и p95 (на той же машине, что и базовая линия)
+    python -m benchmarks --update-baseline    # сохранить текущие результаты как базовые
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+# Конфигурация приложения требует учётных данных; к настоящему GitHub прогон не обращается
+os.environ.setdefault("MY_GITHUB_TOKEN", "benchmark-token")
+os.environ.setdefault("MY_GITHUB_USERNAME", "benchmark")
+# Журнал доступа на каждый запрос исказил бы замеры и засорил вывод
+os.environ.setdefault("ACCESS_LOG", "false")
+
+from benchmarks.fake_github import FakeGitHub  # noqa: E402
+from benchmarks.harness import compare  # noqa: E402
+from benchmarks.scenarios import SCENARIOS  # noqa: E402
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Нагрузочные сценарии сервиса")
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS), help="Сценарий (можно несколько)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Множитель числа запросов")
+    parser.add_argument("--latency", type=float, default=2.0, help="Задержка фейкового GitHub, мс")
+    parser.add_argument("--jitter", type=float, default=1.0, help="Случайная добавка к задержке, мс")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Доля ответов 503 от фейкового GitHub")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", type=Path, default=BASELINE, help="Файл базовой линии")
+    parser.add_argument("--update-baseline", action="store_true", help="Записать результаты в файл базовой линии")
+    parser.add_argument("--output", type=Path, help="Сохранить отчёт в JSON")
+    parser.add_argument("--calls-tolerance", type=float, default=0.25, help="Допустимый рост обращений к upstream")
+    parser.add_argument(
+        "--latency-tolerance", type=float,
+        help="Сравнивать и p95: допустимый рост (0.5 = +50%%); без флага задержка не сравнивается",
+    )
+    parser.add_argument("--slack-ms", type=float, default=5.0, help="Абсолютный запас на шум таймера, мс")
+    parser.add_argument("--min-samples", type=int, default=50, help="Минимум запросов эндпоинта для сравнения p95")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    report = {}
+    for name in args.scenario or list(SCENARIOS):
+        fake = FakeGitHub(
+            latency=args.latency / 1000,
+            jitter=args.jitter / 1000,
+            error_rate=args.error_rate,
+            seed=args.seed,
+        )
+        report[name] = await SCENARIOS[name](fake, args.scale)
+    return report
+
+
+def print_report(report: dict) -> None:
+    header = f"{'endpoint':40} {'req':>6} {'err':>4} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'up/req':>7}"
+    for scenario, endpoints in report.items():
+        print(f"\n== {scenario}")
+        print(header)
+        for endpoint, stats in endpoints.items():
+            print(
+                f"{endpoint:40} {stats['requests']:>6} {stats['errors']:>4} {stats['throughput_rps']:>8} "
+                f"{stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['p99_ms']:>8} {stats['upstream_per_request']:>7}"
+            )
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    print_report(report)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n")
+        print(f"\nБазовая линия записана в {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"\nБазовая линия {args.baseline} не найдена, сравнение пропущено")
+        return 0
+
+    regressions = compare(
+        report,
+        json.loads(args.baseline.read_text()),
+        calls_tolerance=args.calls_tolerance,
+        latency_tolerance=args.latency_tolerance,
+        slack_ms=args.slack_ms,
+        min_samples=args.min_samples,
+    )
+    if regressions:
+        print("\nРегрессии относительно базовой линии:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print("\nРегрессий относительно базовой линии нет")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
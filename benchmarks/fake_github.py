@@ -0,0 +1,406 @@
+# benchmarks/fake_github.py
+
+import asyncio
+import base64
+import hashlib
+import io
+import json
+import random
+import re
+import tarfile
+import time
+from collections import Counter
+from contextvars import ContextVar
+from urllib.parse import unquote
+
+import httpx
+
+# Эндпоинт сервиса, от имени которого идёт запрос к upstream (выставляет харнесс):
+# по нему вызовы к фейковому GitHub относятся к запросам к сервису
+current_endpoint: ContextVar[str | None] = ContextVar("current_endpoint", default=None)
+
+_REPO_PATH = re.compile(r"^/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)(?P<rest>/.*)?$")
+
+
+def _git_sha(kind: str, data: bytes) -> str:
+    return hashlib.sha1(f"{kind} {len(data)}\0".encode() + data).hexdigest()
+
+
+class _Repo:
+    """
+    Состояние одного репозитория: объекты git и ветки.
+
+    Дерево хранится плоско (путь → SHA блоба); папки и их SHA вычисляются
+    при выдаче, этого достаточно для API, которое использует сервис.
+    """
+    def __init__(self, default_branch: str = "main"):
+        self.default_branch = default_branch
+        self.blobs: dict[str, bytes] = {}
+        self.trees: dict[str, dict[str, str]] = {}
+        self.commits: dict[str, dict] = {}
+        self.refs: dict[str, str] = {}
+        self._commit_seq = 0
+        empty = self.put_tree({})
+        self.refs[default_branch] = self.put_commit(empty, [], "Initial commit")
+
+    def put_blob(self, data: bytes) -> str:
+        sha = _git_sha("blob", data)
+        self.blobs[sha] = data
+        return sha
+
+    def put_tree(self, files: dict[str, str]) -> str:
+        sha = _git_sha("tree", json.dumps(sorted(files.items())).encode())
+        self.trees[sha] = dict(files)
+        return sha
+
+    def put_commit(self, tree_sha: str, parents: list[str], message: str) -> str:
+        self._commit_seq += 1
+        sha = _git_sha("commit", f"{tree_sha}{parents}{message}{self._commit_seq}".encode())
+        self.commits[sha] = {"tree": tree_sha, "parents": list(parents), "message": message}
+        return sha
+
+    def resolve_tree(self, ref: str) -> str | None:
+        if ref in self.refs:
+            ref = self.refs[ref]
+        if ref in self.commits:
+            return self.commits[ref]["tree"]
+        return ref if ref in self.trees else None
+
+    def head_files(self, branch: str | None = None) -> dict[str, str]:
+        return self.trees[self.resolve_tree(branch or self.default_branch)]
+
+    def commit_files(self, changes: dict[str, bytes | None], message: str, branch: str | None = None) -> str:
+        branch = branch or self.default_branch
+        files = dict(self.head_files(branch))
+        for path, data in changes.items():
+            if data is None:
+                files.pop(path, None)
+            else:
+                files[path] = self.put_blob(data)
+        commit = self.put_commit(self.put_tree(files), [self.refs[branch]], message)
+        self.refs[branch] = commit
+        return commit
+
+    def tree_listing(self, tree_sha: str) -> list[dict]:
+        files = self.trees[tree_sha]
+        directories: dict[str, list[str]] = {}
+        for path, sha in files.items():
+            parts = path.split("/")
+            for depth in range(1, len(parts)):
+                directories.setdefault("/".join(parts[:depth]), []).append(f"{path}:{sha}")
+        entries = [
+            {"path": path, "mode": "040000", "type": "tree",
+             "sha": _git_sha("tree", "\n".join(sorted(members)).encode()), "url": "https://fake/tree"}
+            for path, members in directories.items()
+        ]
+        entries += [
+            {"path": path, "mode": "100644", "type": "blob", "sha": sha,
+             "size": len(self.blobs[sha]), "url": "https://fake/blob"}
+            for path, sha in files.items()
+        ]
+        entries.sort(key=lambda entry: entry["path"])
+        return entries
+
+
+class FakeGitHub(httpx.AsyncBaseTransport):
+    """
+    GitHub API в памяти процесса для нагрузочных прогонов без сети.
+
+    Реализует эндпоинты, которыми пользуется GitHubClient: информацию о
+    репозитории, рекурсивные деревья, contents (JSON и raw), git data
+    (ref, commits, blobs, trees), чтение блобов через GraphQL и архивы
+    (tarball с редиректом на codeload). Поддерживает ETag/304, заголовки
+    X-RateLimit-*, искусственную задержку и внедрение ошибок 5xx.
+    """
+    CODELOAD_HOST = "codeload.fake"
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: int = 5000,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            latency (float): Задержка каждого ответа, с.
+            jitter (float): Случайная добавка к задержке (0..jitter), с.
+            error_rate (float): Доля запросов, на которые отвечать 503.
+            rate_limit (int): Лимит запросов в окне (X-RateLimit-Limit).
+            seed (int): Зерно генератора случайных чисел.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.remaining = rate_limit
+        self.reset_at = int(time.time()) + 3600
+        self.random = random.Random(seed)
+        self.repos: dict[str, _Repo] = {}
+        self.calls: Counter[tuple[str | None, str]] = Counter()
+
+    def repo(self, name: str) -> _Repo:
+        """
+        Репозиторий по имени (создаётся пустым при первом обращении).
+        """
+        if name not in self.repos:
+            self.repos[name] = _Repo()
+        return self.repos[name]
+
+    def seed_repo(self, name: str, files: dict[str, bytes | str]) -> str:
+        """
+        Наполнение репозитория одним коммитом.
+
+        Returns:
+            str: SHA коммита.
+        """
+        changes = {path: data.encode() if isinstance(data, str) else data for path, data in files.items()}
+        return self.repo(name).commit_files(changes, "Seed")
+
+    def upstream_calls(self, endpoint: str | None = None) -> int:
+        """
+        Число обращений к фейковому GitHub (всего или от имени эндпоинта сервиса).
+        """
+        return sum(count for (label, _), count in self.calls.items() if endpoint is None or label == endpoint)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if request.url.host == self.CODELOAD_HOST:
+            self.calls[(current_endpoint.get(), "GET codeload")] += 1
+            return self._codeload(request)
+
+        match = _REPO_PATH.match(unquote(request.url.path))
+        graphql = request.url.path == "/graphql"
+        kind = "POST graphql" if graphql else self._kind(request.method, match.group("rest") if match else None)
+        self.calls[(current_endpoint.get(), kind)] += 1
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            status, headers, body = 503, {}, self._json({"message": "Injected failure"})
+        elif graphql and request.method == "POST":
+            status, headers, body = 200, {}, self._graphql(json.loads(request.content))
+        elif match is None:
+            status, headers, body = 404, {}, self._json({"message": "Not Found"})
+        else:
+            status, headers, body = self._route(request, match.group("repo"), match.group("rest") or "")
+
+        if status == 200 and request.method == "GET":
+            etag = f'"{hashlib.md5(body).hexdigest()}"'
+            headers["ETag"] = etag
+            if request.headers.get("If-None-Match") == etag:
+                status, body = 304, b""
+        if status != 304:
+            self.remaining = max(0, self.remaining - 1)
+        headers.update({
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(self.reset_at),
+            "X-RateLimit-Resource": "graphql" if graphql else "core",
+        })
+        headers.setdefault("Content-Type", "application/json")
+        return httpx.Response(status, headers=headers, stream=httpx.ByteStream(body), request=request)
+
+    @staticmethod
+    def _kind(method: str, rest: str | None) -> str:
+        if rest is None:
+            return f"{method} other"
+        for prefix in ("/git/trees", "/git/ref", "/git/commits", "/git/blobs", "/contents", "/tarball"):
+            if rest.startswith(prefix):
+                return f"{method} {prefix.lstrip('/')}"
+        return f"{method} repo"
+
+    @staticmethod
+    def _json(data) -> bytes:
+        return json.dumps(data).encode()
+
+    def _graphql(self, payload: dict) -> bytes:
+        """
+        Ответ на запрос блобов вида f{i}: object(expression: $e{i}) (сам запрос не разбирается).
+        """
+        variables = payload.get("variables", {})
+        repo = self.repos.get(variables.get("name"))
+        if repo is None:
+            return self._json({"data": {"repository": None}, "errors": [{"type": "NOT_FOUND", "message": "Not found"}]})
+        objects = {}
+        for key, expression in variables.items():
+            if not re.fullmatch(r"e\d+", key):
+                continue
+            ref, _, path = expression.partition(":")
+            tree_sha = repo.resolve_tree(ref)
+            sha = repo.trees[tree_sha].get(path) if tree_sha else None
+            if sha is None:
+                objects[f"f{key[1:]}"] = None
+                continue
+            data = repo.blobs[sha]
+            binary = b"\0" in data
+            objects[f"f{key[1:]}"] = {
+                "oid": sha,
+                "byteSize": len(data),
+                "isBinary": binary,
+                "isTruncated": False,
+                "text": None if binary else data.decode("utf-8", errors="replace"),
+            }
+        return self._json({"data": {"repository": objects}})
+
+    def _codeload(self, request: httpx.Request) -> httpx.Response:
+        """
+        Архив коммита в формате GitHub: корневая папка owner-repo-sha и глобальный заголовок pax с SHA.
+        """
+        owner, name, _, commit = request.url.path.strip("/").split("/")
+        repo = self.repos.get(name)
+        if repo is None or commit not in repo.commits:
+            return httpx.Response(404, request=request)
+        files = repo.trees[repo.commits[commit]["tree"]]
+        root = f"{owner}-{name}-{commit[:7]}"
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz", format=tarfile.PAX_FORMAT, pax_headers={"comment": commit}) as tar:
+            directories = sorted({"/".join(path.split("/")[:depth]) for path in files for depth in range(1, path.count("/") + 1)})
+            for path in [""] + directories:
+                info = tarfile.TarInfo(f"{root}/{path}".rstrip("/") + "/")
+                info.type, info.mode = tarfile.DIRTYPE, 0o755
+                tar.addfile(info)
+            for path, sha in sorted(files.items()):
+                data = repo.blobs[sha]
+                info = tarfile.TarInfo(f"{root}/{path}")
+                info.size, info.mode = len(data), 0o644
+                tar.addfile(info, io.BytesIO(data))
+        body = buffer.getvalue()
+        headers = {"Content-Type": "application/x-gzip", "Content-Length": str(len(body))}
+        return httpx.Response(200, headers=headers, stream=httpx.ByteStream(body), request=request)
+
+    def _route(self, request: httpx.Request, name: str, rest: str) -> tuple[int, dict, bytes]:
+        repo = self.repo(name)
+        method = request.method
+        payload = json.loads(request.content) if request.content else {}
+
+        if rest == "" and method == "GET":
+            return 200, {}, self._json({"name": name, "default_branch": repo.default_branch})
+
+        if rest.startswith("/git/trees/") and method == "GET":
+            tree_sha = repo.resolve_tree(rest[len("/git/trees/"):])
+            if tree_sha is None:
+                return 404, {}, self._json({"message": "Not Found"})
+            listing = repo.tree_listing(tree_sha)
+            return 200, {}, self._json({"sha": tree_sha, "tree": listing, "truncated": False})
+
+        if rest.startswith("/git/ref/heads/") and method == "GET":
+            commit = repo.refs.get(rest[len("/git/ref/heads/"):])
+            if commit is None:
+                return 404, {}, self._json({"message": "Not Found"})
+            return 200, {}, self._json({"object": {"sha": commit, "type": "commit"}})
+
+        if rest.startswith("/git/commits/") and method == "GET":
+            commit = repo.commits.get(rest[len("/git/commits/"):])
+            if commit is None:
+                return 404, {}, self._json({"message": "Not Found"})
+            return 200, {}, self._json({"sha": rest.rsplit("/", 1)[1], "tree": {"sha": commit["tree"]}})
+
+        if rest.startswith("/git/blobs/") and method == "GET":
+            data = repo.blobs.get(rest[len("/git/blobs/"):])
+            if data is None:
+                return 404, {}, self._json({"message": "Not Found"})
+            if "raw" in request.headers.get("Accept", ""):
+                return 200, {"Content-Type": "application/octet-stream"}, data
+            return 200, {}, self._json({"encoding": "base64", "content": base64.b64encode(data).decode(), "size": len(data)})
+
+        if rest == "/git/blobs" and method == "POST":
+            sha = repo.put_blob(base64.b64decode(payload["content"]))
+            return 201, {}, self._json({"sha": sha})
+
+        if rest == "/git/trees" and method == "POST":
+            files = dict(repo.trees.get(payload.get("base_tree"), {}))
+            for entry in payload["tree"]:
+                if entry.get("sha") is None:
+                    files.pop(entry["path"], None)
+                else:
+                    files[entry["path"]] = entry["sha"]
+            return 201, {}, self._json({"sha": repo.put_tree(files)})
+
+        if rest == "/git/commits" and method == "POST":
+            sha = repo.put_commit(payload["tree"], payload.get("parents", []), payload.get("message", ""))
+            return 201, {}, self._json({"sha": sha})
+
+        if rest.startswith("/git/refs/heads/") and method == "PATCH":
+            branch = rest[len("/git/refs/heads/"):]
+            commit = repo.commits.get(payload["sha"])
+            if commit is None or repo.refs.get(branch) not in commit["parents"]:
+                return 422, {}, self._json({"message": "Update is not a fast forward"})
+            repo.refs[branch] = payload["sha"]
+            return 200, {}, self._json({"object": {"sha": payload["sha"]}})
+
+        if (rest == "/tarball" or rest.startswith("/tarball/")) and method == "GET":
+            ref = rest[len("/tarball/"):] or repo.default_branch
+            commit = repo.refs.get(ref, ref)
+            if commit not in repo.commits:
+                return 404, {}, self._json({"message": "Not Found"})
+            owner = _REPO_PATH.match(request.url.path).group("owner")
+            location = f"https://{self.CODELOAD_HOST}/{owner}/{name}/legacy.tar.gz/{commit}"
+            return 302, {"Location": location}, b""
+
+        if rest.startswith("/contents"):
+            return self._contents(request, repo, rest[len("/contents"):].strip("/"), payload)
+
+        return 404, {}, self._json({"message": "Not Found"})
+
+    def _contents(self, request: httpx.Request, repo: _Repo, path: str, payload: dict) -> tuple[int, dict, bytes]:
+        method = request.method
+        files = repo.head_files()
+
+        if method == "GET":
+            ref = request.url.params.get("ref")
+            if ref is not None:
+                tree_sha = repo.resolve_tree(ref)
+                if tree_sha is None:
+                    return 404, {}, self._json({"message": "No commit found for the ref"})
+                files = repo.trees[tree_sha]
+            if path in files:
+                data = repo.blobs[files[path]]
+                if "raw" in request.headers.get("Accept", ""):
+                    return 200, {"Content-Type": "application/octet-stream"}, data
+                return 200, {}, self._json({
+                    "type": "file",
+                    "path": path,
+                    "sha": files[path],
+                    "size": len(data),
+                    "encoding": "base64",
+                    "content": base64.b64encode(data).decode(),
+                })
+            prefix = f"{path}/" if path else ""
+            children: dict[str, dict] = {}
+            for file_path, sha in files.items():
+                if not file_path.startswith(prefix):
+                    continue
+                name, _, below = file_path[len(prefix):].partition("/")
+                child = prefix + name
+                children[child] = (
+                    {"type": "dir", "path": child, "sha": None}
+                    if below else {"type": "file", "path": child, "sha": sha, "size": len(repo.blobs[sha])}
+                )
+            if not children:
+                return 404, {}, self._json({"message": "Not Found"})
+            return 200, {}, self._json(sorted(children.values(), key=lambda entry: entry["path"]))
+
+        current = files.get(path)
+        if method == "PUT":
+            if current is not None and payload.get("sha") != current:
+                status = 409 if payload.get("sha") else 422
+                return status, {}, self._json({"message": "sha does not match"})
+            if current is None and payload.get("sha"):
+                return 404, {}, self._json({"message": "Not Found"})
+            commit = repo.commit_files({path: base64.b64decode(payload["content"])}, payload.get("message", ""))
+            content = {"path": path, "sha": repo.head_files()[path]}
+            return (201 if current is None else 200), {}, self._json({"content": content, "commit": {"sha": commit}})
+
+        if method == "DELETE":
+            if current is None:
+                return 404, {}, self._json({"message": "Not Found"})
+            if payload.get("sha") != current:
+                return 409, {}, self._json({"message": "sha does not match"})
+            commit = repo.commit_files({path: None}, payload.get("message", ""))
+            return 200, {}, self._json({"content": None, "commit": {"sha": commit}})
+
+        return 405, {}, self._json({"message": "Method Not Allowed"})
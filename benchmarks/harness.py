@@ -0,0 +1,181 @@
+# benchmarks/harness.py
+
+import asyncio
+import math
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator
+
+import httpx
+
+from benchmarks.fake_github import FakeGitHub, current_endpoint
+
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    Перцентиль методом ближайшего ранга (q от 0 до 100).
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class Recorder:
+    """
+    Клиент сервиса для сценариев: выполняет запросы и запоминает их
+    длительность и статус по эндпоинту (шаблону маршрута).
+    """
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    async def request(self, endpoint: str, method: str, url: str, expected: tuple[int, ...] = (200,), **kwargs) -> httpx.Response:
+        """
+        Запрос к сервису с учётом в статистике.
+
+        Args:
+            endpoint (str): Метка эндпоинта, например "GET /repos/{repo}/structure".
+            method (str): HTTP-метод.
+            url (str): URL относительно сервиса.
+            expected (tuple[int, ...]): Статусы, которые не считаются ошибкой.
+
+        Returns:
+            httpx.Response: Прочитанный ответ.
+        """
+        token = current_endpoint.set(endpoint)
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        finally:
+            current_endpoint.reset(token)
+        self.latencies[endpoint].append(time.perf_counter() - started)
+        if response.status_code not in expected:
+            self.errors[endpoint] += 1
+        return response
+
+
+@asynccontextmanager
+async def serve(fake: FakeGitHub) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Приложение с новыми клиентом и сервисом поверх фейкового GitHub.
+
+    Кэши не переживают сценарий (хранилище блобов — во временной папке).
+    Клиент и сервис кладутся в app.state, как в lifespan приложения, а
+    подмены зависимостей на время сценария снимаются: при любых подменах
+    FastAPI заново разбирает все подзависимости на каждом запросе, и замеры
+    были бы завышены.
+    """
+    from app.api.main import app
+    from app.domain.search_index import SearchIndexStore
+    from app.domain.services.github_service import GitHubService
+    from app.infrastructure.blob_store import BlobStore
+    from app.infrastructure.github_client import GitHubClient
+    from app.infrastructure.http_client import create_http_client
+
+    blob_dir = tempfile.TemporaryDirectory(prefix="bench-blobs-")
+    http_client = create_http_client(transport=fake)
+    github_client = GitHubClient(http_client)
+    service = GitHubService(
+        github_client,
+        search_indexes=SearchIndexStore(Path(blob_dir.name) / "search"),
+        blob_store=BlobStore(Path(blob_dir.name) / "blobs"),
+    )
+    previous = {name: getattr(app.state, name, None) for name in ("github_client", "github_service")}
+    previous_overrides = dict(app.dependency_overrides)
+    app.dependency_overrides.clear()
+    app.state.github_client = github_client
+    app.state.github_service = service
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://service", timeout=60) as client:
+            yield client
+    finally:
+        for name, value in previous.items():
+            setattr(app.state, name, value)
+        app.dependency_overrides.update(previous_overrides)
+        service.close()
+        await http_client.aclose()
+        blob_dir.cleanup()
+
+
+async def run_concurrently(count: int, concurrency: int, job) -> None:
+    """
+    Выполнение job(i) для i в range(count) не более чем concurrency одновременно.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(i: int) -> None:
+        async with semaphore:
+            await job(i)
+
+    await asyncio.gather(*(bounded(i) for i in range(count)))
+
+
+def summarize(recorder: Recorder, fake: FakeGitHub, elapsed: float) -> dict:
+    """
+    Сводка сценария по эндпоинтам: пропускная способность, перцентили
+    задержки (мс) и число обращений к upstream на запрос.
+    """
+    report = {}
+    for endpoint, values in sorted(recorder.latencies.items()):
+        report[endpoint] = {
+            "requests": len(values),
+            "errors": recorder.errors.get(endpoint, 0),
+            "throughput_rps": round(len(values) / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+            "upstream_per_request": round(fake.upstream_calls(endpoint) / len(values), 3),
+        }
+    return report
+
+
+def compare(
+    report: dict,
+    baseline: dict,
+    calls_tolerance: float,
+    latency_tolerance: float | None = None,
+    slack_ms: float = 5.0,
+    min_samples: int = 50,
+) -> list[str]:
+    """
+    Сравнение отчёта с базовой линией.
+
+    Регрессией считается рост числа обращений к upstream на запрос больше
+    чем в (1 + calls_tolerance) раз и рост числа ошибок: оба показателя
+    не зависят от скорости машины.
+    Задержка сравнивается только по запросу (latency_tolerance задан)
+    и только для эндпоинтов, где и в отчёте, и в базовой линии не меньше
+    min_samples запросов: рост p95 больше чем в (1 + latency_tolerance) раз
+    плюс slack_ms на шум таймера.
+
+    Returns:
+        list[str]: Описания регрессий (пустой список — регрессий нет).
+    """
+    regressions = []
+    for scenario, endpoints in baseline.items():
+        for endpoint, base in endpoints.items():
+            current = report.get(scenario, {}).get(endpoint)
+            if current is None:
+                continue
+            label = f"{scenario}: {endpoint}"
+            # 0.01 — запас на округление в отчёте
+            calls_limit = base["upstream_per_request"] * (1 + calls_tolerance) + 0.01
+            if current["upstream_per_request"] > calls_limit:
+                regressions.append(
+                    f"{label}: upstream/запрос {current['upstream_per_request']} > {calls_limit:.3f}"
+                )
+            if current["errors"] > base["errors"]:
+                regressions.append(f"{label}: ошибок {current['errors']} > {base['errors']}")
+            if latency_tolerance is None or min(current["requests"], base["requests"]) < min_samples:
+                continue
+            limit = base["p95_ms"] * (1 + latency_tolerance) + slack_ms
+            if current["p95_ms"] > limit:
+                regressions.append(f"{label}: p95 {current['p95_ms']} мс > {limit:.2f} мс")
+    return regressions
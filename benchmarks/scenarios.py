@@ -0,0 +1,160 @@
+# benchmarks/scenarios.py
+
+import time
+from typing import Awaitable, Callable
+
+from benchmarks.fake_github import FakeGitHub
+from benchmarks.harness import Recorder, run_concurrently, serve, summarize
+
+REPO = "bench"
+
+STRUCTURE = "GET /repos/{repo}/structure"
+CHANGES = "GET /repos/{repo}/structure/changes"
+FILE = "GET /repos/{repo}/file"
+RAW = "GET /repos/{repo}/raw"
+BATCH = "POST /repos/{repo}/files:batchGet"
+CREATE = "POST /repos/{repo}/file"
+UPDATE = "PUT /repos/{repo}/file"
+COMMIT = "POST /repos/{repo}/commits"
+
+
+def _text(i: int, size: int) -> str:
+    line = f"line {i}: the quick brown fox jumps over the lazy dog\n"
+    return (line * (size // len(line) + 1))[:size]
+
+
+async def structure_polling(fake: FakeGitHub, scale: float) -> dict:
+    """
+    Опрос структуры большого репозитория клиентами синхронизации: первая
+    страница /structure и /structure/changes, между раундами в репозиторий
+    приходят небольшие коммиты.
+    """
+    fake.seed_repo(REPO, {f"pkg{d:02d}/module{f:02d}.py": _text(f, 200) for d in range(50) for f in range(40)})
+    rounds = max(1, int(20 * scale))
+
+    async with serve(fake) as client:
+        recorder = Recorder(client)
+        first = await recorder.request(STRUCTURE, "GET", f"/repos/{REPO}/structure", params={"limit": 500})
+        since = first.json()["sha"]
+        started = time.perf_counter()
+        for round_no in range(rounds):
+            fake.repo(REPO).commit_files(
+                {f"pkg{round_no % 50:02d}/module{f:02d}.py": _text(round_no + f, 220).encode() for f in range(3)},
+                f"Change {round_no}",
+            )
+
+            async def poll(i: int) -> None:
+                if i % 2:
+                    await recorder.request(STRUCTURE, "GET", f"/repos/{REPO}/structure", params={"limit": 500})
+                else:
+                    await recorder.request(CHANGES, "GET", f"/repos/{REPO}/structure/changes", params={"since": since})
+
+            # Первые запросы раунда идут по одному: кто из одновременных запросов
+            # станет ведущим в single-flight и получит на свой счёт обращение
+            # к upstream за новым деревом, зависит от планирования
+            await poll(0)
+            await poll(1)
+            await run_concurrently(18, 10, lambda i: poll(i + 2))
+        return summarize(recorder, fake, time.perf_counter() - started)
+
+
+async def bulk_reads(fake: FakeGitHub, scale: float) -> dict:
+    """
+    Массовое чтение: пакетные запросы files:batchGet и повторное чтение
+    отдельных файлов (второй проход должен обслуживаться условными запросами).
+    """
+    paths = [f"docs/section{i // 20:02d}/page{i:03d}.md" for i in range(300)]
+    fake.seed_repo(REPO, {path: _text(i, 2048) for i, path in enumerate(paths)})
+    batches = max(1, int(60 * scale))
+    reads = max(1, int(200 * scale))
+
+    async with serve(fake) as client:
+        recorder = Recorder(client)
+        started = time.perf_counter()
+
+        async def batch(i: int) -> None:
+            chunk = paths[(i * 100) % 300:(i * 100) % 300 + 100]
+            await recorder.request(BATCH, "POST", f"/repos/{REPO}/files:batchGet", json={"paths": chunk})
+
+        await run_concurrently(batches, 2, batch)
+
+        async def read(i: int) -> None:
+            await recorder.request(FILE, "GET", f"/repos/{REPO}/file", params={"path": paths[i % len(paths)]})
+
+        for _ in range(2):
+            await run_concurrently(reads, 20, read)
+        return summarize(recorder, fake, time.perf_counter() - started)
+
+
+async def write_bursts(fake: FakeGitHub, scale: float) -> dict:
+    """
+    Всплески записи: параллельные обновления и создания файлов через
+    contents API и пакетные коммиты через Git Data API.
+    """
+    fake.seed_repo(REPO, {f"data/item{i:03d}.txt": _text(i, 512) for i in range(50)})
+    updates = max(1, int(40 * scale))
+    commits = max(1, int(10 * scale))
+
+    async with serve(fake) as client:
+        recorder = Recorder(client)
+        await recorder.request(STRUCTURE, "GET", f"/repos/{REPO}/structure", params={"limit": 1})
+        started = time.perf_counter()
+
+        async def update(i: int) -> None:
+            body = {"path": "data", "filename": f"item{i % 50:03d}.txt", "content": _text(i + 1000, 600), "message": f"Update {i}"}
+            await recorder.request(UPDATE, "PUT", f"/repos/{REPO}/file", json=body)
+
+        async def create(i: int) -> None:
+            body = {"path": "new", "filename": f"file{i:04d}.txt", "content": _text(i, 300), "message": f"Create {i}"}
+            await recorder.request(CREATE, "POST", f"/repos/{REPO}/file", json=body)
+
+        async def commit(i: int) -> None:
+            operations = [
+                {"action": "update", "path": "data", "filename": f"item{(i * 5 + j) % 50:03d}.txt", "content": _text(i * j, 700)}
+                for j in range(5)
+            ]
+            # Коммиты в одну ветку конкурируют: 422 после исчерпания попыток — допустимый исход
+            await recorder.request(
+                COMMIT, "POST", f"/repos/{REPO}/commits", expected=(200, 422),
+                json={"message": f"Batch {i}", "operations": operations},
+            )
+
+        await run_concurrently(updates, 10, update)
+        await run_concurrently(updates, 10, create)
+        await run_concurrently(commits, 3, commit)
+        return summarize(recorder, fake, time.perf_counter() - started)
+
+
+async def large_files(fake: FakeGitHub, scale: float) -> dict:
+    """
+    Крупные файлы: потоковая выдача бинарного файла через /raw и чтение
+    большого текстового файла через /file.
+    """
+    fake.seed_repo(REPO, {
+        "assets/archive.bin": bytes(range(256)) * (5 * 1024 * 4),
+        "logs/big.log": _text(0, 512 * 1024),
+    })
+    raw_reads = max(1, int(10 * scale))
+    file_reads = max(1, int(20 * scale))
+
+    async with serve(fake) as client:
+        recorder = Recorder(client)
+        started = time.perf_counter()
+
+        async def raw(i: int) -> None:
+            await recorder.request(RAW, "GET", f"/repos/{REPO}/raw", params={"path": "assets/archive.bin"})
+
+        async def read(i: int) -> None:
+            await recorder.request(FILE, "GET", f"/repos/{REPO}/file", params={"path": "logs/big.log"})
+
+        await run_concurrently(raw_reads, 4, raw)
+        await run_concurrently(file_reads, 4, read)
+        return summarize(recorder, fake, time.perf_counter() - started)
+
+
+SCENARIOS: dict[str, Callable[[FakeGitHub, float], Awaitable[dict]]] = {
+    "structure_polling": structure_polling,
+    "bulk_reads": bulk_reads,
+    "write_bursts": write_bursts,
+    "large_files": large_files,
+}
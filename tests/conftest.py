@@ -0,0 +1,15 @@
+# tests/conftest.py
+
+import pytest
+
+from app.domain.services import github_service
+
+
+@pytest.fixture(autouse=True)
+def search_index_dir(tmp_path, monkeypatch):
+    """
+    Индексы поиска сервисов, созданных в тестах без своего хранилища, — во временной папке.
+    """
+    directory = tmp_path / "search_index"
+    monkeypatch.setattr(github_service, "SEARCH_INDEX_DIR", str(directory))
+    return directory
@@ -0,0 +1,100 @@
+# tests/test_archive.py
+
+import gzip
+import io
+import tarfile
+
+import pytest
+
+from app.core.exceptions import ResourceNotFoundError
+from app.domain.archive import TarFilter
+from app.domain.services.github_service import GitHubService
+from app.infrastructure.blob_store import BlobStore, git_blob_sha
+from app.infrastructure.github_client import GitHubClient
+from app.infrastructure.http_client import create_http_client
+from benchmarks.fake_github import FakeGitHub
+
+FILES = {
+    "README.md": "# repo\n",
+    "docs/guide.md": "guide\n",
+    "docs/api/index.md": "api\n",
+    "docs-old/legacy.md": "legacy\n",
+    "src/" + "very_long_directory_name/" * 5 + "main.py": "print('hi')\n",
+}
+
+
+def make_service(fake: FakeGitHub, tmp_path) -> GitHubService:
+    client = GitHubClient(create_http_client(transport=fake))
+    return GitHubService(client, blob_store=BlobStore(tmp_path / "blobs"))
+
+
+async def read_archive(service: GitHubService, **params) -> bytes:
+    archive = await service.open_archive("repo", **params)
+    return b"".join([chunk async for chunk in archive.chunks])
+
+
+def members(data: bytes) -> dict[str, bytes | None]:
+    with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as tar:
+        return {
+            info.name.split("/", 1)[1] if "/" in info.name else "": tar.extractfile(info).read() if info.isreg() else None
+            for info in tar
+        }
+
+
+@pytest.mark.asyncio
+async def test_archive_is_streamed_unchanged_and_warms_blob_store(tmp_path):
+    fake = FakeGitHub()
+    fake.seed_repo("repo", FILES)
+    service = make_service(fake, tmp_path)
+
+    data = await read_archive(service)
+
+    assert {path: content.decode() for path, content in members(data).items() if content is not None} == FILES
+    assert fake.calls[(None, "GET tarball")] == 1
+    assert fake.calls[(None, "GET codeload")] == 1
+    for content in FILES.values():
+        assert service.blob_store.get(git_blob_sha(content.encode())) is not None
+    service.close()
+
+
+@pytest.mark.asyncio
+async def test_prefix_keeps_only_subtree(tmp_path):
+    fake = FakeGitHub()
+    fake.seed_repo("repo", FILES)
+    service = make_service(fake, tmp_path)
+
+    docs = members(await read_archive(service, prefix="/docs/"))
+    long_path = next(path for path in FILES if path.startswith("src/"))
+    src = members(await read_archive(service, prefix=long_path))
+
+    assert docs == {"docs": None, "docs/api": None, "docs/guide.md": b"guide\n", "docs/api/index.md": b"api\n"}
+    assert src == {long_path: b"print('hi')\n"}
+    service.close()
+
+
+@pytest.mark.asyncio
+async def test_archive_of_unknown_ref_is_not_found(tmp_path):
+    fake = FakeGitHub()
+    fake.seed_repo("repo", FILES)
+    service = make_service(fake, tmp_path)
+
+    with pytest.raises(ResourceNotFoundError):
+        await service.open_archive("repo", ref="missing")
+    service.close()
+
+
+def test_filter_handles_arbitrary_chunk_boundaries():
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w", format=tarfile.GNU_FORMAT) as tar:
+        for path, content in FILES.items():
+            info = tarfile.TarInfo(f"root/{path}")
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content.encode()))
+    raw = buffer.getvalue()
+
+    parser = TarFilter("docs", collect_max_size=1024)
+    out = b"".join(parser.feed(raw[i:i + 7]) for i in range(0, len(raw), 7)) + parser.finish()
+
+    assert parser.ended and parser.matched == 2
+    assert len(parser.blobs) == len(FILES)
+    assert members(gzip.compress(out)) == {"docs/guide.md": b"guide\n", "docs/api/index.md": b"api\n"}
@@ -0,0 +1,76 @@
+# tests/test_batch_read.py
+
+import asyncio
+import base64
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_github_service
+from app.api.main import app
+from app.domain.services.github_service import GitHubService
+
+
+class SlowGitHubClient:
+    """
+    Клиент-заглушка: задержка чтения зависит от пути, отслеживает параллелизм.
+    """
+    def __init__(self, delays: dict[str, float]):
+        self.delays = delays
+        self.active = 0
+        self.max_active = 0
+
+    def fresh_blob_sha(self, repo: str, path: str) -> None:
+        return None
+
+    async def get_tree(self, repo: str, ref: str | None = None) -> dict:
+        # Размеры файлов неизвестны: все читаются по одному
+        return {"sha": None, "tree": []}
+
+    async def get_file_content(self, repo: str, path: str) -> dict:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(path, 0))
+        finally:
+            self.active -= 1
+        if path == "missing.txt":
+            request = httpx.Request("GET", "https://api.github.com")
+            raise httpx.HTTPStatusError("404", request=request, response=httpx.Response(404, request=request))
+        return {"content": base64.b64encode(f"body of {path}".encode()).decode()}
+
+
+@pytest.mark.asyncio
+async def test_results_are_yielded_as_they_complete(monkeypatch):
+    monkeypatch.setattr("app.domain.services.github_service.GITHUB_BATCH_READ_CONCURRENCY", 2)
+    client = SlowGitHubClient({"slow.txt": 0.05, "fast.txt": 0, "other.txt": 0.01})
+    service = GitHubService(client)
+
+    results = [r async for r in service.iter_file_contents("repo", ["slow.txt", "fast.txt", "other.txt", "missing.txt"])]
+
+    assert results[-1].path == "slow.txt"
+    assert client.max_active <= 2
+    by_path = {r.path: r for r in results}
+    assert by_path["fast.txt"].file.content == "body of fast.txt"
+    assert by_path["missing.txt"].status == 404
+    assert by_path["missing.txt"].file is None
+
+
+def test_batch_get_endpoint_streams_ndjson():
+    previous = app.dependency_overrides.get(get_github_service)
+    app.dependency_overrides[get_github_service] = lambda: GitHubService(SlowGitHubClient({}))
+    try:
+        response = TestClient(app).post("/repos/test-repo/files:batchGet", json={"paths": ["a.txt", "a.txt", "b.txt"]})
+    finally:
+        if previous is None:
+            app.dependency_overrides.pop(get_github_service, None)
+        else:
+            app.dependency_overrides[get_github_service] = previous
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["path"] for line in lines) == ["a.txt", "b.txt"]
+    assert all(line["status"] == 200 for line in lines)
@@ -0,0 +1,58 @@
+# tests/test_benchmarks.py
+
+import json
+
+import pytest
+
+from app.domain.services import github_service
+from benchmarks.__main__ import BASELINE, parse_args, run
+from benchmarks.fake_github import FakeGitHub
+from benchmarks.harness import compare
+from benchmarks.scenarios import SCENARIOS
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", sorted(SCENARIOS))
+async def test_scenario_runs_against_fake_github(name):
+    report = await SCENARIOS[name](FakeGitHub(), 0.1)
+
+    assert report
+    assert all(stats["errors"] == 0 for stats in report.values())
+
+
+@pytest.mark.asyncio
+async def test_fresh_run_matches_checked_in_baseline():
+    args = parse_args([])
+    report = await run(args)
+    baseline = json.loads(BASELINE.read_text())
+
+    assert report.keys() == baseline.keys()
+    assert compare(report, baseline, calls_tolerance=args.calls_tolerance) == []
+
+
+@pytest.mark.asyncio
+async def test_injected_regression_is_reported(monkeypatch):
+    # Без пакетного чтения через GraphQL batchGet снова читает файлы по одному
+    monkeypatch.setattr(github_service, "GITHUB_GRAPHQL_BATCH_SIZE", 1)
+    args = parse_args(["-s", "bulk_reads", "--latency", "0", "--jitter", "0"])
+    report = await run(args)
+
+    regressions = compare(report, json.loads(BASELINE.read_text()), calls_tolerance=args.calls_tolerance)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("bulk_reads: POST /repos/{repo}/files:batchGet: upstream/запрос")
+
+
+def test_regressions_are_reported():
+    base = {"s": {"GET /x": {"requests": 100, "p95_ms": 10.0, "upstream_per_request": 1.0, "errors": 0}}}
+    current = {"s": {"GET /x": {"requests": 100, "p95_ms": 30.0, "upstream_per_request": 2.0, "errors": 1}}}
+
+    assert len(compare(current, base, calls_tolerance=0.25, latency_tolerance=0.5, slack_ms=5)) == 3
+
+
+def test_latency_is_compared_only_on_request_with_enough_samples():
+    base = {"s": {"GET /x": {"requests": 5, "p95_ms": 10.0, "upstream_per_request": 1.0, "errors": 0}}}
+    current = {"s": {"GET /x": {"requests": 5, "p95_ms": 300.0, "upstream_per_request": 1.0, "errors": 0}}}
+
+    assert compare(current, base, calls_tolerance=0.25) == []
+    assert compare(current, base, calls_tolerance=0.25, latency_tolerance=0.5) == []
+    assert len(compare(current, base, calls_tolerance=0.25, latency_tolerance=0.5, min_samples=5)) == 1
@@ -0,0 +1,112 @@
+# tests/test_blob_store.py
+
+import os
+import stat
+import threading
+
+import pytest
+
+from app.domain.services.github_service import GitHubService
+from app.infrastructure.blob_store import BlobStore, git_blob_sha
+from app.infrastructure.github_client import GitHubClient
+from app.infrastructure.http_client import create_http_client
+from benchmarks.fake_github import FakeGitHub
+
+
+def test_blobs_round_trip_through_mmap(tmp_path):
+    store = BlobStore(tmp_path)
+    sha = git_blob_sha(b"hello\n")
+    store.put(sha, b"hello\n")
+
+    data = store.get(sha)
+    assert data[:] == b"hello\n"
+    assert (tmp_path / sha[:2] / sha[2:]).exists()
+    assert store.get(git_blob_sha(b"other")) is None
+
+    empty = git_blob_sha(b"")
+    store.put(empty, b"")
+    assert store.get(empty) == b""
+
+    with pytest.raises(ValueError):
+        store.put(git_blob_sha(b"x"), b"y")
+
+
+def test_least_recently_read_blobs_are_evicted(tmp_path):
+    store = BlobStore(tmp_path, max_bytes=250)
+    blobs = {name: name.encode() * 100 for name in "abc"}
+    shas = {name: git_blob_sha(data) for name, data in blobs.items()}
+    store.put(shas["a"], blobs["a"])
+    store.put(shas["b"], blobs["b"])
+    # "b" записан позже, но "a" прочитан последним
+    os.utime(tmp_path / shas["b"][:2] / shas["b"][2:], (1, 1))
+    store.get(shas["a"])
+    store.put(shas["c"], blobs["c"])
+
+    assert store.get(shas["b"]) is None
+    assert store.get(shas["a"]) is not None
+    assert store.usage() <= 250
+
+
+def test_directory_is_private_and_tampered_blobs_are_rejected(tmp_path):
+    directory = tmp_path / "blobs"
+    directory.mkdir(mode=0o755)
+    os.chmod(directory, 0o755)
+    store = BlobStore(directory)
+    assert stat.S_IMODE(directory.stat().st_mode) == 0o700
+
+    sha = git_blob_sha(b"trusted\n")
+    store.put(sha, b"trusted\n")
+    path = directory / sha[:2] / sha[2:]
+    path.write_bytes(b"poisoned\n")
+
+    # Свежий процесс ещё не сверял этот SHA: подменённый файл не отдаётся и удаляется
+    assert BlobStore(directory).get(sha) is None
+    assert not path.exists()
+
+
+def test_reads_update_recency_in_batches(tmp_path):
+    store = BlobStore(tmp_path, touch_interval=60)
+    shas = [git_blob_sha(str(i).encode()) for i in range(3)]
+    for i, sha in enumerate(shas):
+        store.put(sha, str(i).encode())
+        os.utime(tmp_path / sha[:2] / sha[2:], (1, 1))
+
+    for sha in shas:
+        store.get(sha)
+    assert all((tmp_path / sha[:2] / sha[2:]).stat().st_mtime == 1 for sha in shas)
+
+    store.touch()
+    assert all((tmp_path / sha[:2] / sha[2:]).stat().st_mtime > 1 for sha in shas)
+
+
+@pytest.mark.asyncio
+async def test_new_worker_serves_files_from_disk(tmp_path):
+    fake = FakeGitHub()
+    fake.seed_repo("repo", {"src/app.py": "print('hi')\n"})
+
+    warm = GitHubService(GitHubClient(create_http_client(transport=fake)), blob_store=BlobStore(tmp_path))
+    await warm.get_file_content("repo", "src/app.py")
+
+    # Новый процесс: памяти нет, SHA пути известен из дерева, содержимое — с диска
+    client = GitHubClient(create_http_client(transport=fake), trust_ttl=60)
+    store = BlobStore(tmp_path)
+    cold = GitHubService(client, blob_store=store)
+    await cold.get_repo_structure("repo")
+    before = fake.calls.copy()
+    # Чтение с диска (со сверкой SHA) идёт не в потоке цикла событий
+    reader_threads = []
+    get = store.get
+
+    def recording_get(sha):
+        reader_threads.append(threading.get_ident())
+        return get(sha)
+
+    store.get = recording_get
+    result = await cold.get_file_content("repo", "src/app.py")
+
+    assert result.content == "print('hi')\n"
+    assert fake.calls == before
+    assert reader_threads and threading.get_ident() not in reader_threads
+    warm.close()
+    cold.close()
+    await client.aclose()
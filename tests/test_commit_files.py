@@ -0,0 +1,133 @@
+# tests/test_commit_files.py
+
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_github_service
+from app.api.main import app
+from app.core.exceptions import InvalidRequestError
+from app.domain.models import CommitOperation
+from app.domain.services.github_service import GitHubService
+from app.infrastructure.github_client import GitHubClient
+from app.infrastructure.http_client import create_http_client
+
+
+class FakeGitData:
+    """
+    Минимальная имитация Git Data API: ветка main, которую «сдвигают»
+    один раз, чтобы проверить пересборку коммита.
+    """
+    def __init__(self, repo_info_status: int = 200):
+        self.repo_info_status = repo_info_status
+        self.head = "c0"
+        self.blobs = 0
+        self.trees = []
+        self.ref_updates = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/git/ref/heads/main"):
+            return httpx.Response(200, json={"object": {"sha": self.head}})
+        if "/git/commits/" in path:
+            return httpx.Response(200, json={"tree": {"sha": f"t-{path.rsplit('/', 1)[1]}"}})
+        if path.endswith("/git/blobs"):
+            self.blobs += 1
+            return httpx.Response(201, json={"sha": f"b{self.blobs}"})
+        if path.endswith("/git/trees"):
+            self.trees.append(json.loads(request.content))
+            return httpx.Response(201, json={"sha": f"tree{len(self.trees)}"})
+        if "/git/trees/" in path:
+            return httpx.Response(200, json={
+                "sha": path.rsplit("/", 1)[1],
+                "tree": [{"path": "README.md", "mode": "100755", "type": "blob", "sha": "r0"}],
+                "truncated": False,
+            })
+        if path.endswith("/git/commits"):
+            return httpx.Response(201, json={"sha": f"c{len(self.trees)}"})
+        if path.endswith("/git/refs/heads/main"):
+            self.ref_updates += 1
+            if self.ref_updates == 1:
+                self.head = "c-other"
+                return httpx.Response(422, json={"message": "Update is not a fast forward"})
+            return httpx.Response(200, json={"object": {"sha": json.loads(request.content)["sha"]}})
+        return httpx.Response(self.repo_info_status, json={"default_branch": "main"})
+
+
+@pytest.mark.asyncio
+async def test_commit_files_builds_one_commit_and_retries_fast_forward():
+    fake = FakeGitData()
+    client = GitHubClient(create_http_client(transport=httpx.MockTransport(fake)))
+    service = GitHubService(client)
+
+    result = await service.commit_files(
+        "repo",
+        [
+            CommitOperation(action="create", path="src", filename="a.py", content="a = 1"),
+            CommitOperation(action="update", path="", filename="README.md", content="# readme"),
+            CommitOperation(action="delete", path="old", filename="b.py"),
+        ],
+        "bulk edit",
+    )
+
+    assert fake.blobs == 2
+    assert len(fake.trees) == 2
+    assert fake.trees[1]["base_tree"] == "t-c-other"
+    assert fake.trees[1]["tree"][2] == {"path": "old/b.py", "mode": "100644", "type": "blob", "sha": None}
+    # Режим существующего исполняемого файла сохраняется, новые файлы — 100644
+    assert fake.trees[1]["tree"][1]["mode"] == "100755"
+    assert fake.trees[1]["tree"][0]["mode"] == "100644"
+    assert result.branch == "main"
+    assert result.commit_sha == "c2"
+    assert [f.action for f in result.files] == ["create", "update", "delete"]
+    assert client.blob_shas.get("repo", "src/a.py") is not None
+    assert client.blob_shas.get("repo", "old/b.py") is None
+
+
+@pytest.mark.asyncio
+async def test_cache_update_after_commit_does_not_call_github():
+    fake = FakeGitData(repo_info_status=500)
+    fake.ref_updates = 1
+    client = GitHubClient(create_http_client(transport=httpx.MockTransport(fake)))
+    service = GitHubService(client)
+
+    result = await service.commit_files(
+        "repo", [CommitOperation(action="create", path="", filename="a.py", content="a = 1")], "msg", branch="main"
+    )
+
+    # Ветка по умолчанию неизвестна: кэш путей сброшен, но запрос репозитория не отправлялся
+    assert result.commit_sha == "c1"
+    assert client.blob_shas.get("repo", "a.py") is None
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_commit_files_requires_content_for_writes():
+    service = GitHubService(GitHubClient(create_http_client(transport=httpx.MockTransport(FakeGitData()))))
+    with pytest.raises(InvalidRequestError, match="Не передано содержимое"):
+        await service.commit_files(
+            "repo",
+            [CommitOperation(action="update", path="", filename="a.py")],
+            "msg",
+        )
+
+
+@pytest.mark.parametrize("operations", [
+    [],
+    [{"action": "delete", "path": "", "filename": "a.py"}, {"action": "delete", "path": "", "filename": "a.py"}],
+    [{"action": "update", "path": "", "filename": "a.py"}],
+])
+def test_invalid_commit_request_is_rejected_with_400(operations):
+    service = GitHubService(GitHubClient(create_http_client(transport=httpx.MockTransport(FakeGitData()))))
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[get_github_service] = lambda: service
+    try:
+        response = TestClient(app).post("/repos/repo/commits", json={"message": "msg", "operations": operations})
+    finally:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(previous)
+        service.close()
+
+    assert response.status_code == 400
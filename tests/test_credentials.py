@@ -0,0 +1,126 @@
+# tests/test_credentials.py
+
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from app.core.config import MY_GITHUB_USERNAME
+from app.infrastructure.credentials import AppInstallationToken, Credential, StaticToken, TokenPool
+from app.infrastructure.github_client import GitHubClient, qualified_repo
+from app.infrastructure.http_client import create_http_client
+from app.infrastructure.rate_limiter import RateLimitScheduler
+
+
+def limits(remaining: int) -> dict:
+    return {"X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset": str(int(time.time()) + 3600)}
+
+
+def test_pool_prefers_credential_with_most_remaining_budget():
+    scheduler = RateLimitScheduler()
+    pool = TokenPool([StaticToken("a", "token-1"), StaticToken("b", "token-2"), StaticToken("c", "token-3", "acme")])
+    scheduler.update(limits(100), 200, credential="token-1")
+    # Неизвестный остаток лучше известного: токен ещё не пробовали
+    assert pool.select(scheduler).name == "token-2"
+
+    scheduler.update(limits(50), 200, credential="token-2")
+    scheduler.update(limits(4000), 200, credential="token-3")
+    assert pool.select(scheduler, owner=MY_GITHUB_USERNAME).name == "token-1"
+    assert pool.select(scheduler, owner="ACME").name == "token-3"
+
+    scheduler.update({"Retry-After": "60"}, 403, credential="token-1")
+    assert pool.select(scheduler, owner=MY_GITHUB_USERNAME).name == "token-2"
+    assert set(scheduler.snapshot()["resources"]) == {"core:token-1", "core:token-2", "core:token-3"}
+
+
+@pytest.mark.asyncio
+async def test_requests_spread_across_tokens_by_remaining_budget():
+    remaining = {"Bearer a": 5000, "Bearer b": 5000}
+    used = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        token = request.headers["Authorization"]
+        used.append(token)
+        remaining[token] -= 1
+        return httpx.Response(200, json={"default_branch": "main"}, headers=limits(remaining[token]))
+
+    pool = TokenPool([StaticToken("a", "token-1"), StaticToken("b", "token-2")])
+    client = GitHubClient(create_http_client(transport=httpx.MockTransport(handler)), tokens=pool)
+    for i in range(10):
+        await client.get_repo_info(f"repo{i}")
+
+    assert used.count("Bearer a") == used.count("Bearer b") == 5
+    await client.aclose()
+
+
+class FakeAppToken(AppInstallationToken):
+    def _app_jwt(self) -> str:
+        return "app-jwt"
+
+
+@pytest.mark.asyncio
+async def test_installation_token_is_refreshed_before_expiry():
+    expires_in = [3600, 3600]
+    issued = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers["Authorization"] == "Bearer app-jwt"
+        assert request.url.path == "/app/installations/42/access_tokens"
+        issued.append(f"ghs_{len(issued)}")
+        expires_at = datetime.fromtimestamp(time.time() + expires_in.pop(0), timezone.utc)
+        return httpx.Response(201, json={"token": issued[-1], "expires_at": expires_at.strftime("%Y-%m-%dT%H:%M:%SZ")})
+
+    http = create_http_client(transport=httpx.MockTransport(handler))
+    token = FakeAppToken("1", "key", "42", owner="acme")
+
+    assert await token.authorization(http) == "token ghs_0"
+    assert await token.authorization(http) == "token ghs_0"
+    token._expires_at = time.time() + 60  # скоро истечёт
+    assert await token.authorization(http) == "token ghs_1"
+    assert token.refreshes == 2
+    await http.aclose()
+
+
+@pytest.mark.asyncio
+async def test_owner_is_set_per_request():
+    paths = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        return httpx.Response(200, json={"default_branch": "main"})
+
+    client = GitHubClient(create_http_client(transport=httpx.MockTransport(handler)))
+    await client.get_repo_info(qualified_repo("acme", "tools"))
+    await client.get_repo_info(qualified_repo(MY_GITHUB_USERNAME, "tools"))
+
+    assert paths == ["/repos/acme/tools", f"/repos/{MY_GITHUB_USERNAME}/tools"]
+    assert qualified_repo(MY_GITHUB_USERNAME.upper(), "tools") == "tools"
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_waiting_request_moves_to_credential_with_budget():
+    scheduler = RateLimitScheduler()
+    pool = TokenPool([StaticToken("a", "token-1"), StaticToken("b", "token-2")], reselect_interval=0.01)
+    scheduler.update(limits(5000), 200, credential="token-1")
+    scheduler.update({**limits(0), "Retry-After": "60"}, 429, credential="token-2")
+
+    # Выбран token-1, но пока запрос ждёт, token-1 приостановлен, а token-2 снова доступен
+    scheduler.update({"Retry-After": "60"}, 429, credential="token-1")
+    waiting = asyncio.create_task(pool.acquire(scheduler))
+    await asyncio.sleep(0.02)
+    assert not waiting.done()
+    scheduler._budgets["core:token-2"].paused_until = 0.0
+    scheduler.update(limits(4000), 200, credential="token-2")
+
+    credential = await asyncio.wait_for(waiting, timeout=1)
+    assert credential.name == "token-2"
+    assert pool.reselected == 1
+    assert scheduler.snapshot()["queued"] == 0
+
+
+def test_credential_is_abstract():
+    with pytest.raises(TypeError):
+        Credential("plain")
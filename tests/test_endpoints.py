@@ -11,15 +11,15 @@ from app.core.exceptions import ResourceNotFoundError, InvalidRepositoryError
 
 # --- Сервис-заглушка для успешных сценариев ---
 class DummyGitHubService:
-    async def get_repo_structure(self, repo: str) -> list:
-        return [
+    async def get_repo_structure(self, repo: str, ref: str | None = None, **filters) -> RepoStructureResponse:
+        return RepoStructureResponse(repo=repo, tree=[
             {"path": "", "type": "dir"},
             {"path": "README.md", "type": "file"},
             {"path": "subdir", "type": "dir"},
             {"path": "subdir/nested.txt", "type": "file"},
-        ]
+        ])
 
-    async def get_file_content(self, repo: str, path: str) -> FileContentResponse:
+    async def get_file_content(self, repo: str, path: str, **ranges) -> FileContentResponse:
         text = f"Content of {path}"
         return FileContentResponse(path=path, content=text, encoding="utf-8")
 
@@ -47,10 +47,10 @@ class ErrorGitHubService:
     def __init__(self, exc):
         self.exc = exc
 
-    async def get_repo_structure(self, repo: str):
+    async def get_repo_structure(self, repo: str, ref: str | None = None, **filters):
         raise self.exc
 
-    async def get_file_content(self, repo: str, path: str):
+    async def get_file_content(self, repo: str, path: str, **ranges):
         raise self.exc
 
     async def create_file(self, repo: str, path: str, filename: str, content: str, message: str):
@@ -81,9 +81,21 @@ def test_get_repo_structure():
             {"path": "subdir", "type": "dir"},
             {"path": "subdir/nested.txt", "type": "file"},
         ],
+        "sha": None,
+        "truncated": False,
+        "next_cursor": None,
     }
 
 
+def test_owner_query_selects_repository():
+    app.dependency_overrides[get_github_service] = lambda: DummyGitHubService()
+    response = client.get("/repos/tools/structure", params={"owner": "acme"})
+    assert response.status_code == 200
+    assert response.json()["repo"] == "acme/tools"
+
+    assert client.get("/repos/tools/structure", params={"owner": "../admin"}).status_code == 422
+
+
 def test_get_file_content_root():
     response = client.get("/repos/test-repo/file?path=README.md")
     assert response.status_code == 200
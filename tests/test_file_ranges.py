@@ -0,0 +1,121 @@
+# tests/test_file_ranges.py
+
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_github_service
+from app.api.main import app
+from app.core.exceptions import InvalidRequestError, RangeNotSatisfiableError
+from app.domain.services.github_service import GitHubService
+from app.infrastructure.cache import DecodedBlob, DecodedBlobCache
+from app.infrastructure.github_client import GitHubClient
+from app.infrastructure.http_client import create_http_client
+from benchmarks.fake_github import FakeGitHub
+
+TEXT = "".join(f"line {i}\n" for i in range(1, 1001))
+
+
+def test_decoded_blob_line_index():
+    blob = DecodedBlob("sha", "a\n\nb".encode())
+
+    assert blob.total_lines == 3
+    assert blob.lines(2, 3) == "\nb"
+    assert blob.lines(3, 10) == "b"
+    assert DecodedBlob("sha", b"a\n").total_lines == 1
+    assert DecodedBlob("sha", b"").total_lines == 0
+
+
+def test_byte_range_snaps_to_utf8_boundaries():
+    blob = DecodedBlob("sha", "aжb".encode())
+
+    assert blob.byte_range(2, None) == (3, 3, "b")
+    assert blob.byte_range(0, 1) == (0, 2, "aж")
+    assert blob.byte_range(None, 1) == (3, 3, "b")
+    with pytest.raises(ValueError):
+        blob.byte_range(10, None)
+
+
+def test_decoded_blob_cache_is_bounded():
+    cache = DecodedBlobCache(max_bytes=10)
+    cache.put(DecodedBlob("a", b"123456"))
+    cache.put(DecodedBlob("b", b"123456"))
+
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+
+
+def make_service() -> GitHubService:
+    fake = FakeGitHub()
+    fake.seed_repo("repo", {"big.txt": TEXT})
+    return GitHubService(GitHubClient(create_http_client(transport=fake)))
+
+
+@pytest.mark.asyncio
+async def test_line_range_reads_reuse_decoded_blob(monkeypatch):
+    service = make_service()
+    full = await service.get_file_content("repo", "big.txt")
+    assert full.total_lines == 1000
+    assert full.content == TEXT
+
+    # Повторные чтения берут блоб из кэша по SHA и не декодируют base64
+    monkeypatch.setattr("app.domain.services.github_service.base64.b64decode", None)
+    page = await service.get_file_content("repo", "big.txt", start_line=10, end_line=12)
+    assert page.content == "line 10\nline 11\nline 12\n"
+    assert page.sha == full.sha
+    assert page.content_range == "lines 10-12/1000"
+
+    tail = await service.get_file_content("repo", "big.txt", start_line=999, end_line=5000)
+    assert tail.content_range == "lines 999-1000/1000"
+
+    with pytest.raises(RangeNotSatisfiableError):
+        await service.get_file_content("repo", "big.txt", start_line=1001)
+    with pytest.raises(InvalidRequestError):
+        await service.get_file_content("repo", "big.txt", start_line=5, end_line=2)
+    service.close()
+
+
+@pytest.mark.asyncio
+async def test_large_file_is_decoded_once_off_the_event_loop(monkeypatch):
+    fake = FakeGitHub()
+    big = "".join(f"row {i}\n" for i in range(20_000))
+    fake.seed_repo("repo", {"huge.txt": big})
+    service = GitHubService(GitHubClient(create_http_client(transport=fake)))
+    loop_thread = threading.get_ident()
+    decode_threads = []
+    decode = DecodedBlob.decode.__func__
+
+    def recording_decode(cls, sha, data):
+        decode_threads.append(threading.get_ident())
+        return decode(cls, sha, data)
+
+    monkeypatch.setattr(DecodedBlob, "decode", classmethod(recording_decode))
+    monkeypatch.setattr(DecodedBlob, "text", lambda self: pytest.fail("текст декодирован повторно"))
+    result = await service.get_file_content("repo", "huge.txt")
+    assert result.content == big
+    assert result.total_lines == 20_000
+    assert len(decode_threads) == 1 and decode_threads[0] != loop_thread
+    service.close()
+
+
+def test_range_header_returns_partial_content():
+    service = make_service()
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[get_github_service] = lambda: service
+    try:
+        client = TestClient(app)
+        partial = client.get("/repos/repo/file", params={"path": "big.txt"}, headers={"Range": "bytes=0-6"})
+        ignored = client.get("/repos/repo/file", params={"path": "big.txt"}, headers={"Range": "bytes=0-1,5-6"})
+        outside = client.get("/repos/repo/file", params={"path": "big.txt"}, headers={"Range": "bytes=99999-"})
+    finally:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(previous)
+        service.close()
+
+    assert partial.status_code == 206
+    assert partial.headers["Content-Range"] == f"bytes 0-6/{len(TEXT)}"
+    assert partial.json()["content"] == "line 1\n"
+    assert ignored.status_code == 200
+    assert ignored.json()["content"] == TEXT
+    assert outside.status_code == 416
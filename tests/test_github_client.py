@@ -0,0 +1,175 @@
+# tests/test_github_client.py
+
+import httpx
+import pytest
+
+from app.infrastructure.cache import CachedResponse, ResponseCache
+from app.infrastructure.github_client import GitHubClient
+from app.infrastructure.http_client import create_http_client
+from benchmarks.fake_github import FakeGitHub
+
+
+def make_client(handler) -> GitHubClient:
+    """
+    GitHubClient поверх MockTransport, обрабатывающего запросы функцией handler.
+    """
+    return GitHubClient(create_http_client(transport=httpx.MockTransport(handler)))
+
+
+@pytest.mark.asyncio
+async def test_requests_share_one_http_client():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        if request.url.path.endswith("/git/trees/main"):
+            return httpx.Response(200, json={"tree": [{"path": "a.txt", "type": "blob"}]})
+        return httpx.Response(200, json={"default_branch": "main"})
+
+    client = make_client(handler)
+    http = client._http
+    tree = await client.list_repo_tree("repo")
+    await client.get_repo_info("repo")
+
+    assert tree == [{"path": "a.txt", "type": "blob"}]
+    assert len(seen) == 3
+    assert client._http is http
+    assert not http.is_closed
+    await http.aclose()
+
+
+def test_http_client_pool_settings():
+    http = create_http_client()
+    assert http.timeout.connect is not None
+    assert http.timeout.read is not None
+    assert http.timeout.pool is not None
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_served_from_cache_on_304():
+    conditional = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("If-None-Match") == '"v1"':
+            conditional.append(request.url.path)
+            return httpx.Response(304)
+        return httpx.Response(200, json={"sha": "abc", "content": ""}, headers={"ETag": '"v1"'})
+
+    client = make_client(handler)
+    first = await client.get_file_content("repo", "a.txt")
+    second = await client.get_file_content("repo", "a.txt")
+
+    assert first == second == {"sha": "abc", "content": ""}
+    assert len(conditional) == 1
+    assert client.cache.stats()["hits"] == 1
+    assert client.cache.stats()["misses"] == 1
+    assert client.cache.stats()["revalidations"] == 1
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2, max_bytes=100)
+    cache.set("a", CachedResponse('"a"', None, {}, 10))
+    cache.set("b", CachedResponse('"b"', None, {}, 10))
+    cache.get("a")
+    cache.set("c", CachedResponse('"c"', None, {}, 10))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+    cache.set("big", CachedResponse('"big"', None, {}, 95))
+    assert len(cache) == 1
+    assert cache.stats()["bytes"] == 95
+
+
+@pytest.mark.asyncio
+async def test_default_branch_is_cached_between_tree_requests():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        if "/git/trees/" in request.url.path:
+            return httpx.Response(200, json={"tree": []})
+        return httpx.Response(200, json={"default_branch": "main"})
+
+    client = make_client(handler)
+    await client.list_repo_tree("repo")
+    await client.list_repo_tree("repo")
+    await client.list_repo_tree("repo", ref="v1.0")
+
+    assert len(seen) == 4
+    assert sum(1 for path in seen if "/git/trees/" not in path) == 1
+    assert seen[-1].endswith("/git/trees/v1.0")
+
+
+@pytest.mark.asyncio
+async def test_stale_default_branch_is_resolved_again_on_404():
+    branches = iter(["master", "main"])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/git/trees/master"):
+            return httpx.Response(404, json={"message": "Not Found"})
+        if request.url.path.endswith("/git/trees/main"):
+            return httpx.Response(200, json={"tree": [{"path": "a", "type": "blob"}]})
+        return httpx.Response(200, json={"default_branch": next(branches)})
+
+    client = make_client(handler)
+    tree = await client.list_repo_tree("repo")
+
+    assert tree == [{"path": "a", "type": "blob"}]
+    assert client.repo_metadata.get("repo").default_branch == "main"
+
+
+@pytest.mark.asyncio
+async def test_update_uses_indexed_sha_without_pre_write_get():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path))
+        if request.method == "PUT":
+            assert b'"sha":"old"' in request.content
+            return httpx.Response(200, json={"content": {"path": "src/a.py", "sha": "new"}, "commit": {"sha": "c1"}})
+        return httpx.Response(500)
+
+    client = make_client(handler)
+    client.blob_shas.set("repo", "src/a.py", "old")
+    await client.update_file("repo", "src", "a.py", "x = 1", "msg")
+
+    assert [method for method, _ in calls] == ["PUT"]
+    assert client.blob_shas.get("repo", "src/a.py") == "new"
+
+
+@pytest.mark.asyncio
+async def test_stale_indexed_sha_is_refetched_once_on_conflict():
+    puts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "PUT":
+            puts.append(request.content)
+            if b'"sha":"stale"' in request.content:
+                return httpx.Response(409, json={"message": "sha does not match"})
+            return httpx.Response(200, json={"content": {"path": "src/a.py", "sha": "new"}})
+        if request.url.path.endswith("/contents/src"):
+            return httpx.Response(200, json=[{"type": "file", "path": "src/a.py", "sha": "fresh"}])
+        return httpx.Response(404)
+
+    client = make_client(handler)
+    client.blob_shas.set("repo", "src/a.py", "stale")
+    await client.update_file("repo", "src", "a.py", "x = 1", "msg")
+
+    assert len(puts) == 2
+    assert b'"sha":"fresh"' in puts[1]
+
+
+@pytest.mark.asyncio
+async def test_conflict_refetches_sha_past_trusted_listing():
+    fake = FakeGitHub()
+    fake.seed_repo("repo", {"src/a.py": "x = 1\n"})
+    client = GitHubClient(create_http_client(transport=fake), trust_ttl=60)
+    # Листинг папки закэширован как свежий, затем файл меняется в обход сервиса
+    await client._fetch_blob_sha("repo", "src/a.py")
+    fake.repo("repo").commit_files({"src/a.py": b"x = 2\n"}, "External")
+
+    await client.update_file("repo", "src", "a.py", "x = 3\n", "msg")
+
+    assert fake.repo("repo").head_files()["src/a.py"] == fake.repo("repo").put_blob(b"x = 3\n")
+    await client.aclose()
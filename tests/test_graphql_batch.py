@@ -0,0 +1,76 @@
+# tests/test_graphql_batch.py
+
+import pytest
+
+from app.core.exceptions import GraphQLError
+from app.domain.services.github_service import GitHubService
+from app.infrastructure.blob_store import BlobStore
+from app.infrastructure.github_client import GitHubClient
+from app.infrastructure.http_client import create_http_client
+from benchmarks.fake_github import FakeGitHub
+
+
+def make_service(fake: FakeGitHub, tmp_path) -> GitHubService:
+    client = GitHubClient(create_http_client(transport=fake))
+    return GitHubService(client, blob_store=BlobStore(tmp_path / "blobs"))
+
+
+async def read_all(service: GitHubService, paths: list[str]) -> dict:
+    return {result.path: result async for result in service.iter_file_contents("repo", paths)}
+
+
+@pytest.mark.asyncio
+async def test_small_files_are_read_in_graphql_chunks(tmp_path):
+    fake = FakeGitHub()
+    files = {f"conf/{i}.yml": f"key: {i}\n" for i in range(120)}
+    fake.seed_repo("repo", files | {"big.txt": "x" * 200 * 1024, "logo.png": b"\x89PNG\0"})
+    service = make_service(fake, tmp_path)
+
+    results = await read_all(service, list(files) + ["big.txt", "logo.png", "missing.txt"])
+
+    assert {path: results[path].file.content for path in files} == files
+    assert results["big.txt"].status == 200
+    assert results["logo.png"].status == 415
+    assert results["missing.txt"].status == 404
+    assert fake.calls[(None, "POST graphql")] == 3
+    # По одному через contents API читаются только большой, двоичный и отсутствующий файлы
+    assert fake.calls[(None, "GET contents")] == 3
+
+    # Повторное чтение: SHA из дерева, содержимое из памяти
+    again = await read_all(service, list(files))
+    assert all(result.status == 200 for result in again.values())
+    assert fake.calls[(None, "POST graphql")] == 3
+    service.close()
+
+
+@pytest.mark.asyncio
+async def test_chunks_respect_byte_budget(monkeypatch, tmp_path):
+    monkeypatch.setattr("app.domain.services.github_service.GITHUB_GRAPHQL_BATCH_MAX_BYTES", 1000)
+    fake = FakeGitHub()
+    files = {f"src/{i}.py": "#" * 399 + "\n" for i in range(6)}
+    fake.seed_repo("repo", files)
+    service = make_service(fake, tmp_path)
+
+    results = await read_all(service, list(files))
+
+    assert all(result.status == 200 for result in results.values())
+    assert fake.calls[(None, "POST graphql")] == 3
+    service.close()
+
+
+@pytest.mark.asyncio
+async def test_graphql_failure_falls_back_to_rest(monkeypatch, tmp_path):
+    fake = FakeGitHub()
+    files = {"a.txt": "a", "b.txt": "b"}
+    fake.seed_repo("repo", files)
+    service = make_service(fake, tmp_path)
+
+    async def failing(repo, expressions):
+        raise GraphQLError("GitHub GraphQL error: Something went wrong")
+
+    monkeypatch.setattr(service.github_client, "get_blobs_graphql", failing)
+    results = await read_all(service, list(files))
+
+    assert {path: result.file.content for path, result in results.items()} == files
+    assert fake.calls[(None, "GET contents")] == 2
+    service.close()
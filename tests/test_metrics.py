@@ -0,0 +1,76 @@
+# tests/test_metrics.py
+
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.main import app
+from app.infrastructure.github_client import GitHubClient
+from app.infrastructure.http_client import create_http_client
+from app.infrastructure.metrics import Metrics, MetricsRegistry, upstream_template
+
+
+def test_histogram_and_labels_are_rendered_in_prometheus_format():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    counter = registry.counter("events_total", "Events", ("name",))
+    histogram.observe(("/a",), 0.05)
+    histogram.observe(("/a",), 0.5)
+    histogram.observe(("/a",), 5.0)
+    counter.inc(('say "hi"',), 2)
+
+    text = registry.render()
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+    assert 'events_total{name="say \\"hi\\""} 2' in text
+
+
+def test_upstream_paths_are_reduced_to_templates():
+    assert upstream_template("/repos/me/repo/contents/src/a.py") == "/repos/{owner}/{repo}/contents/{path}"
+    assert upstream_template("/repos/me/repo/git/trees/main") == "/repos/{owner}/{repo}/git/trees/{sha}"
+    assert upstream_template("/repos/me/repo/git/trees") == "/repos/{owner}/{repo}/git/trees"
+    assert upstream_template("/repos/me/repo") == "/repos/{owner}/{repo}"
+
+
+@pytest.mark.asyncio
+async def test_client_reports_upstream_calls_cache_and_rate_limit():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        headers = {
+            "ETag": '"v1"',
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Remaining": "4990",
+            "X-RateLimit-Reset": str(int(time.time()) + 60),
+        }
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, json={"sha": "t", "tree": []}, headers=headers)
+
+    metrics = Metrics()
+    client = GitHubClient(create_http_client(transport=httpx.MockTransport(handler)), metrics=metrics)
+    await client.get_tree("repo", ref="main")
+    await client.get_tree("repo", ref="main")
+
+    text = metrics.registry.render()
+    endpoint = 'endpoint="/repos/{owner}/{repo}/git/trees/{sha}"'
+    assert f'github_requests_total{{method="GET",{endpoint},status="200"}} 1' in text
+    assert f'github_requests_total{{method="GET",{endpoint},status="304"}} 1' in text
+    assert 'github_cache_events_total{event="hits"} 1' in text
+    assert 'github_cache_ratio{kind="hit"} 0.5' in text
+    assert 'github_rate_limit_remaining{resource="core"} 4990' in text
+    assert 'github_retry_events_total{event="attempts"} 2' in text
+    assert 'github_circuit_breaker_state{host="api.github.com",state="closed"} 1' in text
+    assert 'github_circuit_breaker_rejected_total{host="api.github.com"} 0' in text
+
+
+def test_api_requests_are_measured_by_route_template():
+    client = TestClient(app)
+    client.get("/metrics")
+    text = client.get("/metrics").text
+
+    assert 'http_request_duration_seconds_count{method="GET",route="/metrics",status="200"}' in text
+    assert 'http_requests_in_flight{method="GET",route="/metrics"} 1' in text
@@ -0,0 +1,98 @@
+# tests/test_rate_limiter.py
+
+import asyncio
+import time
+
+import pytest
+
+from app.infrastructure.rate_limiter import Priority, RateLimitScheduler
+
+
+def headers(remaining: int, reset_in: float, **extra) -> dict:
+    return {
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(time.time() + reset_in),
+        **extra,
+    }
+
+
+@pytest.mark.asyncio
+async def test_healthy_budget_is_not_throttled():
+    scheduler = RateLimitScheduler()
+    scheduler.update(headers(4000, 3600), 200)
+    for _ in range(50):
+        await asyncio.wait_for(scheduler.acquire(), timeout=0.1)
+    assert scheduler.snapshot()["resources"]["core"]["remaining"] == 3950
+
+
+@pytest.mark.asyncio
+async def test_bulk_waits_below_reserve_while_interactive_proceeds():
+    scheduler = RateLimitScheduler(bulk_reserve=100, pacing_threshold=10)
+    scheduler.update(headers(50, 3600), 200)
+
+    await asyncio.wait_for(scheduler.acquire(Priority.INTERACTIVE), timeout=0.1)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(scheduler.acquire(Priority.BULK), timeout=0.05)
+    assert scheduler.snapshot()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_interactive_is_served_before_queued_bulk():
+    scheduler = RateLimitScheduler()
+    scheduler.update({"Retry-After": "0.05"}, 403)
+    order = []
+
+    async def request(name: str, priority: Priority):
+        await scheduler.acquire(priority)
+        order.append(name)
+
+    bulk = asyncio.create_task(request("bulk", Priority.BULK))
+    await asyncio.sleep(0.01)
+    interactive = asyncio.create_task(request("interactive", Priority.INTERACTIVE))
+    await asyncio.gather(bulk, interactive)
+
+    assert order == ["interactive", "bulk"]
+
+
+def test_plain_forbidden_does_not_pause():
+    scheduler = RateLimitScheduler()
+    scheduler.update(headers(4000, 3600), 403, "Resource not accessible by integration")
+    assert scheduler.snapshot()["resources"]["core"]["paused_for"] == 0
+
+    scheduler.update(headers(4000, 3600), 403, "You have exceeded a secondary rate limit")
+    assert scheduler.snapshot()["resources"]["core"]["paused_for"] > 0
+
+
+@pytest.mark.asyncio
+async def test_mutations_to_one_repo_are_serialized():
+    scheduler = RateLimitScheduler()
+    active, peak = 0, 0
+
+    async def mutate():
+        nonlocal active, peak
+        async with scheduler.mutation_lock("repo"):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(mutate() for _ in range(5)))
+    assert peak == 1
+
+
+@pytest.mark.asyncio
+async def test_paused_budget_does_not_block_other_budgets():
+    scheduler = RateLimitScheduler()
+    scheduler.update({"Retry-After": "60"}, 429, credential="token-1")
+    waiting = asyncio.create_task(scheduler.acquire(resource="core", credential="token-1"))
+    await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(scheduler.acquire(resource="core", credential="token-2"), timeout=0.5)
+    await asyncio.wait_for(scheduler.acquire(resource="graphql", credential="token-1"), timeout=0.5)
+    assert scheduler.snapshot()["queued"] == 1
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert scheduler.snapshot()["queued"] == 0
@@ -0,0 +1,64 @@
+# tests/test_raw_file.py
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_github_service
+from app.api.main import app
+from app.domain.services.github_service import GitHubService
+from app.infrastructure.github_client import GitHubClient
+from app.infrastructure.http_client import create_http_client
+
+BINARY = bytes(range(256)) * 1024
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    assert request.headers["Accept"] == "application/vnd.github.raw"
+    if request.headers.get("If-None-Match") == '"blob-etag"':
+        return httpx.Response(304, headers={"ETag": '"blob-etag"'})
+    if request.url.path.endswith("/contents/missing.bin"):
+        return httpx.Response(404, json={"message": "Not Found"})
+    return httpx.Response(200, content=BINARY, headers={"ETag": '"blob-etag"'})
+
+
+class StreamingTransport(httpx.AsyncBaseTransport):
+    """
+    Транспорт, отдающий тело потоком (MockTransport читает тело заранее,
+    и aiter_raw на таком ответе недоступен).
+    """
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = handler(request)
+        return httpx.Response(response.status_code, headers=response.headers, stream=httpx.ByteStream(response.content))
+
+
+def request_raw(url: str, headers: dict | None = None) -> httpx.Response:
+    client = GitHubClient(create_http_client(transport=StreamingTransport()))
+    previous = app.dependency_overrides.get(get_github_service)
+    app.dependency_overrides[get_github_service] = lambda: GitHubService(client)
+    try:
+        return TestClient(app).get(url, headers=headers or {})
+    finally:
+        if previous is None:
+            app.dependency_overrides.pop(get_github_service, None)
+        else:
+            app.dependency_overrides[get_github_service] = previous
+
+
+def test_raw_streams_binary_with_headers():
+    response = request_raw("/repos/test-repo/raw?path=assets/logo.png")
+    assert response.status_code == 200
+    assert response.content == BINARY
+    assert response.headers["etag"] == '"blob-etag"'
+    assert response.headers["content-length"] == str(len(BINARY))
+    assert response.headers["content-type"] == "image/png"
+
+
+def test_raw_passes_not_modified_through():
+    response = request_raw("/repos/test-repo/raw?path=assets/logo.png", {"If-None-Match": '"blob-etag"'})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_raw_missing_file_is_404():
+    response = request_raw("/repos/test-repo/raw?path=missing.bin")
+    assert response.status_code == 404
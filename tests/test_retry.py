@@ -0,0 +1,126 @@
+# tests/test_retry.py
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.exceptions import UpstreamUnavailableError
+from app.infrastructure.github_client import GitHubClient
+from app.infrastructure.http_client import create_http_client
+from app.infrastructure.retry import CircuitBreaker, RetryPolicy
+
+
+def make_client(handler, **policy) -> GitHubClient:
+    return GitHubClient(
+        create_http_client(transport=httpx.MockTransport(handler)),
+        retry_policy=RetryPolicy(base_delay=0.001, max_delay=0.001, **policy),
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_is_retried_after_transient_errors():
+    responses = iter([
+        httpx.ConnectError("connection reset"),
+        httpx.Response(503),
+        httpx.Response(200, json={"default_branch": "main"}),
+    ])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        result = next(responses)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    client = make_client(handler)
+    info = await client.get_repo_info("repo")
+
+    assert info["default_branch"] == "main"
+    assert client.retry_policy.snapshot() == {"attempts": 3, "retries": 2, "exhausted": 0}
+
+
+@pytest.mark.asyncio
+async def test_create_without_sha_precondition_is_not_retried():
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(502)
+
+    client = make_client(handler)
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.create_file("repo", "", "a.txt", "a", "msg")
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_and_fails_fast():
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        raise httpx.ConnectError("down")
+
+    client = make_client(handler, max_attempts=1)
+    client.breakers["api.github.com"] = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    for _ in range(2):
+        with pytest.raises(UpstreamUnavailableError):
+            await client.get_repo_info("repo")
+    with pytest.raises(UpstreamUnavailableError, match="отклонён"):
+        await client.get_repo_info("repo")
+
+    assert calls == 2
+    assert client.breakers["api.github.com"].snapshot()["state"] == "open"
+
+
+def test_half_open_breaker_allows_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_releases_half_open_breaker():
+    started = asyncio.Event()
+    hang = True
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if hang:
+            started.set()
+            await asyncio.sleep(60)
+        return httpx.Response(200, json={"default_branch": "main"})
+
+    client = make_client(handler, max_attempts=1)
+    breaker = client.breakers["api.github.com"] = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    probe = asyncio.create_task(client.get_repo_info("repo"))
+    await started.wait()
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    await asyncio.sleep(0.01)  # отмена доходит до общей задачи single-flight
+
+    hang = False
+    assert (await client.get_repo_info("repo"))["default_branch"] == "main"
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_hung_probe_times_out_and_reopens_breaker():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(60)
+
+    client = make_client(handler, max_attempts=1)
+    breaker = client.breakers["api.github.com"] = CircuitBreaker(failure_threshold=1, reset_timeout=60, probe_timeout=0.01)
+    breaker.record_failure()
+    breaker.opened_at -= 60
+
+    with pytest.raises(UpstreamUnavailableError):
+        await client.get_repo_info("repo")
+    assert breaker.state == "open"
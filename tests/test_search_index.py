@@ -0,0 +1,125 @@
+# tests/test_search_index.py
+
+import stat
+
+import pytest
+
+from app.core.exceptions import InvalidRequestError
+from app.domain.search_index import SearchIndex, SearchIndexStore, compile_query
+from app.domain.services.github_service import GitHubService
+from app.infrastructure.blob_store import BlobStore, git_blob_sha
+from app.infrastructure.github_client import GitHubClient
+from app.infrastructure.http_client import create_http_client
+from benchmarks.fake_github import FakeGitHub
+
+
+def build(tmp_path, files: dict[str, str]) -> SearchIndex:
+    index = SearchIndex(BlobStore(tmp_path / "blobs"))
+    paths = {path: git_blob_sha(text.encode()) for path, text in files.items()}
+    index.update("tree", paths, {paths[path]: text for path, text in files.items()})
+    return index
+
+
+def search(index: SearchIndex, query: str, **kwargs) -> list[tuple[str, int]]:
+    regex = kwargs.pop("regex", False)
+    pattern, required = compile_query(query, regex=regex, ignore_case=kwargs.pop("ignore_case", False))
+    matches, _ = index.search(pattern, required, **kwargs)
+    return [(match["path"], match["line"]) for match in matches]
+
+
+def test_literal_and_regex_search_report_lines(tmp_path):
+    index = build(tmp_path, {
+        "app/main.py": "import os\n\ndef handler(request):\n    return os.getcwd()\n",
+        "app/util.py": "def helper():\n    pass\n",
+        "README.md": "Call handler() to start\n",
+    })
+
+    assert search(index, "handler") == [("README.md", 1), ("app/main.py", 3)]
+    assert search(index, r"def \w+\(", regex=True) == [("app/main.py", 3), ("app/util.py", 1)]
+    assert search(index, "HANDLER", ignore_case=True, prefix="app") == [("app/main.py", 3)]
+    assert search(index, "HANDLER") == []
+
+
+def test_regex_alternation_scans_all_files(tmp_path):
+    index = build(tmp_path, {"a.txt": "alpha\n", "b.txt": "beta\n"})
+
+    assert compile_query("alpha|beta", regex=True)[1] == set()
+    assert search(index, "alpha|beta", regex=True) == [("a.txt", 1), ("b.txt", 1)]
+
+
+def test_update_drops_unreferenced_blobs(tmp_path):
+    index = build(tmp_path, {"a.txt": "needle\n", "b.txt": "hay\n"})
+    a, b = index.paths["a.txt"], index.paths["b.txt"]
+    index.update("tree2", {"b.txt": b}, {})
+
+    assert search(index, "needle") == []
+    assert index.missing([a, b]) == {a}
+    assert all(a not in postings for postings in index._postings.values())
+
+
+def test_index_round_trips_through_disk(tmp_path):
+    index = build(tmp_path, {"src/x.py": "value = 42\n"})
+    index.save(tmp_path / "repo.json.gz")
+
+    loaded = SearchIndex.load(tmp_path / "repo.json.gz", index.store)
+    assert loaded.tree_sha == "tree"
+    assert search(loaded, "= 42") == [("src/x.py", 1)]
+    assert SearchIndex.load(tmp_path / "missing.json.gz", index.store).tree_sha is None
+
+
+def test_evicted_texts_are_fetched_again(tmp_path):
+    index = build(tmp_path, {"a.txt": "needle\n", "b.txt": "needle too\n"})
+    index.save(tmp_path / "repo.json.gz")
+    sha = index.paths["a.txt"]
+    (index.store.directory / sha[:2] / sha[2:]).unlink()
+
+    # Описание на диске не содержит текстов; недостающий блоб делает индекс устаревшим
+    loaded = SearchIndex.load(tmp_path / "repo.json.gz", index.store)
+    assert loaded.tree_sha is None and loaded.missing(index.paths.values()) == {sha}
+
+    assert search(index, "needle") == [("b.txt", 1)]
+    assert index.tree_sha is None and index.missing(index.paths.values()) == {sha}
+
+
+@pytest.mark.asyncio
+async def test_search_fetches_only_changed_blobs(tmp_path):
+    fake = FakeGitHub()
+    fake.seed_repo("repo", {f"src/m{i}.py": f"def f{i}():\n    return {i}\n" for i in range(10)} | {"logo.png": b"\x89PNG\0"})
+    client = GitHubClient(create_http_client(transport=fake))
+    blobs = BlobStore(tmp_path / "blobs")
+    service = GitHubService(client, search_indexes=SearchIndexStore(tmp_path), blob_store=blobs)
+
+    first = await service.search_code("repo", "return 7")
+    assert [(m["path"], m["line"]) for m in first.matches] == [("src/m7.py", 2)]
+    assert fake.calls[(None, "GET git/blobs")] == 11
+
+    fake.repo("repo").commit_files({"src/m3.py": b"def f3():\n    return 70\n"}, "Change")
+    second = await service.search_code("repo", "return 7")
+    assert [m["path"] for m in second.matches] == ["src/m3.py", "src/m7.py"]
+    assert fake.calls[(None, "GET git/blobs")] == 12
+
+    # Новый процесс подхватывает индекс с диска и не загружает блобы заново
+    fresh = GitHubService(client, search_indexes=SearchIndexStore(tmp_path), blob_store=blobs)
+    await fresh.search_code("repo", "return 7")
+    assert fake.calls[(None, "GET git/blobs")] == 12
+
+    with pytest.raises(InvalidRequestError):
+        await service.search_code("repo", "(", regex=True)
+    service.close()
+    fresh.close()
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_index_directory_is_created_on_first_write(tmp_path, search_index_dir):
+    fake = FakeGitHub()
+    fake.seed_repo("repo", {"a.py": "x = 1\n"})
+    client = GitHubClient(create_http_client(transport=fake))
+    service = GitHubService(client, blob_store=BlobStore(tmp_path / "blobs"))
+    assert not search_index_dir.exists()
+
+    await service.search_code("repo", "x = 1")
+    assert (search_index_dir / "blobs").is_dir()
+    assert stat.S_IMODE((search_index_dir / "blobs").stat().st_mode) == 0o700
+    service.close()
+    await client.aclose()
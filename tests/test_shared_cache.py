@@ -0,0 +1,107 @@
+# tests/test_shared_cache.py
+
+import math
+import sqlite3
+import time
+
+import pytest
+
+from app.infrastructure.cache import CachedResponse, RepoMetadataCache, ResponseCache
+from app.infrastructure.github_client import GitHubClient
+from app.infrastructure.http_client import create_http_client
+from app.infrastructure.shared_cache import SharedCache, SQLiteSharedCache
+from benchmarks.fake_github import FakeGitHub
+
+
+def open_shared(tmp_path, **kwargs) -> SQLiteSharedCache:
+    return SQLiteSharedCache(tmp_path / "cache.db", poll_interval=0, **kwargs)
+
+
+def test_responses_are_batched_and_visible_to_other_workers(tmp_path):
+    first, second = open_shared(tmp_path, batch_size=2, flush_interval=60), open_shared(tmp_path)
+    first.put_response("https://api/a", '"a"', None, {"a": 1}, 7, 0.0)
+
+    # До записи пакета запись видна только своему процессу
+    assert first.get_response("https://api/a")[2] == {"a": 1}
+    assert second.get_response("https://api/a") is None
+
+    time.sleep(0.05)
+    assert second.get_response("https://api/a") is None
+
+    # Полный пакет пишется потоком записи без явного flush
+    first.put_response("https://api/tree/" + "0" * 40, '"t"', None, [1, 2], 5, math.inf)
+    deadline = time.monotonic() + 2
+    while second.get_response("https://api/a") is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert second.get_response("https://api/a") == ('"a"', None, {"a": 1}, 7, 0.0)
+    assert second.get_response("https://api/tree/" + "0" * 40)[4] == math.inf
+    first.close()
+    second.close()
+
+
+def test_invalidations_reach_memory_caches_of_other_workers(tmp_path):
+    first, second = open_shared(tmp_path), open_shared(tmp_path)
+    cache_a, cache_b = ResponseCache(backend=first), ResponseCache(backend=second)
+    repos_a, repos_b = RepoMetadataCache(backend=first), RepoMetadataCache(backend=second)
+
+    cache_a.set("https://api/repo/contents/a", CachedResponse('"1"', None, "body", 4))
+    repos_a.set("repo", "main", "a" * 40)
+    first.flush()
+    assert cache_b.get("https://api/repo/contents/a").etag == '"1"'
+    assert repos_b.get("repo").head_sha == "a" * 40
+
+    cache_a.invalidate_prefix("https://api/repo/contents/")
+    repos_a.update_head("repo", "b" * 40)
+    first.flush()
+    assert cache_b.get("https://api/repo/contents/a") is None
+    assert repos_b.get("repo").head_sha == "b" * 40
+
+    repos_b.invalidate("repo")
+    second.flush()
+    assert repos_a.get("repo") is None
+    first.close()
+    second.close()
+
+
+@pytest.mark.asyncio
+async def test_new_worker_revalidates_with_shared_etags(tmp_path):
+    fake = FakeGitHub()
+    fake.seed_repo("repo", {"docs/a.md": "a"})
+    first = GitHubClient(create_http_client(transport=fake), shared_cache=open_shared(tmp_path))
+    await first.get_file_content("repo", "docs/a.md")
+    first.shared_cache.flush()
+
+    second = GitHubClient(create_http_client(transport=fake), shared_cache=open_shared(tmp_path))
+    await second.get_file_content("repo", "docs/a.md")
+
+    # Второй воркер сразу отправляет условный запрос и получает 304
+    assert second.cache.revalidations == second.cache.hits == 1
+    assert second.cache.misses == 0
+    for client in (first, second):
+        client.shared_cache.close()
+        await client.aclose()
+
+
+def test_locked_database_does_not_block_callers(tmp_path):
+    shared = open_shared(tmp_path, batch_size=1, busy_timeout=0.5)
+    shared.put_response("https://api/a", '"a"', None, {"a": 1}, 7, 0.0)
+    shared.flush()
+    other = sqlite3.connect(tmp_path / "cache.db", isolation_level=None)
+    other.execute("BEGIN EXCLUSIVE")
+
+    started = time.monotonic()
+    shared.put_response("https://api/b", '"b"', None, {"b": 2}, 7, 0.0)
+    shared.invalidate("repo", "repo")
+    assert shared.get_repo("repo") is None
+    shared.poll()
+    assert shared.get_response("https://api/b")[2] == {"b": 2}
+    assert time.monotonic() - started < 0.1
+
+    other.execute("ROLLBACK")
+    other.close()
+    shared.close()
+
+
+def test_shared_cache_is_abstract():
+    with pytest.raises(TypeError):
+        SharedCache()
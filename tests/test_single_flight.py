@@ -0,0 +1,81 @@
+# tests/test_single_flight.py
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.infrastructure.github_client import GitHubClient
+from app.infrastructure.http_client import create_http_client
+from app.infrastructure.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_reads_make_one_upstream_call():
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        if "/git/trees/" in request.url.path:
+            return httpx.Response(200, json={"sha": "t", "tree": []})
+        return httpx.Response(200, json={"default_branch": "main"})
+
+    client = GitHubClient(create_http_client(transport=httpx.MockTransport(handler)))
+    results = await asyncio.gather(*(client.list_repo_tree("repo") for _ in range(20)))
+
+    assert results == [[]] * 20
+    assert calls == 2
+    assert len(client.flights) == 0
+
+
+@pytest.mark.asyncio
+async def test_error_is_propagated_to_every_waiter():
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(*(flights.do("k", fail) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flights.leaders == 1 and flights.shared == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers():
+    flights = SingleFlight()
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    leader = asyncio.create_task(flights.do("k", slow))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flights.do("k", slow))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "ok"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.asyncio
+async def test_operation_is_cancelled_when_nobody_waits():
+    flights = SingleFlight()
+    finished = False
+
+    async def slow():
+        nonlocal finished
+        await asyncio.sleep(0.05)
+        finished = True
+
+    waiter = asyncio.create_task(flights.do("k", slow))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.sleep(0.07)
+
+    assert not finished
+    assert len(flights) == 0
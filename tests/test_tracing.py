@@ -0,0 +1,88 @@
+# tests/test_tracing.py
+
+import json
+import logging
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.middleware import TracingMiddleware, access_logger
+from app.infrastructure.github_client import GitHubClient
+from app.infrastructure.http_client import create_http_client
+from app.infrastructure.tracing import current_trace, end_trace, span, start_trace
+
+
+def make_app(**options) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work():
+        with span("decode"):
+            pass
+        with span("decode"):
+            pass
+        return {"traced": current_trace() is not None}
+
+    app.add_middleware(TracingMiddleware, **options)
+    return app
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(record.getMessage())
+
+
+def test_sampled_request_gets_server_timing_and_json_log():
+    handler = ListHandler()
+    access_logger.addHandler(handler)
+    level = access_logger.level
+    access_logger.setLevel(logging.INFO)
+    try:
+        response = TestClient(make_app(debug=True)).get("/work", headers={"X-Request-ID": "req-42"})
+    finally:
+        access_logger.removeHandler(handler)
+        access_logger.setLevel(level)
+
+    assert response.json() == {"traced": True}
+    assert response.headers["X-Request-ID"] == "req-42"
+    assert "decode;dur=" in response.headers["Server-Timing"]
+    assert "total;dur=" in response.headers["Server-Timing"]
+
+    record = json.loads(handler.lines[-1])
+    assert record["request_id"] == "req-42"
+    assert record["route"] == "/work"
+    assert record["status"] == 200
+    assert record["spans"]["decode"]["count"] == 2
+
+
+def test_unsampled_request_is_not_traced_unless_asked():
+    client = TestClient(make_app(sample_rate=0.0, access_log=False))
+
+    response = client.get("/work", headers={"X-Request-ID": "bad id with spaces"})
+    assert response.json() == {"traced": False}
+    assert "server-timing" not in response.headers
+    assert len(response.headers["X-Request-ID"]) == 32
+
+    response = client.get("/work", headers={"X-Debug-Timing": "1"})
+    assert "decode;dur=" in response.headers["Server-Timing"]
+
+
+@pytest.mark.asyncio
+async def test_client_records_upstream_and_parse_spans():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"sha": "t", "tree": []})
+
+    client = GitHubClient(create_http_client(transport=httpx.MockTransport(handler)))
+    trace, token = start_trace("t")
+    try:
+        await client.get_tree("repo", ref="main")
+    finally:
+        end_trace(token)
+
+    assert {"rate_limit_wait", "upstream", "json_parse"} <= set(trace.spans)
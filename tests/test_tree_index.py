@@ -0,0 +1,152 @@
+# tests/test_tree_index.py
+
+import httpx
+import pytest
+
+from app.core.exceptions import InvalidRequestError
+from app.domain.services.github_service import GitHubService
+from app.domain.tree_index import TreeIndex, TreeIndexCache
+from app.infrastructure.github_client import GitHubClient
+from app.infrastructure.http_client import create_http_client
+
+TREE = [
+    {"path": "README.md", "type": "blob", "sha": "r"},
+    {"path": "src", "type": "tree", "sha": "s"},
+    {"path": "src/app", "type": "tree", "sha": "sa"},
+    {"path": "src/app/main.py", "type": "blob", "sha": "m"},
+    {"path": "src/app/util.py", "type": "blob", "sha": "u"},
+    {"path": "src/setup.cfg", "type": "blob", "sha": "c"},
+    {"path": "tests", "type": "tree", "sha": "t"},
+    {"path": "tests/test_main.py", "type": "blob", "sha": "tm"},
+]
+
+
+def paths(entries: list) -> list[str]:
+    return [entry.path for entry in entries]
+
+
+def test_prefix_type_and_depth_filters():
+    index = TreeIndex("root", TREE)
+
+    entries, cursor = index.query(prefix="src", max_depth=1)
+    assert paths(entries) == ["src/app", "src/setup.cfg"]
+    assert cursor is None
+
+    entries, _ = index.query(prefix="src/", node_type="blob")
+    assert paths(entries) == ["src/app/main.py", "src/app/util.py", "src/setup.cfg"]
+
+    entries, _ = index.query(glob="*.py")
+    assert paths(entries) == ["src/app/main.py", "src/app/util.py", "tests/test_main.py"]
+
+    assert index.query(prefix="nope")[0] == []
+    assert paths(index.query(prefix="src/setup.cfg")[0]) == ["src/setup.cfg"]
+
+
+def test_cursor_pagination_returns_every_entry_once():
+    index = TreeIndex("root", TREE)
+    collected, cursor = [], None
+    while True:
+        entries, cursor = index.query(cursor=cursor, limit=3)
+        collected.extend(paths(entries))
+        if cursor is None:
+            break
+
+    assert sorted(collected) == sorted(entry["path"] for entry in TREE)
+    assert len(collected) == len(TREE)
+
+
+def test_cursor_from_other_prefix_is_rejected():
+    index = TreeIndex("root", TREE)
+    _, cursor = index.query(prefix="src", limit=1)
+    with pytest.raises(ValueError):
+        index.query(prefix="tests", cursor=cursor, limit=1)
+
+
+def test_index_is_cached_per_tree_sha():
+    cache = TreeIndexCache(max_entries=1)
+    first = cache.get_or_build({"sha": "a", "tree": TREE})
+    assert cache.get_or_build({"sha": "a", "tree": []}) is first
+    cache.get_or_build({"sha": "b", "tree": []})
+    assert cache.get("a") is None
+
+
+def test_diff_reports_added_modified_and_deleted():
+    changed = [
+        {"path": "README.md", "type": "blob", "sha": "r"},
+        {"path": "docs", "type": "tree", "sha": "d"},
+        {"path": "docs/index.md", "type": "blob", "sha": "i"},
+        {"path": "src", "type": "tree", "sha": "s2"},
+        {"path": "src/app", "type": "tree", "sha": "sa2"},
+        {"path": "src/app/main.py", "type": "blob", "sha": "m2"},
+        {"path": "src/app/util.py", "type": "blob", "sha": "u"},
+        {"path": "src/setup.cfg", "type": "blob", "sha": "c"},
+    ]
+    changes = TreeIndex("new", changed).diff(TreeIndex("old", TREE))
+
+    assert [(c["path"], c["change"]) for c in changes] == [
+        ("docs", "added"),
+        ("docs/index.md", "added"),
+        ("src", "modified"),
+        ("src/app", "modified"),
+        ("src/app/main.py", "modified"),
+        ("tests", "deleted"),
+        ("tests/test_main.py", "deleted"),
+    ]
+    assert changes[4]["sha"] == "m2" and changes[4]["previous_sha"] == "m"
+    assert changes[5]["sha"] is None and changes[5]["previous_sha"] == "t"
+
+
+def test_diff_skips_subtrees_with_equal_sha_and_respects_prefix():
+    # Поддерево src с тем же SHA не обходится, даже если его содержимое в индексе другое
+    changed = [entry for entry in TREE if entry["path"] not in ("src/setup.cfg", "tests")]
+    changed.append({"path": "tests", "type": "tree", "sha": "t2"})
+    changed.append({"path": "tests/test_util.py", "type": "blob", "sha": "tu"})
+    changes = TreeIndex("new", changed).diff(TreeIndex("old", TREE))
+    assert [c["path"] for c in changes] == ["tests", "tests/test_util.py"]
+
+    assert TreeIndex("new", changed).diff(TreeIndex("old", TREE), prefix="src") == []
+
+
+@pytest.mark.asyncio
+async def test_changes_since_commit_reuse_cached_base_tree():
+    commit = "c" * 40
+    base_fetches = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal base_fetches
+        if request.url.path.endswith(f"/git/trees/{commit}"):
+            base_fetches += 1
+            return httpx.Response(200, json={"sha": "old", "tree": TREE})
+        if "/git/trees/" in request.url.path:
+            tree = TREE + [{"path": "NEWS.md", "type": "blob", "sha": "n"}]
+            return httpx.Response(200, json={"sha": "new", "tree": tree})
+        return httpx.Response(200, json={"default_branch": "main"})
+
+    client = GitHubClient(create_http_client(transport=httpx.MockTransport(handler)))
+    service = GitHubService(client)
+
+    for _ in range(2):
+        result = await service.get_structure_changes("repo", since=commit)
+        assert (result.base_sha, result.sha) == ("old", "new")
+        assert [(c.path, c.change) for c in result.changes] == [("NEWS.md", "added")]
+    assert base_fetches == 1
+
+
+@pytest.mark.asyncio
+async def test_structure_keeps_only_selected_compact_fields():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if "/git/trees/" in request.url.path:
+            tree = [{**entry, "mode": "100644", "url": "https://api.github.com/x", "size": 1} for entry in TREE]
+            return httpx.Response(200, json={"sha": "root", "tree": tree})
+        return httpx.Response(200, json={"default_branch": "main"})
+
+    service = GitHubService(GitHubClient(create_http_client(transport=httpx.MockTransport(handler))))
+
+    result = await service.get_repo_structure("repo", limit=1)
+    assert result.tree == [{"path": "README.md", "type": "blob", "sha": "r", "size": 1}]
+
+    result = await service.get_repo_structure("repo", limit=1, fields=["path", "mode"])
+    assert result.tree == [{"path": "README.md", "mode": "100644"}]
+
+    with pytest.raises(InvalidRequestError):
+        await service.get_repo_structure("repo", fields=["url"])
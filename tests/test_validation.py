@@ -0,0 +1,91 @@
+# tests/test_validation.py
+
+import asyncio
+import hashlib
+import time
+
+import pytest
+
+from app.domain.validation import ValidationExecutor, check_python, validators_for
+
+
+@pytest.mark.asyncio
+async def test_syntax_is_checked_by_extension():
+    executor = ValidationExecutor()
+
+    assert await executor.run("def broken(:\n", validators_for("notes.txt")) == []
+    assert (await executor.run('{"a": 1', validators_for("data.json")))[0].startswith("Ошибка JSON")
+    assert (await executor.run("key = ", validators_for("pyproject.toml")))[0].startswith("Ошибка TOML")
+
+
+@pytest.mark.asyncio
+async def test_large_content_is_validated_in_pool():
+    executor = ValidationExecutor(max_workers=2, inline_max_chars=10)
+    content = "x = 1\n" * 1000
+    checks = validators_for("big.py", hashlib.sha256(content.encode()).hexdigest(), 1000)
+
+    try:
+        assert await executor.run(content, checks) == []
+        assert executor._executor is not None
+        errors = await executor.run(content + "def (:\n", validators_for("big.py", "0" * 64))
+    finally:
+        executor.shutdown()
+
+    assert errors[0].startswith("Контрольная сумма")
+    assert errors[1].startswith("Синтаксическая ошибка")
+
+
+def slow_check(content: str) -> str | None:
+    time.sleep(0.2)
+    return None
+
+
+@pytest.mark.asyncio
+async def test_timeout_is_reported_as_validation_error():
+    executor = ValidationExecutor(timeout=0.05, inline_max_chars=0)
+    try:
+        with pytest.raises(ValueError, match="не уложилась"):
+            await executor.run("x", [(slow_check, ()), (check_python, ("a.py",))])
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timed_out_process_pool_is_replaced():
+    executor = ValidationExecutor(timeout=0.05, inline_max_chars=0)
+    try:
+        with pytest.raises(ValueError):
+            await executor.run("x", [(slow_check, ())])
+        assert executor._executor is None
+        assert await executor.run("x = 1\n", validators_for("a.py")) == []
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_large_validation_does_not_block_event_loop():
+    executor = ValidationExecutor(max_workers=1, inline_max_chars=0)
+    content = "".join(f"value_{i} = [{i}, {i + 1}, {{'k': {i}}}]\n" for i in range(30_000))
+    gaps = []
+
+    async def ticker():
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    try:
+        await executor.run("x = 1\n", validators_for("warm.py"))
+        task = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        assert await executor.run(content, validators_for("big.py")) == []
+        elapsed = time.perf_counter() - started
+        task.cancel()
+    finally:
+        executor.shutdown()
+
+    # Компиляция заняла заметное время, но цикл событий продолжал обслуживать задачи
+    assert elapsed > 0.2
+    assert max(gaps) < 0.1
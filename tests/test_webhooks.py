@@ -0,0 +1,139 @@
+# tests/test_webhooks.py
+
+import hashlib
+import hmac
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import get_github_service
+from app.api.main import app
+from app.api.routers import webhook_router
+from app.core.config import MY_GITHUB_USERNAME
+from app.domain.services.github_service import GitHubService
+from app.domain.webhooks import PushEvent, verify_signature
+from app.infrastructure.github_client import GitHubClient
+from app.infrastructure.http_client import create_http_client
+from benchmarks.fake_github import FakeGitHub
+
+SECRET = "s3cret"
+
+
+def sign(body: bytes, secret: str = SECRET) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def push_payload(paths: list[str], after: str = "f" * 40, **extra) -> dict:
+    return {
+        "ref": "refs/heads/main",
+        "after": after,
+        "repository": {"name": "repo", "owner": {"login": MY_GITHUB_USERNAME}, "default_branch": "main"},
+        "commits": [{"added": [], "modified": paths, "removed": []}],
+        **extra,
+    }
+
+
+def make_client(fake: FakeGitHub) -> GitHubClient:
+    return GitHubClient(create_http_client(transport=fake), trust_ttl=60)
+
+
+def test_signature_verification():
+    body = b'{"zen": "ok"}'
+
+    assert verify_signature(SECRET, body, sign(body))
+    assert not verify_signature(SECRET, body, sign(body, "other"))
+    assert not verify_signature(SECRET, body, None)
+    assert not verify_signature(None, body, sign(body))
+
+
+def test_push_event_paths_are_incomplete_for_forced_push():
+    assert PushEvent.from_payload(push_payload(["a.txt"])).paths == {"a.txt"}
+    assert PushEvent.from_payload(push_payload(["a.txt"], forced=True)).paths is None
+    assert PushEvent.from_payload({**push_payload([]), "ref": "refs/tags/v1"}) is None
+
+
+@pytest.mark.asyncio
+async def test_push_invalidates_exactly_the_changed_paths():
+    fake = FakeGitHub()
+    fake.seed_repo("repo", {"docs/a.md": "a", "docs/b.md": "b"})
+    client = make_client(fake)
+    await client.get_default_branch("repo")
+    await client.get_file_content("repo", "docs/a.md")
+    await client.get_file_content("repo", "docs/b.md")
+    calls = fake.upstream_calls()
+
+    # Пока push не пришёл, содержимое отдаётся из кэша без запросов
+    await client.get_file_content("repo", "docs/a.md")
+    assert fake.upstream_calls() == calls
+
+    fake.repo("repo").commit_files({"docs/a.md": b"a2"}, "External change")
+    GitHubService(client).apply_push_event(PushEvent.from_payload(push_payload(["docs/a.md"])))
+
+    changed = await client.get_file_content("repo", "docs/a.md")
+    untouched = await client.get_file_content("repo", "docs/b.md")
+    assert fake.upstream_calls() == calls + 1
+    assert changed["sha"] == fake.repo("repo").head_files()["docs/a.md"]
+    assert untouched["sha"] == fake.repo("repo").head_files()["docs/b.md"]
+    assert client.repo_metadata.get("repo").head_sha == "f" * 40
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_read_after_write_needs_no_upstream_calls():
+    fake = FakeGitHub()
+    fake.seed_repo("repo", {"docs/a.md": "a"})
+    client = make_client(fake)
+    service = GitHubService(client)
+    await service.get_repo_structure("repo")
+    await service.get_file_content("repo", "docs/a.md")
+
+    await service.update_file("repo", "docs", "a.md", "updated", "Update")
+    calls = fake.upstream_calls()
+    result = await service.get_file_content("repo", "docs/a.md")
+
+    assert result.content == "updated"
+    assert fake.upstream_calls() == calls
+
+    # Дерево ветки сброшено записью: структура отражает новый коммит
+    structure = await service.get_repo_structure("repo")
+    assert structure.sha == fake.repo("repo").resolve_tree("main")
+    service.close()
+    await client.aclose()
+
+
+class RecordingService:
+    def __init__(self):
+        self.events = []
+
+    def apply_push_event(self, event):
+        self.events.append(event)
+        return {"event": "push", "applied": True, "repo": event.repo, "branch": event.branch, "paths": 1}
+
+
+def test_webhook_endpoint_rejects_bad_signature_and_applies_push(monkeypatch):
+    monkeypatch.setattr(webhook_router, "GITHUB_WEBHOOK_SECRET", SECRET)
+    service = RecordingService()
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[get_github_service] = lambda: service
+    client = TestClient(app)
+    body = json.dumps(push_payload(["a.txt"])).encode()
+    try:
+        rejected = client.post("/webhooks/github", content=body, headers={
+            "X-GitHub-Event": "push", "X-Hub-Signature-256": sign(body, "wrong"),
+        })
+        ping = client.post("/webhooks/github", content=b"{}", headers={
+            "X-GitHub-Event": "ping", "X-Hub-Signature-256": sign(b"{}"),
+        })
+        pushed = client.post("/webhooks/github", content=body, headers={
+            "X-GitHub-Event": "push", "X-Hub-Signature-256": sign(body),
+        })
+    finally:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(previous)
+
+    assert rejected.status_code == 401
+    assert ping.json() == {"event": "ping", "applied": False, "repo": None, "branch": None, "paths": None}
+    assert pushed.status_code == 200
+    assert pushed.json()["applied"] is True
+    assert [event.paths for event in service.events] == [{"a.txt"}]